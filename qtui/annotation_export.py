@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Annotation Export
+Brennt die als Vektoren gespeicherten Zeichnungen (Metadaten 'drawings') in Kopien
+der Bilder ein – als eigener Export-Schritt für den Bericht.
+
+Die Originale werden nie verändert; die Einzelbildansicht zeichnet die Vektoren
+live über das Bild. Der Export läuft im Hintergrund (QThreadPool) und überspringt
+Kopien, die neuer als ihr Original sind.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QImage, QImageReader, QPainter
+from utils_logging import get_logger
+from utils_exif import read_metadata, write_metadata
+from .drawing_tools import paint_drawings
+
+_DEFAULT_DIRECTORY = "Annotiert"
+_IMAGE_EXTS = {'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tif', '.tiff'}
+
+_log = get_logger('app', {"module": "qtui.annotation_export"})
+
+
+def annotated_directory(folder: str) -> str:
+    """Zielordner der annotierten Kopien (Setting 'paths_annotated_directory', relativ zum Bildordner)"""
+    try:
+        from .settings_manager import get_settings_manager
+        name = get_settings_manager().get('paths_annotated_directory', _DEFAULT_DIRECTORY) or _DEFAULT_DIRECTORY
+    except Exception:
+        name = _DEFAULT_DIRECTORY
+    return name if os.path.isabs(name) else os.path.join(folder, name)
+
+
+def annotated_path_for(path: str, target_dir: str) -> str:
+    return os.path.join(target_dir, os.path.basename(path))
+
+
+def _same_file(a: str, b: str) -> bool:
+    """Schutz: ein Zielordner gleich dem Bildordner darf nie Originale löschen"""
+    return os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b))
+
+
+def burn_in(path: str, drawings: list, destination: str, metadata: dict | None = None) -> bool:
+    """Schreibt eine Kopie von path mit eingebrannten Zeichnungen nach destination.
+    Die Metadaten werden ohne 'drawings' übernommen (sonst doppelt gezeichnet). Thread-sicher."""
+    image = QImageReader(path).read()
+    if image.isNull():
+        return False
+    image = image.convertToFormat(QImage.Format_RGB32)
+    painter = QPainter(image)
+    painter.setRenderHints(QPainter.Antialiasing | QPainter.SmoothPixmapTransform)
+    paint_drawings(painter, drawings)
+    painter.end()
+
+    os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+    ext = os.path.splitext(destination)[1].lower()
+    saved = image.save(destination, "JPEG", 95) if ext in {".jpg", ".jpeg"} else image.save(destination)
+    if not saved:
+        return False
+    md = dict(metadata) if isinstance(metadata, dict) else {}
+    md.pop('drawings', None)
+    if md:
+        try:
+            write_metadata(destination, md)
+        except Exception:
+            pass
+    return True
+
+
+def export_annotated_images(paths: list, target_dir: str, *, cancel: threading.Event | None = None,
+                            progress=None) -> dict:
+    """Exportiert alle Bilder mit Zeichnungen nach target_dir.
+
+    progress(done, total) wird nach jedem Bild aufgerufen. Kopien von Bildern ohne
+    Zeichnungen (alle gelöscht) werden entfernt. Ergebnis:
+    {'written': [...], 'skipped': anzahl aktueller Kopien, 'removed': [...], 'failed': [...]}"""
+    result = {'written': [], 'skipped': 0, 'removed': [], 'failed': []}
+    total = len(paths)
+    started = time.perf_counter()
+    for done, path in enumerate(paths, 1):
+        if cancel is not None and cancel.is_set():
+            break
+        try:
+            md = read_metadata(path)
+            drawings = md.get('drawings') if isinstance(md, dict) else None
+            destination = annotated_path_for(path, target_dir)
+            if not (isinstance(drawings, list) and drawings):
+                # Veraltete Kopie mit inzwischen gelöschten Zeichnungen nicht im Bericht lassen
+                if os.path.isfile(destination) and not _same_file(destination, path):
+                    os.remove(destination)
+                    result['removed'].append(destination)
+            else:
+                # Inkrementell: unveränderte Bilder nicht erneut kodieren
+                if os.path.exists(destination) and os.path.getmtime(destination) >= os.path.getmtime(path):
+                    result['skipped'] += 1
+                elif burn_in(path, drawings, destination, md):
+                    result['written'].append(destination)
+                else:
+                    result['failed'].append(path)
+        except Exception as e:
+            _log.error("annotation_export_failed", extra={
+                "event": "annotation_export_failed", "path": path, "error": str(e)})
+            result['failed'].append(path)
+        if progress is not None:
+            progress(done, total)
+    _log.info("annotation_export_done", extra={
+        "event": "annotation_export_done", "target": target_dir, "written": len(result['written']),
+        "skipped": result['skipped'], "removed": len(result['removed']), "failed": len(result['failed']),
+        "ms": int((time.perf_counter() - started) * 1000)})
+    return result
+
+
+def folder_images(folder: str) -> list:
+    try:
+        names = sorted(os.listdir(folder))
+    except OSError:
+        return []
+    return [os.path.join(folder, n) for n in names if os.path.splitext(n)[1].lower() in _IMAGE_EXTS]
+
+
+class _ExportTask(QRunnable):
+    def __init__(self, exporter: 'AnnotationExporter', paths: list, target_dir: str):
+        super().__init__()
+        self._exporter = exporter
+        self._paths = paths
+        self._target_dir = target_dir
+
+    def run(self):
+        result = {'written': [], 'skipped': 0, 'removed': [], 'failed': []}
+        try:
+            result = export_annotated_images(
+                self._paths, self._target_dir, cancel=self._exporter._cancel,
+                progress=lambda done, total: self._exporter.progress.emit(done, total))
+        finally:
+            self._exporter.finished.emit(self._target_dir, result)
+
+
+class AnnotationExporter(QObject):
+    """Führt den Export im Hintergrund aus; Signale kommen im GUI-Thread an."""
+
+    progress = Signal(int, int)  # (erledigt, gesamt)
+    finished = Signal(str, dict)  # (zielordner, ergebnis)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._cancel = threading.Event()
+
+    def start(self, paths: list, target_dir: str) -> bool:
+        """False, wenn bereits ein Export läuft"""
+        if self._pool.activeThreadCount() > 0:
+            return False
+        self._cancel.clear()
+        self._pool.start(_ExportTask(self, list(paths), target_dir))
+        return True
+
+    def cancel(self):
+        self._cancel.set()
+
+    def shutdown(self, timeout_ms: int = 2000):
+        self.cancel()
+        self._pool.waitForDone(timeout_ms)
@@ -28,12 +28,15 @@ from PySide6.QtWidgets import (
 )
 
 from utils_logging import get_logger
-from utils_exif import get_cover_info, set_cover_info
+from utils_exif import get_cover_info, set_cover_info, load_metadata_snapshot
 from .settings_manager import get_settings_manager
 from .widgets import ChipButton
+from .thumbnail_loader import ThumbnailLoader, load_cached_thumbnail, load_exif_preview
+from .pixmap_cache import get_pixmap_cache
 
 
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff"}
+THUMB_SIZE = (128, 96)
 
 
 class CoverView(QWidget):
@@ -53,8 +56,11 @@ class CoverView(QWidget):
         self._current_folder: str = ""
         self._current_path: str = ""
         self._preview_original: Optional[QPixmap] = None
-        self._thumb_cache: dict[tuple[str, bool], QIcon] = {}
+        # Gemeinsamer Pixmap-Cache mit Byte-Budget:
+        # ('cover_base', pfad) Thumbnail, ('cover', pfad) ausgegraute Variante für nicht verwendete Bilder
+        self._thumb_cache = get_pixmap_cache()
         self._item_by_path: dict[str, QListWidgetItem] = {}
+        self._image_service = None  # Gemeinsamer Bild-Service (von MainWindow gesetzt)
         self._suspend_settings_events = False
         self._loading_fields = False
         self._current_tag: str = ""
@@ -66,6 +72,10 @@ class CoverView(QWidget):
         self._auto_save_timer.setSingleShot(True)
         self._auto_save_timer.timeout.connect(self._auto_save_now)
 
+        # Thumbnails im Hintergrund (Festplatten-Cache, sonst verkleinert dekodiert)
+        self._thumb_loader = ThumbnailLoader(self)
+        self._thumb_loader.thumbnailReady.connect(self._on_thumbnail_ready)
+
         self._create_ui()
 
     # ---- UI Aufbau -------------------------------------------------
@@ -265,7 +275,9 @@ class CoverView(QWidget):
         previous_path = self._current_path
 
         # Cache leeren, damit geänderte Use-States neue Icons erhalten
-        self._thumb_cache.clear()
+        self._thumb_cache.clear('cover')
+        self._thumb_cache.clear('cover_base')
+        self._thumb_loader.cancel_pending()
 
         self.list_widget.clear()
         self._item_by_path.clear()
@@ -326,20 +338,38 @@ class CoverView(QWidget):
         item.setIcon(self._icon_for_path(path, use_flag))
 
     def _icon_for_path(self, path: str, used: bool = True) -> QIcon:
-        key = (path, bool(used))
-        icon = self._thumb_cache.get(key)
-        if icon:
-            return icon
-        pix = QPixmap(path)
-        if pix.isNull():
-            icon = self.style().standardIcon(self.style().SP_FileIcon)
-        else:
-            scaled = pix.scaled(128, 96, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            if not used:
-                scaled = self._create_unused_pixmap(scaled)
-            icon = QIcon(scaled)
-        self._thumb_cache[key] = icon
-        return icon
+        base = self._thumb_cache.get(('cover_base', path))
+        if base is None:
+            image = load_cached_thumbnail(path, *THUMB_SIZE)
+            if not image.isNull():
+                base = QPixmap.fromImage(image)
+                self._thumb_cache.put(('cover_base', path), base)
+        if base is None:
+            # Vorläufig das eingebettete EXIF-Vorschaubild; das richtige Thumbnail
+            # kommt per _on_thumbnail_ready aus dem Hintergrund (nicht gecacht)
+            self._thumb_loader.request(path, THUMB_SIZE)
+            preview = load_exif_preview(path, *THUMB_SIZE)
+            if preview.isNull():
+                return self.style().standardIcon(self.style().SP_FileIcon)
+            pix = QPixmap.fromImage(preview)
+            return QIcon(pix if used else self._create_unused_pixmap(pix))
+        if used:
+            return QIcon(base)
+        # Ausgegraute Variante ist teuer (pixelweise) und wird deshalb mitgecacht
+        dull = self._thumb_cache.get(('cover', path))
+        if dull is None:
+            dull = self._create_unused_pixmap(base)
+            self._thumb_cache.put(('cover', path), dull)
+        return QIcon(dull)
+
+    def _on_thumbnail_ready(self, path: str, size: tuple, image: QImage):
+        if image.isNull() or size != THUMB_SIZE:
+            return
+        self._thumb_cache.put(('cover_base', path), QPixmap.fromImage(image))
+        self._thumb_cache.pop(('cover', path))
+        item = self._item_by_path.get(path)
+        if item is not None:
+            item.setIcon(self._icon_for_path(path, bool(item.data(Qt.UserRole + 2))))
 
     def _create_unused_pixmap(self, pix: QPixmap) -> QPixmap:
         img = pix.toImage().convertToFormat(QImage.Format_ARGB32)
@@ -360,7 +390,7 @@ class CoverView(QWidget):
 
     # ---- Datensynchronisation --------------------------------------
     def _combine_cover_info(self, path: str, settings_entry: Optional[dict]) -> dict:
-        file_info = get_cover_info(path)
+        file_info = load_metadata_snapshot(path).cover
         entry = settings_entry or {}
         if isinstance(entry, dict):
             for key in ("tag", "defect_description"):
@@ -463,8 +493,13 @@ class CoverView(QWidget):
         self.status_label.setText("")
         self._update_nav_buttons()
 
+    def set_image_service(self, service):
+        """Setzt den gemeinsamen Bild-Service (wird von MainWindow aufgerufen)"""
+        self._image_service = service
+
     def _update_preview(self, path: str):
-        pix = QPixmap(path)
+        # Über den Bild-Service: bereits in der Einzelansicht dekodierte Bilder werden geteilt
+        pix = self._image_service.load(path) if self._image_service else QPixmap(path)
         if pix.isNull():
             self.preview_label.setText("Vorschau nicht verfügbar")
             self.preview_label.setPixmap(QPixmap())
@@ -25,6 +25,66 @@ class DrawingMode:
     FREEHAND = "freehand"
 
 
+ARROW_HEAD_SIZE = 15.0
+
+
+def arrow_head_points(start: QPointF, end: QPointF) -> Tuple[QPointF, QPointF]:
+    """Endpunkte der beiden Linien der Pfeilspitze"""
+    angle = math.atan2(end.y() - start.y(), end.x() - start.x())
+    p1 = QPointF(
+        end.x() - ARROW_HEAD_SIZE * math.cos(angle - math.pi / 6),
+        end.y() - ARROW_HEAD_SIZE * math.sin(angle - math.pi / 6)
+    )
+    p2 = QPointF(
+        end.x() - ARROW_HEAD_SIZE * math.cos(angle + math.pi / 6),
+        end.y() - ARROW_HEAD_SIZE * math.sin(angle + math.pi / 6)
+    )
+    return p1, p2
+
+
+def paint_drawings(painter: QPainter, data_list: List[dict]) -> int:
+    """Zeichnet gespeicherte Zeichnungen (Format von get_drawings_data) direkt mit einem
+    QPainter in Bildkoordinaten – ohne Szene, daher auch in Hintergrund-Threads nutzbar.
+    Liefert die Anzahl gezeichneter Elemente."""
+    painted = 0
+    painter.setBrush(Qt.NoBrush)
+    for data in data_list or []:
+        try:
+            item_type = data.get('type')
+            painter.setPen(QPen(QColor(data.get('color', 'red')), data.get('width', 3)))
+            if item_type == 'arrow':
+                start_data = data.get('start', (0, 0))
+                end_data = data.get('end', (0, 0))
+                start = QPointF(start_data[0], start_data[1])
+                end = QPointF(end_data[0], end_data[1])
+                p1, p2 = arrow_head_points(start, end)
+                painter.drawLine(start, end)
+                painter.drawLine(end, p1)
+                painter.drawLine(end, p2)
+            elif item_type in ('circle', 'rectangle'):
+                rect_data = data.get('rect', (0, 0, 0, 0))
+                rect = QRectF(rect_data[0], rect_data[1], rect_data[2], rect_data[3])
+                if item_type == 'circle':
+                    painter.drawEllipse(rect)
+                else:
+                    painter.drawRect(rect)
+            elif item_type == 'freehand':
+                points = [QPointF(p[0], p[1]) for p in data.get('points', [])]
+                if not points:
+                    continue
+                path = QPainterPath()
+                path.moveTo(points[0])
+                for point in points[1:]:
+                    path.lineTo(point)
+                painter.drawPath(path)
+            else:
+                continue
+            painted += 1
+        except Exception:
+            pass
+    return painted
+
+
 class DrawingItem:
     """Basis-Klasse für Zeichnungselemente mit Serialisierung"""
     def __init__(self, item_type: str, graphics_item: QGraphicsItem, pen: QPen):
@@ -55,19 +115,8 @@ class ArrowItem(DrawingItem):
         line.setPen(pen)
         scene.addItem(line)
         
-        # Pfeilspitze berechnen
-        angle = math.atan2(end.y() - start.y(), end.x() - start.x())
-        arrow_size = 15.0
-        
         # Zwei Linien für Pfeilspitze
-        p1 = QPointF(
-            end.x() - arrow_size * math.cos(angle - math.pi / 6),
-            end.y() - arrow_size * math.sin(angle - math.pi / 6)
-        )
-        p2 = QPointF(
-            end.x() - arrow_size * math.cos(angle + math.pi / 6),
-            end.y() - arrow_size * math.sin(angle + math.pi / 6)
-        )
+        p1, p2 = arrow_head_points(start, end)
         
         arrow1 = QGraphicsLineItem(end.x(), end.y(), p1.x(), p1.y())
         arrow1.setPen(pen)
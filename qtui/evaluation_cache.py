@@ -5,8 +5,30 @@ Cache für Bewertungsstatus ohne OCR-Abhängigkeit
 """
 
 import os
-from typing import Dict, Tuple, Optional, List
-from utils_exif import get_exif_usercomment, get_ocr_info
+import bisect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Tuple, Optional, List
+from utils_exif import load_metadata_snapshot
+from utils_logging import get_logger
+
+_log = get_logger('app', {"module": "qtui.evaluation_cache"})
+
+# Unterstützte Bildformate
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tif', '.tiff'}
+
+
+def _default_build_workers() -> int:
+    """Anzahl Lese-Threads für den Cache-Aufbau (Setting 'performance_cache_build_workers')"""
+    try:
+        from qtui.settings_manager import get_settings_manager
+        value = int(get_settings_manager().get('performance_cache_build_workers', 0) or 0)
+    except Exception:
+        value = 0
+    if value > 0:
+        return value
+    # EXIF-Lesen ist I/O-lastig: mehr Threads als Kerne, aber begrenzt
+    return min(8, (os.cpu_count() or 2) * 2)
 
 
 class EvaluationCache:
@@ -14,72 +36,254 @@ class EvaluationCache:
     
     def __init__(self):
         self._cache: Dict[str, dict] = {}  # {filename: {tag, is_evaluated, ...}}
+        # Sekundär-Indizes, werden bei jeder Änderung an _cache mitgeführt
+        self._tag_index: Dict[str, Dict[str, None]] = {}  # {tag: {filename: None}} (geordnet)
+        self._tag_evaluated: Dict[str, int] = {}  # {tag: Anzahl bewertet}
+        self._tag_gene: Dict[str, int] = {}  # {tag: Anzahl Gene-Flags}
+        self._gene_sorted: List[Tuple[str, str]] = []  # [(dateiname.lower(), filepath)], sortiert
         self._dirty = True
         self._folder = ""
+        self._building = False
+        self._dirty_during_build = False  # invalidate() während eines Hintergrund-Aufbaus
+        self._force_full = False  # nächster Aufbau ignoriert vorhandene Einträge
         
     def build_cache(self, folder: str):
-        """Baut Cache aus EXIF-Daten aller Bilder im Ordner"""
+        """Baut Cache aus EXIF-Daten aller Bilder im Ordner (parallel gelesen).
+        
+        Im selben Ordner wird inkrementell aktualisiert: nur neue oder per
+        (mtime_ns, size) geänderte Dateien werden erneut gelesen.
+        """
         if not folder or not os.path.isdir(folder):
-            self._cache.clear()
+            self._replace_records({})
             self._folder = ""
             return
-            
-        self._folder = folder
-        self._cache.clear()
-        
-        # Unterstützte Bildformate
-        image_extensions = {'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tif', '.tiff'}
         
+        previous = self._take_previous(folder)
+        records = self.scan_folder(folder, previous=previous)
+        self._folder = folder
+        self._replace_records(records or {})
+        self._dirty = False
+    
+    # -------- Index-Pflege --------
+    @staticmethod
+    def _gene_key(data: dict) -> Tuple[str, str]:
+        filepath = data.get('filepath', '')
+        return (os.path.basename(filepath).lower(), filepath)
+    
+    def _index_add(self, filename: str, data: dict):
+        tag = data.get('tag', '')
+        self._tag_index.setdefault(tag, {})[filename] = None
+        if data.get('is_evaluated', False):
+            self._tag_evaluated[tag] = self._tag_evaluated.get(tag, 0) + 1
+        if data.get('gene', False):
+            self._tag_gene[tag] = self._tag_gene.get(tag, 0) + 1
+            bisect.insort(self._gene_sorted, self._gene_key(data))
+    
+    def _index_remove(self, filename: str, data: dict):
+        tag = data.get('tag', '')
+        names = self._tag_index.get(tag)
+        if names is not None:
+            names.pop(filename, None)
+            if not names:
+                del self._tag_index[tag]
+        if data.get('is_evaluated', False):
+            self._decrement(self._tag_evaluated, tag)
+        if data.get('gene', False):
+            self._decrement(self._tag_gene, tag)
+            key = self._gene_key(data)
+            idx = bisect.bisect_left(self._gene_sorted, key)
+            if idx < len(self._gene_sorted) and self._gene_sorted[idx] == key:
+                del self._gene_sorted[idx]
+    
+    @staticmethod
+    def _decrement(counter: Dict[str, int], tag: str):
+        value = counter.get(tag, 0) - 1
+        if value > 0:
+            counter[tag] = value
+        else:
+            counter.pop(tag, None)
+    
+    def _set_record(self, filename: str, data: dict):
+        """Setzt einen Eintrag und hält die Indizes aktuell"""
+        old = self._cache.get(filename)
+        if old is not None:
+            self._index_remove(filename, old)
+        self._cache[filename] = data
+        self._index_add(filename, data)
+    
+    def _replace_records(self, records: Dict[str, dict]):
+        """Ersetzt alle Einträge und baut die Indizes neu auf"""
+        self._cache = dict(records)
+        self._tag_index = {}
+        self._tag_evaluated = {}
+        self._tag_gene = {}
+        self._gene_sorted = []
+        for filename, data in self._cache.items():
+            self._index_add(filename, data)
+    
+    def _take_previous(self, folder: str) -> Dict[str, dict]:
+        """Bisherige Einträge als Basis für einen inkrementellen Aufbau"""
+        if folder != self._folder or self._force_full:
+            self._force_full = False
+            return {}
+        return dict(self._cache)
+    
+    def _scan_entries(self, folder: str) -> List[Tuple[str, int, int]]:
+        """(dateiname, mtime_ns, size) aller unterstützten Bilder per os.scandir"""
+        entries = []
         try:
-            files = [f for f in os.listdir(folder) 
-                    if os.path.splitext(f.lower())[1] in image_extensions]
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if os.path.splitext(entry.name.lower())[1] not in IMAGE_EXTENSIONS:
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((entry.name, st.st_mtime_ns, st.st_size))
         except Exception:
-            files = []
-        
-        for filename in files:
-            filepath = os.path.join(folder, filename)
-            try:
-                # Hole EXIF-Daten
-                exif_data = get_exif_usercomment(filepath)
-                
-                # Hole OCR-Tag (manuell vergeben)
-                ocr_info = get_ocr_info(filepath)
-                tag = ocr_info.get('tag', '') if isinstance(ocr_info, dict) else ''
-                
-                # Prüfe Bewertungsstatus
-                is_evaluated = self._check_is_evaluated(exif_data)
-                
-                # Hole Gene-Flag
-                gene_flag = False
-                try:
-                    from utils_exif import get_gene_flag
-                    gene_flag = get_gene_flag(filepath)
-                except Exception:
-                    pass
-                
-                # Speichere im Cache
-                self._cache[filename] = {
-                    'tag': tag,
-                    'is_evaluated': is_evaluated,
-                    'filepath': filepath,
-                    'damage': exif_data.get('DAMAGE', '') if exif_data else '',
-                    'quality': exif_data.get('QUALITY', '') if exif_data else '',
-                    'use': exif_data.get('USE') if exif_data else None,
-                    'gene': gene_flag
-                }
-            except Exception:
-                # Bei Fehler: Datei im Cache als nicht bewertet markieren
-                self._cache[filename] = {
-                    'tag': '',
-                    'is_evaluated': False,
-                    'filepath': filepath,
-                    'damage': '',
-                    'quality': '',
-                    'use': None,
-                    'gene': False
-                }
+            pass
+        return entries
+    
+    def list_image_files(self, folder: str) -> List[str]:
+        """Dateinamen aller unterstützten Bilder im Ordner"""
+        return [name for name, _mtime, _size in self._scan_entries(folder)]
+    
+    def read_record(self, filepath: str, mtime_ns: int = 0, size: int = -1) -> dict:
+        """Liest den Cache-Eintrag für ein Bild (thread-sicher, ändert den Cache nicht).
+        mtime_ns/size stammen aus dem Verzeichnis-Scan vor dem Lesen."""
+        try:
+            # Metadaten nur einmal lesen, alle Werte aus demselben Snapshot
+            snapshot = load_metadata_snapshot(filepath)
+            exif_data = snapshot.data
+            
+            return {
+                'tag': snapshot.tag,  # OCR-Tag (manuell vergeben)
+                'is_evaluated': self._check_is_evaluated(exif_data),
+                'filepath': filepath,
+                'damage': exif_data.get('DAMAGE', '') if exif_data else '',
+                'quality': exif_data.get('QUALITY', '') if exif_data else '',
+                'use': exif_data.get('USE') if exif_data else None,
+                'gene': snapshot.gene,
+                'mtime_ns': mtime_ns,
+                'size': size,
+            }
+        except Exception:
+            # Bei Fehler: Datei im Cache als nicht bewertet markieren
+            return {
+                'tag': '',
+                'is_evaluated': False,
+                'filepath': filepath,
+                'damage': '',
+                'quality': '',
+                'use': None,
+                'gene': False,
+                'mtime_ns': mtime_ns,
+                'size': size,
+            }
+    
+    def scan_folder(self, folder: str, *, previous: Optional[Dict[str, dict]] = None,
+                    max_workers: Optional[int] = None,
+                    cancel_event: Optional[threading.Event] = None,
+                    on_batch: Optional[Callable[[Dict[str, dict], int, int], None]] = None,
+                    batch_size: int = 64) -> Optional[Dict[str, dict]]:
+        """Liest die Bilder eines Ordners parallel in einem Thread-Pool.
+        
+        Einträge aus previous mit unverändertem (mtime_ns, size) werden
+        übernommen, nur neue/geänderte Dateien werden gelesen; entfernte
+        Dateien fallen weg. Verändert den Cache nicht und darf daher aus einem
+        Hintergrund-Thread laufen. on_batch(records, fertig, gesamt) liefert
+        die neu gelesenen Einträge. Gibt None zurück, wenn cancel_event gesetzt wurde.
+        """
+        previous = previous or {}
+        records: Dict[str, dict] = {}
+        to_read: List[Tuple[str, int, int]] = []
+        for name, mtime_ns, size in self._scan_entries(folder):
+            old = previous.get(name)
+            if old is not None and old.get('mtime_ns') == mtime_ns and old.get('size') == size:
+                records[name] = old
+            else:
+                to_read.append((name, mtime_ns, size))
+        
+        self._prune_metadata_index(folder, records, to_read)
+        
+        total = len(to_read)
+        if max_workers is None:
+            max_workers = _default_build_workers()
+        
+        done = 0
+        if to_read:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total))) as pool:
+                for start in range(0, total, batch_size):
+                    if cancel_event is not None and cancel_event.is_set():
+                        return None
+                    chunk = to_read[start:start + batch_size]
+                    results = pool.map(
+                        lambda e: self.read_record(os.path.join(folder, e[0]), e[1], e[2]), chunk)
+                    batch = {e[0]: rec for e, rec in zip(chunk, results)}
+                    records.update(batch)
+                    done += len(chunk)
+                    if on_batch is not None:
+                        on_batch(batch, done, total)
+        
+        if cancel_event is not None and cancel_event.is_set():
+            return None
         
-        self._dirty = False
+        _log.info("evaluation_cache_scan", extra={
+            "event": "evaluation_cache_scan", "folder": folder,
+            "read": total, "reused": len(records) - total,
+            "removed": len(set(previous) - set(records)),
+        })
+        return records
+    
+    @staticmethod
+    def _prune_metadata_index(folder: str, reused: Dict[str, dict], to_read: List[Tuple[str, int, int]]):
+        """Entfernt gelöschte Dateien aus dem persistenten Ordner-Index"""
+        try:
+            from utils_metadata_index import get_metadata_index
+            index = get_metadata_index(folder)
+            if index is not None:
+                index.prune(list(reused) + [e[0] for e in to_read])
+        except Exception:
+            pass
+    
+    def begin_build(self, folder: str) -> Dict[str, dict]:
+        """Startet einen Hintergrund-Aufbau: bei Ordnerwechsel wird der Cache geleert.
+        Gibt die bisherigen Einträge als Basis für den inkrementellen Scan zurück."""
+        previous = self._take_previous(folder)
+        if folder != self._folder:
+            self._replace_records({})
+        self._folder = folder or ""
+        self._building = True
+        self._dirty_during_build = False
+        return previous
+    
+    def apply_records(self, folder: str, records: Dict[str, dict]):
+        """Übernimmt Teilergebnisse eines Hintergrund-Aufbaus (GUI-Thread)"""
+        if folder != self._folder:
+            return
+        for filename, data in records.items():
+            self._set_record(filename, data)
+    
+    def finish_build(self, folder: str, records: Optional[Dict[str, dict]]):
+        """Schließt einen Hintergrund-Aufbau ab; None = abgebrochen"""
+        if folder != self._folder:
+            return
+        self._building = False
+        dirty_during_build = self._dirty_during_build
+        self._dirty_during_build = False
+        if records is None:
+            return
+        self._replace_records(records)
+        # Änderungen nach Scanbeginn (z.B. use-Flag einer bereits gelesenen Datei) fehlen
+        # im Ergebnis: dann dirty lassen, der nächste Refresh liest inkrementell nach
+        self._dirty = dirty_during_build
+    
+    def is_building(self) -> bool:
+        """Gibt zurück ob gerade ein Hintergrund-Aufbau läuft"""
+        return self._building
     
     def _check_is_evaluated(self, exif_data: Optional[dict]) -> bool:
         """Prüft ob Bild bewertet ist basierend auf Regeln"""
@@ -166,9 +370,15 @@ class EvaluationCache:
         
         return old_system_evaluated or new_system_evaluated
     
-    def invalidate(self):
-        """Markiert den Cache als veraltet"""
+    def invalidate(self, full: bool = False):
+        """Markiert den Cache als veraltet.
+        full=True erzwingt ein komplettes Neulesen (z.B. geänderte Bewertungsregeln),
+        sonst werden beim nächsten Refresh nur geänderte Dateien gelesen."""
         self._dirty = True
+        if self._building:
+            self._dirty_during_build = True
+        if full:
+            self._force_full = True
     
     def is_dirty(self) -> bool:
         """Gibt zurück ob der Cache neu gebaut werden muss"""
@@ -176,6 +386,9 @@ class EvaluationCache:
     
     def refresh_if_needed(self):
         """Baut Cache neu auf wenn er als dirty markiert ist"""
+        # Während eines Hintergrund-Aufbaus mit Teilergebnissen arbeiten
+        if self._building:
+            return
         if self._dirty and self._folder:
             self.build_cache(self._folder)
     
@@ -199,24 +412,16 @@ class EvaluationCache:
         """Gibt (bewertete, gesamt) für ein Kürzel zurück"""
         self.refresh_if_needed()
         
-        evaluated = 0
-        total = 0
-        
-        for filename, data in self._cache.items():
-            if data.get('tag', '') == kurzel_code:
-                total += 1
-                if data.get('is_evaluated', False):
-                    evaluated += 1
-        
+        total = len(self._tag_index.get(kurzel_code, ()))
+        evaluated = self._tag_evaluated.get(kurzel_code, 0)
         return (evaluated, total)
     
     def get_first_image_for_kurzel(self, kurzel_code: str) -> Optional[str]:
         """Gibt den Pfad zum ersten Bild mit diesem Kürzel zurück"""
         self.refresh_if_needed()
         
-        for filename, data in self._cache.items():
-            if data.get('tag', '') == kurzel_code:
-                return data.get('filepath', '')
+        for filename in self._tag_index.get(kurzel_code, ()):
+            return self._cache[filename].get('filepath', '')
         return None
     
     def get_all_images_for_kurzel(self, kurzel_code: str) -> List[str]:
@@ -224,11 +429,10 @@ class EvaluationCache:
         self.refresh_if_needed()
         
         images = []
-        for filename, data in self._cache.items():
-            if data.get('tag', '') == kurzel_code:
-                filepath = data.get('filepath', '')
-                if filepath:
-                    images.append(filepath)
+        for filename in self._tag_index.get(kurzel_code, ()):
+            filepath = self._cache[filename].get('filepath', '')
+            if filepath:
+                images.append(filepath)
         
         return images
     
@@ -240,11 +444,13 @@ class EvaluationCache:
         normalized = (tag or '').strip()
 
         if filename in self._cache:
-            self._cache[filename]['tag'] = normalized
-            self._cache[filename]['filepath'] = path
+            data = dict(self._cache[filename])
+            data['tag'] = normalized
+            data['filepath'] = path
+            self._set_record(filename, data)
         else:
             # Lege Minimal-Eintrag an, damit get_kurzel_progress sofort korrekte Daten liefert
-            self._cache[filename] = {
+            self._set_record(filename, {
                 'tag': normalized,
                 'is_evaluated': False,
                 'filepath': path,
@@ -252,7 +458,7 @@ class EvaluationCache:
                 'quality': '',
                 'use': None,
                 'gene': False,
-            }
+            })
 
     def get_images_for_category(self, category_name: str, kurzel_table: dict) -> List[str]:
         """Gibt Liste aller Bildpfade in einer Kategorie zurück"""
@@ -276,8 +482,8 @@ class EvaluationCache:
         self.refresh_if_needed()
         
         total_images = len(self._cache)
-        evaluated_images = sum(1 for data in self._cache.values() if data.get('is_evaluated', False))
-        tagged_images = sum(1 for data in self._cache.values() if data.get('tag', ''))
+        evaluated_images = sum(self._tag_evaluated.values())
+        tagged_images = total_images - len(self._tag_index.get('', ()))
         
         return {
             'total_images': total_images,
@@ -290,49 +496,31 @@ class EvaluationCache:
         """Prüft ob mindestens ein Bild mit diesem Kürzel das Gene-Flag gesetzt hat"""
         self.refresh_if_needed()
         
-        for filename, data in self._cache.items():
-            if data.get('tag', '') == kurzel_code and data.get('gene', False):
-                return True
-        
-        return False
+        return self._tag_gene.get(kurzel_code, 0) > 0
     
     def count_gene_flags(self) -> int:
         """Zählt Anzahl der Gene-Flags im Cache"""
         self.refresh_if_needed()
         
-        count = 0
-        for data in self._cache.values():
-            if data.get('gene', False):
-                count += 1
-        return count
+        return len(self._gene_sorted)
     
     def get_next_gene_image(self, current_path: str | None) -> str | None:
         """Findet nächstes Bild mit Gene-Flag nach current_path (zyklisch)"""
         self.refresh_if_needed()
         
-        # Sammle alle Bilder mit Gene-Flag
-        gene_images = [
-            data['filepath'] 
-            for data in self._cache.values() 
-            if data.get('gene', False)
-        ]
-        
+        # Gene-Bilder liegen alphabetisch nach Dateinamen sortiert vor
+        gene_images = self._gene_sorted
         if not gene_images:
             return None
         
-        # Sortiere alphabetisch nach Dateinamen
-        gene_images.sort(key=lambda p: os.path.basename(p).lower())
-        
         if not current_path:
-            return gene_images[0]
+            return gene_images[0][1]
         
-        # Finde Index des aktuellen Bildes
-        try:
-            current_idx = gene_images.index(current_path)
+        # Finde Index des aktuellen Bildes per Binärsuche
+        key = (os.path.basename(current_path).lower(), current_path)
+        idx = bisect.bisect_left(gene_images, key)
+        if idx < len(gene_images) and gene_images[idx] == key:
             # Nächstes Bild (zyklisch)
-            next_idx = (current_idx + 1) % len(gene_images)
-            return gene_images[next_idx]
-        except ValueError:
-            # Aktuelles Bild nicht in Gene-Liste - gehe zum ersten
-            return gene_images[0]
-
+            return gene_images[(idx + 1) % len(gene_images)][1]
+        # Aktuelles Bild nicht in Gene-Liste - gehe zum ersten
+        return gene_images[0][1]
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Evaluation Cache Builder
+Baut den EvaluationCache im Hintergrund auf (parallel, abbrechbar, mit Teilergebnissen).
+"""
+
+import threading
+from PySide6.QtCore import QThread, Signal
+from .evaluation_cache import EvaluationCache
+
+
+class EvaluationCacheBuilder(QThread):
+    """Liest die Metadaten eines Ordners außerhalb des GUI-Threads.
+    
+    Der Cache selbst wird nur im GUI-Thread verändert: Teilergebnisse und das
+    Endergebnis werden per Signal übergeben (queued connection).
+    """
+    
+    progress = Signal(str, int, int)  # (ordner, fertig, gesamt)
+    partialResults = Signal(str, dict)  # (ordner, {dateiname: eintrag})
+    buildFinished = Signal(str, object)  # (ordner, {dateiname: eintrag} oder None bei Abbruch)
+    
+    def __init__(self, cache: EvaluationCache, folder: str, parent=None, previous: dict | None = None):
+        super().__init__(parent)
+        self.cache = cache
+        self.folder = folder
+        self._previous = previous or {}  # Basis für inkrementellen Scan
+        self._cancel_event = threading.Event()
+    
+    def run(self):
+        """Liest alle Bilder und meldet Fortschritt batchweise"""
+        records = None
+        try:
+            def _on_batch(batch, done, total):
+                if self._cancel_event.is_set():
+                    return
+                self.partialResults.emit(self.folder, batch)
+                self.progress.emit(self.folder, done, total)
+            
+            records = self.cache.scan_folder(
+                self.folder,
+                previous=self._previous,
+                cancel_event=self._cancel_event,
+                on_batch=_on_batch,
+            )
+        except Exception as e:
+            try:
+                from utils_logging import get_logger
+                logger = get_logger('app', {"module": "qtui.evaluation_cache_builder"})
+                logger.error("cache_build_failed", extra={"event": "cache_build_failed", "folder": self.folder, "error": str(e)})
+            except Exception:
+                pass
+        self.buildFinished.emit(self.folder, None if self._cancel_event.is_set() else records)
+    
+    def cancel(self):
+        """Bricht den Aufbau ab (z.B. bei Ordnerwechsel); blockiert nicht"""
+        self._cancel_event.set()
+    
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
@@ -5,17 +5,20 @@ Zwischenspeicher für Bewertungsänderungen, um Datenverlust bei schnellen Bildw
 """
 
 import os
-from typing import Dict, Optional
-from threading import Lock
-from utils_exif import set_evaluation, set_used_flag, get_evaluation, read_metadata, update_metadata
+import time
+from typing import Dict, List, Optional
+from threading import Condition, Lock
+from utils_exif import apply_metadata_changes, get_evaluation, get_ocr_info, read_metadata
 
 
 class EvaluationCacheLayer:
     """Cache-Layer für Bewertungsänderungen mit asynchronem Schreiben in EXIF"""
     
     def __init__(self):
-        self._pending_changes: Dict[str, dict] = {}  # {path: {evaluation: {...}, use: bool, timestamp: float}}
+        self._pending_changes: Dict[str, dict] = {}  # {path: {evaluation: {...}, use: bool, tag: str|None, timestamp: float}}
         self._lock = Lock()  # Thread-sicherer Zugriff
+        self._changed = Condition(self._lock)  # Weckt den Worker bei neuen Änderungen
+        self._flush_requested = False  # Nächstes Warten liefert sofort alle pending Pfade
         self._exif_cache: Dict[str, dict] = {}  # Cache für gelesene EXIF-Daten
         self._max_exif_cache_size = 500  # Maximale Anzahl gecachter EXIF-Daten (verhindert RAM-Überlauf)
         
@@ -151,12 +154,13 @@ class EvaluationCacheLayer:
             
             # Speichere im pending changes
             self._pending_changes[path]['evaluation'] = current_eval
-            import time
             self._pending_changes[path]['timestamp'] = time.time()
             
             # Invalidate EXIF-Cache für diesen Pfad
             if path in self._exif_cache:
                 del self._exif_cache[path]
+            
+            self._changed.notify_all()
         
         return True
     
@@ -172,15 +176,62 @@ class EvaluationCacheLayer:
             
             # Speichere im pending changes
             self._pending_changes[path]['use'] = bool(used)
-            import time
             self._pending_changes[path]['timestamp'] = time.time()
             
             # Invalidate EXIF-Cache für diesen Pfad
             if path in self._exif_cache:
                 del self._exif_cache[path]
             
+            self._changed.notify_all()
             return True
     
+    def get_ocr_tag(self, path: str) -> str:
+        """Liest den OCR-Tag aus Cache (falls pending) oder aus EXIF"""
+        if not path:
+            return ""
+        with self._lock:
+            pending = self._pending_changes.get(path)
+            if pending is not None and 'tag' in pending:
+                return pending['tag'] or ""
+        try:
+            return get_ocr_info(path).get('tag', '') or ""
+        except Exception:
+            return ""
+    
+    def set_ocr_tag(self, path: str, tag: Optional[str], box=None) -> bool:
+        """Speichert den OCR-Tag (und ggf. die OCR-Box) sofort im Cache.
+        None/leer entfernt den Tag beim Flush; er wird mit Bewertung/use-Flag zusammen geschrieben."""
+        if not path:
+            return False
+        
+        tag_clean = str(tag).strip() if tag else ""
+        with self._lock:
+            if path not in self._pending_changes:
+                self._pending_changes[path] = {'evaluation': {}, 'timestamp': 0.0}
+            
+            self._pending_changes[path]['tag'] = tag_clean or None
+            if box is not None:
+                self._pending_changes[path]['box'] = list(box)
+            self._pending_changes[path]['timestamp'] = time.time()
+            
+            if path in self._exif_cache:
+                del self._exif_cache[path]
+            
+            self._changed.notify_all()
+            return True
+    
+    def get_pending(self, path: str) -> dict:
+        """Kopie der noch nicht geschriebenen Änderungen eines Bildes (ohne Dateizugriff).
+        Schlüssel nur falls gesetzt: 'evaluation', 'use', 'tag'."""
+        with self._lock:
+            pending = self._pending_changes.get(path)
+            if pending is None:
+                return {}
+            result = {k: v for k, v in pending.items() if k in ('use', 'tag')}
+            if pending.get('evaluation'):
+                result['evaluation'] = dict(pending['evaluation'])
+            return result
+
     def has_pending_changes(self, path: Optional[str] = None) -> bool:
         """Prüft ob es pending changes gibt (für spezifischen Pfad oder insgesamt)"""
         with self._lock:
@@ -193,8 +244,63 @@ class EvaluationCacheLayer:
         with self._lock:
             return list(self._pending_changes.keys())
     
+    def wait_for_due_paths(self, debounce: float, timeout: Optional[float] = None) -> List[str]:
+        """Blockiert bis pending changes fällig sind und gibt diese zurück (älteste zuerst).
+        
+        Fällig ist ein Pfad, wenn seit der letzten Änderung 'debounce' Sekunden
+        vergangen sind – schnelle Folgeänderungen am selben Bild werden so zu
+        einem Schreibvorgang zusammengefasst. Ohne pending changes wird ohne
+        Timeout geschlafen (kein Polling). Nach wake() werden alle Pfade sofort
+        geliefert. Bei Timeout kann die Liste leer sein.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._changed:
+            while True:
+                if self._flush_requested:
+                    self._flush_requested = False
+                    return sorted(self._pending_changes,
+                                  key=lambda p: self._pending_changes[p].get('timestamp', 0.0))
+                
+                now = time.time()
+                due = []
+                wait = None
+                for p, change in self._pending_changes.items():
+                    ready_at = max(change.get('timestamp', 0.0) + debounce, change.get('not_before', 0.0))
+                    if ready_at <= now:
+                        due.append((change.get('timestamp', 0.0), p))
+                    else:
+                        remaining = ready_at - now
+                        wait = remaining if wait is None else min(wait, remaining)
+                if due:
+                    due.sort()
+                    return [p for _ts, p in due]
+                
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return []
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._changed.wait(wait)
+    
+    def wake(self):
+        """Weckt wartende Worker; alle pending changes gelten sofort als fällig"""
+        with self._changed:
+            self._flush_requested = True
+            self._changed.notify_all()
+    
+    def defer(self, path: str, delay: float):
+        """Verschiebt den nächsten Schreibversuch für einen Pfad (z.B. nach Fehler)"""
+        with self._lock:
+            if path in self._pending_changes:
+                self._pending_changes[path]['not_before'] = time.time() + max(0.0, delay)
+    
     def flush_to_exif(self, path: str) -> bool:
-        """Schreibt pending changes für einen spezifischen Pfad sofort in EXIF"""
+        """Schreibt pending changes für einen spezifischen Pfad sofort in EXIF.
+
+        Bewertung (inkl. Gene/Notizen), use-Flag und OCR-Tag werden zu einem
+        Metadaten-Dict zusammengeführt und mit höchstens einem Schreibvorgang
+        gespeichert; unveränderte Metadaten werden gar nicht geschrieben.
+        """
         if not path:
             return False
         
@@ -213,46 +319,30 @@ class EvaluationCacheLayer:
             if path not in self._pending_changes:
                 return True  # Nichts zu schreiben - bereits gespeichert oder nie geändert
             
-            # Tiefe Kopie der pending changes
-            pending = {
-                'evaluation': self._pending_changes[path].get('evaluation', {}).copy() if 'evaluation' in self._pending_changes[path] else None,
-                'use': self._pending_changes[path].get('use') if 'use' in self._pending_changes[path] else None
-            }
-        
-        # EXIF-Schreibvorgänge AUSSERHALB des Locks (vermeidet Blockierung)
-        success = True
+            change = self._pending_changes[path]
+            snapshot_ts = change.get('timestamp', 0.0)
+            kwargs = {}
+            if change.get('evaluation'):
+                kwargs['evaluation'] = dict(change['evaluation'])
+            if change.get('use') is not None:
+                kwargs['used'] = change['use']
+            if 'tag' in change:
+                kwargs['tag'] = change['tag']
+            if change.get('box') is not None:
+                kwargs['box'] = change['box']
         
-        # Schreibe Bewertung
-        if pending['evaluation'] is not None:
-            eval_data = pending['evaluation']
-            try:
-                result = set_evaluation(
-                    path,
-                    categories=eval_data.get('categories'),
-                    quality=eval_data.get('quality'),
-                    image_type=eval_data.get('image_type'),
-                    image_types=eval_data.get('image_types'),
-                    notes=eval_data.get('notes'),
-                    gene=eval_data.get('gene')
-                )
-                if not result:
-                    success = False
-            except Exception:
-                success = False
+        # Ein Lese- und höchstens ein Schreibvorgang AUSSERHALB des Locks
+        try:
+            success = apply_metadata_changes(path, **kwargs) if kwargs else True
+        except Exception:
+            success = False
         
-        # Schreibe use flag
-        if pending['use'] is not None:
-            try:
-                result = set_used_flag(path, pending['use'])
-                if not result:
-                    success = False
-            except Exception:
-                success = False
-        
-        # Entferne aus pending changes nach erfolgreichem Schreiben (mit Lock)
+        # Entferne aus pending changes nach erfolgreichem Schreiben (mit Lock).
+        # Neuere Änderungen während des Schreibens bleiben für den nächsten Flush erhalten.
         if success:
             with self._lock:
-                if path in self._pending_changes:
+                change = self._pending_changes.get(path)
+                if change is not None and change.get('timestamp', 0.0) == snapshot_ts:
                     del self._pending_changes[path]
                 # Invalidate EXIF-Cache
                 if path in self._exif_cache:
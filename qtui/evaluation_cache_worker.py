@@ -4,63 +4,72 @@ Evaluation Cache Worker
 Hintergrund-Worker für asynchrones Schreiben von Bewertungsänderungen in EXIF-Daten.
 """
 
-import time
 from PySide6.QtCore import QThread, Signal
 from .evaluation_cache_layer import EvaluationCacheLayer
 
 
 class EvaluationCacheWorker(QThread):
-    """Hintergrund-Worker für asynchrones Schreiben von pending changes in EXIF"""
-    
+    """Hintergrund-Worker für asynchrones Schreiben von pending changes in EXIF.
+
+    Ereignisgesteuert: der Worker schläft auf der Condition des Cache-Layers und
+    wird von set_evaluation/set_used_flag geweckt. Änderungen am selben Bild
+    innerhalb des Debounce-Fensters werden zu einem Schreibvorgang zusammengefasst.
+    """
+
     progress = Signal(str)  # Emittiert nach erfolgreichem Schreiben eines Pfads
     error = Signal(str, str)  # Emittiert bei Fehler (path, error_message)
-    
+
     def __init__(self, cache_layer: EvaluationCacheLayer, parent=None):
         super().__init__(parent)
         self.cache_layer = cache_layer
         self._running = False
-        self._flush_interval = 3.0  # Sekunden zwischen Flush-Zyklen
-        self._batch_size = 5  # Max Anzahl Bilder pro Batch
+        self._debounce = self._load_debounce()  # Sekunden Ruhe bis ein Pfad geschrieben wird
+        self._min_batch_size = 5  # Mindestanzahl Bilder pro Batch
+        self._max_batch_size = 50  # Obergrenze, damit stop() zügig greift
+        self._retry_delay = 5.0  # Sekunden bis zum erneuten Versuch nach Fehler
         self._stop_requested = False
-    
+
+    @staticmethod
+    def _load_debounce() -> float:
+        try:
+            from .settings_manager import get_settings_manager
+            value = get_settings_manager().get('performance_flush_debounce_ms', 500)
+            return max(0.0, float(value) / 1000.0)
+        except Exception:
+            return 0.5
+
+    def _batch_size_for(self, backlog: int) -> int:
+        """Batchgröße wächst mit dem Rückstau (halber Backlog, begrenzt)"""
+        return max(self._min_batch_size, min(self._max_batch_size, backlog // 2))
+
     def run(self):
         """Hauptschleife des Workers"""
         self._running = True
         self._stop_requested = False
-        
+
         while not self._stop_requested:
             try:
-                # Prüfe auf pending changes
-                if self.cache_layer.has_pending_changes():
-                    pending_paths = self.cache_layer.get_pending_paths()
-                    
-                    # Verarbeite in Batches
-                    batch = pending_paths[:self._batch_size]
-                    for path in batch:
-                        if self._stop_requested:
-                            break
-                        
-                        try:
-                            # Schreibe in EXIF
-                            if self.cache_layer.flush_to_exif(path):
-                                self.progress.emit(path)
-                            else:
-                                self.error.emit(path, "Fehler beim Schreiben in EXIF")
-                        except Exception as e:
-                            self.error.emit(path, str(e))
-                
-                # Wenn stop_requested und noch pending changes: Flushe alle
-                if self._stop_requested and self.cache_layer.has_pending_changes():
+                # Schläft ohne CPU-Last, bis Änderungen fällig sind oder stop() weckt
+                due_paths = self.cache_layer.wait_for_due_paths(self._debounce)
+                if self._stop_requested:
+                    break
+
+                batch = due_paths[:self._batch_size_for(len(due_paths))]
+                for path in batch:
+                    if self._stop_requested:
+                        break
+
                     try:
-                        self.cache_layer.flush_all()
-                    except Exception:
-                        pass
-                    break  # Beende nach finalem Flush
-                
-                # Warte bis zum nächsten Zyklus
-                if not self._stop_requested:
-                    time.sleep(self._flush_interval)
-                    
+                        # Schreibe in EXIF
+                        if self.cache_layer.flush_to_exif(path):
+                            self.progress.emit(path)
+                        else:
+                            self.cache_layer.defer(path, self._retry_delay)
+                            self.error.emit(path, "Fehler beim Schreiben in EXIF")
+                    except Exception as e:
+                        self.cache_layer.defer(path, self._retry_delay)
+                        self.error.emit(path, str(e))
+
             except Exception as e:
                 # Bei unerwarteten Fehlern: Log und weiter
                 try:
@@ -70,18 +79,26 @@ class EvaluationCacheWorker(QThread):
                 except Exception:
                     pass
                 if not self._stop_requested:
-                    time.sleep(self._flush_interval)
-        
+                    self.msleep(500)
+
+        # Beim Beenden: alle verbleibenden pending changes flushen
+        if self.cache_layer.has_pending_changes():
+            try:
+                self.cache_layer.flush_all()
+            except Exception:
+                pass
+
         self._running = False
-    
+
     def stop(self):
         """Stoppt den Worker (wird beim App-Ende aufgerufen)"""
         self._stop_requested = True
-        
+        self.cache_layer.wake()
+
         # Warte auf Worker-Thread, der flush_all() im run() aufruft
         # (wird im Worker-Thread ausgeführt, nicht im UI-Thread)
         self.wait(5000)  # Warte max 5 Sekunden auf Beendigung
-        
+
         # Falls Worker nicht mehr läuft und noch pending changes existieren,
         # flushe asynchron im Hintergrund (nicht blockierend für UI)
         if not self.isRunning() and self.cache_layer.has_pending_changes():
@@ -93,15 +110,9 @@ class EvaluationCacheWorker(QThread):
                 except Exception:
                     pass
             QTimer.singleShot(0, _final_flush)
-    
+
     def flush_now(self):
-        """Fordert sofortiges Flushen aller pending changes an (wird vom UI aufgerufen)"""
+        """Fordert sofortiges Flushen aller pending changes an (wird vom UI aufgerufen).
+        Das Schreiben selbst übernimmt der Worker-Thread."""
         if self.cache_layer.has_pending_changes():
-            pending_paths = self.cache_layer.get_pending_paths()
-            for path in pending_paths:
-                try:
-                    if self.cache_layer.flush_to_exif(path):
-                        self.progress.emit(path)
-                except Exception as e:
-                    self.error.emit(path, str(e))
-
+            self.cache_layer.wake()
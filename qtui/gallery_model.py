@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Gallery Model
+Virtualisierte Galerie: QAbstractListModel über die gefilterten Pfade plus Delegate,
+der nur sichtbare Kacheln zeichnet.
+"""
+
+from __future__ import annotations
+
+import os
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QSize, Qt, QRect
+from PySide6.QtGui import QColor, QPainter, QPen, QPixmap
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate
+
+
+class GalleryModel(QAbstractListModel):
+    """Liste der Bildpfade; Kachelbild und Tooltip liefert der Provider (GalleryView).
+
+    Der Provider muss tile_pixmap(path) -> QPixmap | None und tile_tooltip(path) -> str
+    bereitstellen. Beide werden nur für tatsächlich gezeichnete Zeilen abgefragt.
+    """
+
+    PathRole = Qt.UserRole + 1
+
+    def __init__(self, provider, parent=None):
+        super().__init__(parent)
+        self._provider = provider
+        self._paths: list[str] = []
+        self._rows: dict[str, int] = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._paths)):
+            return None
+        path = self._paths[index.row()]
+        if role == self.PathRole:
+            return path
+        if role == Qt.DecorationRole:
+            return self._provider.tile_pixmap(path)
+        if role == Qt.ToolTipRole:
+            return self._provider.tile_tooltip(path)
+        if role == Qt.AccessibleTextRole:
+            return os.path.basename(path)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def set_paths(self, paths: list[str]):
+        """Ersetzt die Pfadliste (ein Reset, keine Widgets pro Kachel)"""
+        self.beginResetModel()
+        self._paths = list(paths)
+        self._rows = {p: i for i, p in enumerate(self._paths)}
+        self.endResetModel()
+
+    def paths(self) -> list[str]:
+        return self._paths
+
+    def contains(self, path: str) -> bool:
+        return path in self._rows
+
+    def row_of(self, path: str) -> int:
+        return self._rows.get(path, -1)
+
+    def index_of(self, path: str) -> QModelIndex:
+        row = self._rows.get(path, -1)
+        return self.index(row, 0) if row >= 0 else QModelIndex()
+
+    def path_at(self, row: int) -> str | None:
+        return self._paths[row] if 0 <= row < len(self._paths) else None
+
+    def notify_changed(self, path: str):
+        """Löst ein Neuzeichnen genau einer Kachel aus"""
+        row = self._rows.get(path, -1)
+        if row >= 0:
+            idx = self.index(row, 0)
+            self.dataChanged.emit(idx, idx, [Qt.DecorationRole, Qt.ToolTipRole])
+
+    def notify_all_changed(self):
+        if self._paths:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._paths) - 1, 0),
+                                  [Qt.DecorationRole, Qt.ToolTipRole])
+
+
+class GalleryDelegate(QStyledItemDelegate):
+    """Zeichnet Kachelbild (zentriert), Overlays, Platzhalter und Auswahl-/Hover-Rahmen.
+
+    Die Overlays (Tag, Status-Symbole) werden bei jedem Paint über das unveränderte
+    Basis-Thumbnail gelegt, damit eine Bewertungsänderung kein neues Thumbnail braucht.
+    """
+
+    def __init__(self, cell_size_provider, overlay_painter=None, parent=None):
+        super().__init__(parent)
+        self._cell_size = cell_size_provider  # callable -> (breite, höhe)
+        self._paint_overlay = overlay_painter  # callable(painter, rect, pfad) oder None
+
+    def sizeHint(self, option, index):
+        w, h = self._cell_size()
+        return QSize(w, h)
+
+    def paint(self, painter: QPainter, option, index):
+        painter.save()
+        rect = option.rect
+        selected = bool(option.state & QStyle.State_Selected)
+        hover = bool(option.state & QStyle.State_MouseOver)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+
+        pix = index.data(Qt.DecorationRole)
+        if isinstance(pix, QPixmap) and not pix.isNull():
+            x = rect.x() + (rect.width() - pix.width()) // 2
+            y = rect.y() + (rect.height() - pix.height()) // 2
+            painter.drawPixmap(x, y, pix)
+            if self._paint_overlay is not None:
+                path = index.data(GalleryModel.PathRole)
+                if path:
+                    self._paint_overlay(painter, QRect(x, y, pix.width(), pix.height()), path)
+        else:
+            painter.setPen(option.palette.color(option.palette.ColorRole.PlaceholderText))
+            painter.drawText(rect, Qt.AlignCenter, "…")
+
+        if selected:
+            painter.setBrush(QColor(33, 150, 243, 26))
+            painter.setPen(QPen(QColor("#2196F3"), 3))
+            painter.drawRoundedRect(QRect(rect).adjusted(1, 1, -2, -2), 8, 8)
+        elif hover:
+            painter.setBrush(Qt.NoBrush)
+            painter.setPen(QPen(QColor("#2196F3"), 2))
+            painter.drawRoundedRect(QRect(rect).adjusted(1, 1, -2, -2), 8, 8)
+        painter.restore()
@@ -1,75 +1,25 @@
 ﻿# -*- coding: utf-8 -*-
 from __future__ import annotations
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea, QFrame,
-    QPushButton, QFileDialog, QGridLayout, QComboBox, QLineEdit,
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListView, QAbstractItemView,
+    QPushButton, QFileDialog, QComboBox, QLineEdit,
     QGroupBox, QCheckBox, QSpinBox, QTreeView
 )
-from PySide6.QtCore import Signal, Qt, QTimer, QEvent
-from PySide6.QtGui import QPixmap, QPainter, QColor, QFont, QStandardItemModel, QStandardItem, QPen, QBrush, QPainterPath, QImage
+from PySide6.QtCore import Signal, Qt, QTimer, QEvent, QRect, QSize, QItemSelectionModel
+from PySide6.QtGui import QPixmap, QPainter, QColor, QFont, QFontMetrics, QStandardItemModel, QStandardItem, QPen, QBrush, QPainterPath, QImage
 from utils_logging import get_logger
-from utils_exif import get_ocr_info, get_evaluation, get_used_flag
+from utils_exif import get_evaluation, load_metadata_snapshot, MetadataSnapshot
 from .settings_manager import get_settings_manager
 from .evaluation_panel import EvaluationPanel
+from .thumbnail_loader import ThumbnailLoader
+from .metadata_row_loader import MetadataRowLoader
+from .gallery_model import GalleryModel, GalleryDelegate
+from .pixmap_cache import get_pixmap_cache
 import os
 import hashlib
 from PIL import Image
 
 
-class ClickableLabel(QLabel):
-    clicked = Signal(str)
-    doubleClicked = Signal(str)
-
-    def __init__(self, path: str, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._path = path
-        self._is_selected = False
-        self.setCursor(Qt.PointingHandCursor)
-        self._update_border_style()
-
-    def _update_border_style(self):
-        """Aktualisiert Border-Style basierend auf Auswahl"""
-        if self._is_selected:
-            self.setStyleSheet("""
-                QLabel {
-                    border: 3px solid #2196F3;
-                    border-radius: 8px;
-                    background-color: rgba(33, 150, 243, 0.1);
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QLabel {
-                    border: 2px solid transparent;
-                    border-radius: 8px;
-                }
-                QLabel:hover {
-                    border-color: #2196F3;
-                }
-            """)
-    
-    def set_selected(self, selected: bool):
-        """Setzt Auswahl-Status"""
-        self._is_selected = selected
-        self._update_border_style()
-
-    def mousePressEvent(self, ev):
-        # Einfacher Klick aktiviert Bild (für Bewertung)
-        if ev.button() == Qt.LeftButton:
-            self.clicked.emit(self._path)
-        return super().mousePressEvent(ev)
-    
-    def mouseDoubleClickEvent(self, ev):
-        if ev.button() == Qt.LeftButton:
-            self.doubleClicked.emit(self._path)
-        return super().mouseDoubleClickEvent(ev)
-    
-    def set_status_icons(self, has_ocr: bool, is_evaluated: bool, quality: str = None):
-        """Setzt Status-Icons für OCR und Bewertung"""
-        # Status-Icons werden in _load_chunk() hinzugefügt
-        pass
-
-
 class GalleryView(QWidget):
     imageSelected = Signal(str)
     imageSelectedWithTabSwitch = Signal(str)  # Für Doppelklick mit Tab-Wechsel
@@ -203,15 +153,31 @@ class GalleryView(QWidget):
         self.code_filter_combo = QComboBox()
         self.code_filter_combo.hide()
 
-        # Scroll-Grid
-        self.area = QScrollArea()
-        self.area.setWidgetResizable(True)
-        self.wrapper = QFrame()
-        self.area.setWidget(self.wrapper)
-        self.grid = QGridLayout(self.wrapper)
-        self.grid.setContentsMargins(8, 8, 8, 8)
-        self.grid.setHorizontalSpacing(8)
-        self.grid.setVerticalSpacing(8)
+        # Virtualisiertes Raster: ein QListView über alle gefilterten Pfade,
+        # gezeichnet werden nur sichtbare Kacheln (keine Widgets pro Bild)
+        self._grid_margin = 8
+        self._grid_spacing = 8
+        self._model = GalleryModel(self, self)
+        self.area = QListView()
+        self.area.setViewMode(QListView.IconMode)
+        self.area.setFlow(QListView.LeftToRight)
+        self.area.setWrapping(True)
+        self.area.setMovement(QListView.Static)
+        self.area.setResizeMode(QListView.Adjust)
+        self.area.setUniformItemSizes(True)
+        self.area.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.area.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.area.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.area.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)  # Kein Umbruch-Flackern
+        self.area.setMouseTracking(True)
+        # Tastatur bleibt bei der Galerie (Bewertungs-Shortcuts statt Tastatursuche)
+        self.area.setFocusPolicy(Qt.NoFocus)
+        self.area.setViewportMargins(self._grid_margin, self._grid_margin, 0, 0)
+        self.area.setModel(self._model)
+        self.area.setItemDelegate(GalleryDelegate(lambda: self._thumb_size, self.paint_tile_overlay, self.area))
+        self.area.clicked.connect(self._on_index_clicked)
+        self.area.doubleClicked.connect(self._on_index_double_clicked)
+        self.area.verticalScrollBar().valueChanged.connect(self._on_scrolled)
         gallery_layout.addWidget(self.area, 1)
         self._debug_label = QLabel(self.area.viewport())
         self._debug_label.setStyleSheet("background-color: rgba(0,0,0,140); color: white;padding: 6px; border-radius: 6px; font-family: Consolas, monospace; font-size: 9pt;")
@@ -222,17 +188,30 @@ class GalleryView(QWidget):
         self._resize_timer = QTimer(self)
         self._resize_timer.setSingleShot(True)
         self._resize_timer.timeout.connect(self._handle_viewport_resize)
+        # Vorab-Laden der Nachbarseiten, sobald die Navigation kurz ruht
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.timeout.connect(self._prefetch_adjacent)
+        self._tag_group_index = {}  # {pfad: index in _tag_groups}
         self._thumb_size = (160, 120)
         self._paths = []
         self._filtered_paths = []
         self._current_selected_path = None
         self.sort_mode = "Dateiname (A-Z)"
-        self._labels = []
-        self._cache = {}
-        self._path_to_label = {}
-        self._pending_idx = 0
-        self._loader = QTimer(self)
-        self._loader.timeout.connect(self._load_chunk)
+        # Gemeinsamer Pixmap-Cache mit Byte-Budget:
+        # ('gallery', pfad, thumb_size) Basis-Thumbnail, ('gallery_preview', pfad, thumb_size) EXIF-Vorschau
+        self._cache = get_pixmap_cache()
+        self._meta_table = {}  # {pfad: (ocr_info, use_flag, eval_data)} – In-Memory-Metadaten des Ordners
+        self._rows_loading = set()  # Pfade mit Platzhalterzeile, echte Zeile liest _row_loader
+        self._row_loader = MetadataRowLoader(self)
+        self._row_loader.rowsReady.connect(self._on_metadata_rows)
+        self._row_loader.finished.connect(self._on_metadata_rows_finished)
+        self._badge_sprites = {}  # {(tag, schriftgröße, deckkraft): Badge-Pixmap}
+        self._request_seq = 0  # Neuere Anfragen (aktuell sichtbar) zuerst dekodieren
+        # Thumbnails werden im Hintergrund dekodiert, nur QImage -> QPixmap im GUI-Thread
+        self._thumb_loader = ThumbnailLoader(self)
+        self._thumb_loader.thumbnailReady.connect(self._on_thumbnail_ready)
+        self._thumb_loader.previewReady.connect(self._on_thumbnail_preview)
         self._current_page = 1
         self._items_per_page = 20
         self._grid_mode = 'auto'  # 'auto' oder (rows, cols)
@@ -243,9 +222,9 @@ class GalleryView(QWidget):
         
         # Verbindungen
         self.btn_open.clicked.connect(self._open_folder)
+        self._failed = set()  # Pfade, deren Thumbnail nicht dekodiert werden konnte
         # Erste Layout-Berechnung
-        self._recalculate_layout()
-        self._update_debug_overlay()
+        self._apply_layout()
         # Erste Sortierung anwenden
         self._apply_sort()
         # Tree initial befüllen
@@ -425,18 +404,14 @@ class GalleryView(QWidget):
         stats = {}  # code -> [total, evaluated]
         paths = list(self._paths or [])
         for p in paths:
-            try:
-                info = get_ocr_info(p)
-                tag = str(info.get('tag') or '').upper().strip()
-                if not tag:
-                    continue
-                total, done = stats.get(tag, [0, 0])
-                total += 1
-                if self._is_evaluated(p):
-                    done += 1
-                stats[tag] = [total, done]
-            except Exception:
+            tag = self._tag_of(p).upper().strip()
+            if not tag:
                 continue
+            total, done = stats.get(tag, [0, 0])
+            total += 1
+            if self._is_evaluated(p):
+                done += 1
+            stats[tag] = [total, done]
         out = {}
         for code, (total, done) in stats.items():
             out[code] = (total > 0 and done == total)
@@ -489,10 +464,8 @@ class GalleryView(QWidget):
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        # Bei Größenänderung: Auto-Fit oder feste Raster neu berechnen
-        self._recalculate_layout()
-        self._update_pagination()
-        self._render_grid()
+        # Bei Größenänderung: Auto-Fit oder feste Raster neu berechnen (ohne Neuaufbau)
+        self._apply_layout()
 
     def _on_grid_mode_changed(self, text: str):
         t = text.strip()
@@ -512,9 +485,7 @@ class GalleryView(QWidget):
         # In Einstellungen speichern
         self.settings_manager.set('gallery_grid_mode', text)
         
-        self._recalculate_layout()
-        self._update_pagination()
-        self._render_grid()
+        self._apply_layout()
 
     def _recalculate_layout(self):
         """Berechnet Raster (Zeilen/Spalten) und Thumb-Größe aus Modus + verfügbarer Fläche."""
@@ -522,27 +493,24 @@ class GalleryView(QWidget):
             vp = self.area.viewport().size()
             avail_w = max(100, vp.width())
             avail_h = max(100, vp.height())
-            m = self.grid.contentsMargins()
-            spacing_h = self.grid.horizontalSpacing() or 0
-            spacing_v = self.grid.verticalSpacing() or 0
-            pad_w = (m.left() if hasattr(m, 'left') else 8) + (m.right() if hasattr(m, 'right') else 8)
-            pad_h = (m.top() if hasattr(m, 'top') else 8) + (m.bottom() if hasattr(m, 'bottom') else 8)
-            inner_w = max(50, avail_w - pad_w)
-            inner_h = max(50, avail_h - pad_h)
+            spacing = self._grid_spacing
+            # Links/oben liegt der Rand als Viewport-Margin, rechts/unten ziehen wir ihn ab
+            inner_w = max(50, avail_w - self._grid_margin - 1)
+            inner_h = max(50, avail_h - self._grid_margin - 1)
 
             # Basisgröße aus Settings (Seitenverhältnis ~ 4:3)
             base_w = int(self.settings_manager.get('thumb_size', 160) or 160)
             base_h = int(base_w * 0.75)
 
             if self._grid_mode == 'auto':
-                cols = max(1, inner_w // (base_w + spacing_h))
-                rows = max(1, inner_h // (base_h + spacing_v))
+                cols = max(1, inner_w // (base_w + spacing))
+                rows = max(1, inner_h // (base_h + spacing))
             else:
                 rows, cols = self._grid_mode
 
             # Zellen-Größe passend verteilen
-            cell_w = max(32, int((inner_w - spacing_h * max(0, cols - 1)) / cols))
-            cell_h = max(32, int((inner_h - spacing_v * max(0, rows - 1)) / rows))
+            cell_w = max(32, int((inner_w - spacing * max(0, cols - 1)) / cols))
+            cell_h = max(32, int((inner_h - spacing * max(0, rows - 1)) / rows))
             self._thumb_size = (cell_w, cell_h)
             self._rows = rows
             self._cols = cols
@@ -553,6 +521,23 @@ class GalleryView(QWidget):
             self._items_per_page = self._rows * self._cols
             self._thumb_size = (160, 120)
 
+    def _apply_layout(self):
+        """Überträgt Raster und Zellgröße auf den ListView; Kacheln werden nicht neu erzeugt."""
+        old_size = self._thumb_size
+        self._recalculate_layout()
+        if self._thumb_size != old_size:
+            # Andere Kachelgröße: Vorschauen und alte Decodes verwerfen
+            self._cache.clear('gallery_preview')
+            self._thumb_loader.cancel_pending()
+            self._request_seq = 0
+        w, h = self._thumb_size
+        self.area.setGridSize(QSize(w + self._grid_spacing, h + self._grid_spacing))
+        self.area.setIconSize(QSize(w, h))
+        self._update_pagination()
+        self.area.viewport().update()
+        self._update_debug_overlay()
+        self._schedule_prefetch()
+
     def _open_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Ordner öffnen", "")
         if not folder:
@@ -576,6 +561,9 @@ class GalleryView(QWidget):
         files.sort()
         self._paths = files
         self._current_folder = folder or ""
+        self._failed.clear()
+        # Filter, Sortierung, Suche und Overlays arbeiten ab hier nur noch auf dieser Tabelle
+        self._load_metadata_table(folder, files)
         self._update_open_button_tooltip()
         self._current_selected_path = None
         if self._evaluation_panel:
@@ -597,13 +585,7 @@ class GalleryView(QWidget):
         paths = list(self._paths)
         if getattr(self, "_code_filter", None):
             want = set(self._code_filter)
-            def _m(p):
-                try:
-                    info = get_ocr_info(p)
-                    return (str(info.get('tag') or '').upper().strip() in want)
-                except Exception:
-                    return False
-            paths = [p for p in paths if _m(p)]
+            paths = [p for p in paths if self._tag_of(p).upper().strip() in want]
         self._filtered_paths = paths
         self._apply_sort()
 
@@ -618,11 +600,7 @@ class GalleryView(QWidget):
         if mode == "OCR-Tag":
             # Sortiere nach OCR-Tag (gruppiert)
             def key_func(p):
-                try:
-                    info = get_ocr_info(p)
-                    tag = str(info.get('tag') or '')
-                except Exception:
-                    tag = ''
+                tag = self._tag_of(p)
                 return (tag == '', tag.upper())
             paths.sort(key=key_func)
             self._filtered_paths = paths
@@ -638,49 +616,35 @@ class GalleryView(QWidget):
 
     def _has_ocr_tag(self, path: str) -> bool:
         """Prüft ob das Bild ein OCR-Tag hat"""
-        try:
-            info = get_ocr_info(path)
-            return bool(info.get('tag'))
-        except:
-            return False
+        return bool(self._tag_of(path))
 
     def _is_evaluated(self, path: str) -> bool:
         """Prüft ob das Bild bewertet wurde"""
-        try:
-            eval_data = get_evaluation(path)
-            return bool(eval_data.get('categories') or eval_data.get('quality') or eval_data.get('image_type'))
-        except:
-            return False
+        eval_data = self._metadata_row(path)[2] or {}
+        return bool(eval_data.get('categories') or eval_data.get('quality') or eval_data.get('image_type'))
 
     def _has_quality(self, path: str, quality: str) -> bool:
         """Prüft ob das Bild die angegebene Qualität hat"""
-        try:
-            eval_data = get_evaluation(path)
-            return eval_data.get('quality') == quality
-        except:
-            return False
+        eval_data = self._metadata_row(path)[2] or {}
+        return eval_data.get('quality') == quality
 
     def _matches_search(self, path: str, search_text: str) -> bool:
         """Prüft ob das Bild dem Suchtext entspricht"""
         filename = os.path.basename(path).lower()
         if search_text in filename:
             return True
-        try:
-            info = get_ocr_info(path)
-            tag = str(info.get('tag', '')).lower()
-            return search_text in tag
-        except:
-            return False
+        return search_text in self._tag_of(path).lower()
 
     def _update_pagination(self):
-        """Aktualisiert die Pagination"""
+        """Aktualisiert die Pagination (eine Seite = ein Bildschirm voll Kacheln)"""
         total_items = len(self._filtered_paths)
         total_pages = max(1, (total_items + self._items_per_page - 1) // self._items_per_page)
         
         self.page_spin.setMaximum(total_pages)
-        if self._current_page > total_pages:
-            self._current_page = 1
-            self.page_spin.setValue(1)
+        self._current_page = min(self._page_from_scroll(), total_pages)
+        self.page_spin.blockSignals(True)
+        self.page_spin.setValue(self._current_page)
+        self.page_spin.blockSignals(False)
         
         self._update_page_display()
     
@@ -699,51 +663,102 @@ class GalleryView(QWidget):
             self.btn_next_page.setEnabled(self._current_page < max_page)
     
     def _update_tag_pagination(self):
-        """Aktualisiert Pagination für Tag-gruppierte Ansicht"""
+        """Gruppiert die Bilder nach Tags (_tag_groups) und aktualisiert die Pagination"""
         # Gruppiere Bilder nach Tags
         from collections import OrderedDict
         tag_groups = OrderedDict()
         for path in self._filtered_paths:
-            try:
-                info = get_ocr_info(path)
-                tag = str(info.get('tag') or '(Kein Tag)').strip()
-            except Exception:
-                tag = '(Kein Tag)'
+            tag = self._tag_of(path).strip() or '(Kein Tag)'
             if tag not in tag_groups:
                 tag_groups[tag] = []
             tag_groups[tag].append(path)
         
         # Speichere Tag-Gruppen
         self._tag_groups = list(tag_groups.values())
-        total_groups = len(self._tag_groups)
-        
-        # Pagination: 1 Seite = 1 Tag-Gruppe
-        self.page_spin.setMaximum(max(1, total_groups))
-        if self._current_page > total_groups:
-            self._current_page = 1
-            self.page_spin.setValue(1)
-        
-        self._update_page_display()
+        self._tag_group_index = {p: i for i, group in enumerate(self._tag_groups) for p in group}
+        self._update_pagination()
+
+    def _page_from_scroll(self) -> int:
+        """Seite (1-basiert), deren erste Zeile gerade oben im Viewport steht"""
+        try:
+            grid_h = max(1, self._thumb_size[1] + self._grid_spacing)
+            first_line = (self.area.verticalScrollBar().value() + grid_h // 2) // grid_h
+            return int(first_line * max(1, self._cols)) // max(1, self._items_per_page) + 1
+        except Exception:
+            return 1
+
+    def _on_scrolled(self, _value: int):
+        page = min(self._page_from_scroll(), self.page_spin.maximum())
+        if page != self._current_page:
+            self._current_page = page
+            self._update_page_display()
+            self._update_debug_overlay()
+        self._schedule_prefetch()
+
+    def _schedule_prefetch(self):
+        self._prefetch_timer.start(120)
+
+    def _prefetch_adjacent(self):
+        """Wärmt die Thumbnails der Nachbarseiten (im OCR-Tag-Modus zusätzlich der nächsten
+        Tag-Gruppe) mit niedriger Priorität vor; veraltete Vorab-Aufträge werden verworfen."""
+        self._thumb_loader.cancel_prefetch()
+        total = self._model.rowCount()
+        if total <= 0:
+            return
+        try:
+            pages = max(0, int(self.settings_manager.get('performance_gallery_prefetch_pages', 1) or 0))
+        except Exception:
+            pages = 1
+        if pages <= 0:
+            return
+
+        ipp = max(1, self._items_per_page)
+        grid_h = max(1, self._thumb_size[1] + self._grid_spacing)
+        first = (self.area.verticalScrollBar().value() // grid_h) * max(1, self._cols)
+        last = min(total, first + ipp)  # exklusiv; aktuell sichtbarer Bereich
+
+        # Vorwärts zuerst (typische Durchsicht), dann rückwärts
+        rows = list(range(last, min(total, last + pages * ipp)))
+        rows += list(range(max(0, first - pages * ipp), first))[::-1]
+        paths = [self._model.path_at(r) for r in rows]
+
+        mode = self.sort_combo.currentText() if hasattr(self, 'sort_combo') else ""
+        if mode == "OCR-Tag" and self._tag_group_index and last > 0:
+            group = self._tag_group_index.get(self._model.path_at(last - 1))
+            if group is not None and group + 1 < len(self._tag_groups):
+                paths += self._tag_groups[group + 1][:ipp]
+
+        size = self._thumb_size
+        seen = set()
+        priority = -1
+        for path in paths:
+            if not path or path in seen or path in self._failed:
+                continue
+            seen.add(path)
+            if ('gallery', path, size) in self._cache:
+                continue
+            # Negative Priorität: sichtbare Kacheln (positive Sequenz) laufen immer vor
+            self._thumb_loader.request(path, size, priority=priority, prefetch=True)
+            priority -= 1
 
     def _change_page(self, page: int):
-        """Wechselt zur angegebenen Seite"""
+        """Scrollt zur angegebenen Seite"""
+        page = max(1, min(int(page), self.page_spin.maximum()))
         self._current_page = page
-        self._render_grid()
+        idx = self._model.index(min((page - 1) * self._items_per_page, max(0, self._model.rowCount() - 1)), 0)
+        if idx.isValid():
+            self.area.scrollTo(idx, QAbstractItemView.PositionAtTop)
+        self._update_page_display()
     
     def _prev_page(self):
         """Wechselt zur vorherigen Seite"""
         if self._current_page > 1:
-            self._current_page -= 1
-            self._update_page_display()
-            self._render_grid()
+            self._change_page(self._current_page - 1)
     
     def _next_page(self):
         """Wechselt zur nächsten Seite"""
-        max_page = self.page_spin.maximum()
-        if self._current_page < max_page:
-            self._current_page += 1
-            self._update_page_display()
-            self._render_grid()
+        if self._current_page < self.page_spin.maximum():
+            self._change_page(self._current_page + 1)
 
     def _update_open_button_tooltip(self):
         try:
@@ -767,8 +782,7 @@ class GalleryView(QWidget):
             if not path or not hasattr(self, 'ocr_tag_display'):
                 return
             
-            ocr_info = get_ocr_info(path)
-            tag = str(ocr_info.get('tag', '')).strip() if ocr_info else ''
+            tag = self._tag_of(path).strip()
             
             if tag:
                 self.ocr_tag_display.setText(tag)
@@ -838,9 +852,9 @@ class GalleryView(QWidget):
                 gene_flag = bool(state.get('gene', False))
             else:
                 # Fallback: EXIF lesen
-                from utils_exif import get_used_flag, get_gene_flag
-                use_flag = get_used_flag(self._current_selected_path)
-                gene_flag = get_gene_flag(self._current_selected_path)
+                snapshot = load_metadata_snapshot(self._current_selected_path)
+                use_flag = snapshot.used
+                gene_flag = snapshot.gene
             
             if hasattr(self, 'use_toggle'):
                 self.use_toggle.blockSignals(True)
@@ -856,22 +870,13 @@ class GalleryView(QWidget):
     
     def _on_image_clicked(self, path: str):
         """Wird bei Einfach-Klick aufgerufen - Auswahl und Bewertung laden"""
-        # Alte Auswahl deselektieren und Overlays aktualisieren
+        # Overlays des alten Bildes aktualisieren (falls Bewertung geändert wurde)
         if self._current_selected_path and self._current_selected_path != path:
-            old_path = self._current_selected_path
-            if old_path in self._path_to_label:
-                old_label = self._path_to_label[old_path]
-                if hasattr(old_label, 'set_selected'):
-                    old_label.set_selected(False)
-                # Overlays des alten Bildes aktualisieren (falls Bewertung geändert wurde)
-                self.refresh_item(old_path, emit_signal=False)
+            self.refresh_item(self._current_selected_path, emit_signal=False)
         
         # Neue Auswahl setzen
         self._current_selected_path = path
-        if path in self._path_to_label:
-            new_label = self._path_to_label[path]
-            if hasattr(new_label, 'set_selected'):
-                new_label.set_selected(True)
+        self._select_path(path, scroll=False)
         
         # OCR-Tag Anzeige aktualisieren
         self._update_ocr_tag_display(path)
@@ -908,43 +913,17 @@ class GalleryView(QWidget):
             # Prüfe ob bereits das gleiche Bild ausgewählt ist, um Signalschleife zu vermeiden
             if self._current_selected_path == path:
                 # Stelle sicher, dass Auswahl sichtbar ist
-                if path in self._path_to_label:
-                    label = self._path_to_label[path]
-                    if hasattr(label, 'set_selected'):
-                        label.set_selected(True)
+                self._select_path(path)
                 return
 
-            # Vorherige Auswahl zurücksetzen und Overlays aktualisieren
+            # Overlays des vorher gewählten Bildes aktualisieren (falls Bewertung geändert wurde)
             if self._current_selected_path and self._current_selected_path != path:
-                old_path = self._current_selected_path
-                if old_path in self._path_to_label:
-                    old_label = self._path_to_label[old_path]
-                    if hasattr(old_label, 'set_selected'):
-                        old_label.set_selected(False)
-                    # Overlays des alten Bildes aktualisieren (falls Bewertung geändert wurde)
-                    self.refresh_item(old_path, emit_signal=False)
+                self.refresh_item(self._current_selected_path, emit_signal=False)
 
             self._current_selected_path = path
 
-            # Prüfen ob Bild auf aktueller Seite ist, sonst Seite wechseln
-            if path in self._filtered_paths:
-                img_index = self._filtered_paths.index(path)
-                needed_page = (img_index // self._items_per_page) + 1
-                if needed_page != self._current_page:
-                    # Seite wechseln ohne Neurendern zu triggern
-                    self._current_page = needed_page
-                    self.page_spin.blockSignals(True)
-                    self.page_spin.setValue(needed_page)
-                    self.page_spin.blockSignals(False)
-                    # Seitenanzeige aktualisieren
-                    self._update_page_display()
-                    # Grid neu rendern für neue Seite
-                    self._render_grid()
-
-            # Neue Auswahl markieren, sofern vorhanden
-            label = self._path_to_label.get(path)
-            if label and hasattr(label, 'set_selected'):
-                label.set_selected(True)
+            # Neue Auswahl markieren und in den sichtbaren Bereich scrollen
+            self._select_path(path)
             
             # OCR-Tag Anzeige aktualisieren
             self._update_ocr_tag_display(path)
@@ -962,6 +941,27 @@ class GalleryView(QWidget):
         except Exception:
             pass
     
+    def _select_path(self, path: str | None, scroll: bool = True):
+        """Markiert eine Kachel im ListView (ohne Signale an die Galerie-Logik)"""
+        sel = self.area.selectionModel()
+        idx = self._model.index_of(path) if path else None
+        if idx is None or not idx.isValid():
+            sel.clearSelection()
+            return
+        sel.setCurrentIndex(idx, QItemSelectionModel.ClearAndSelect)
+        if scroll:
+            self.area.scrollTo(idx, QAbstractItemView.EnsureVisible)
+
+    def _on_index_clicked(self, index):
+        path = index.data(GalleryModel.PathRole)
+        if path:
+            self._on_image_clicked(path)
+
+    def _on_index_double_clicked(self, index):
+        path = index.data(GalleryModel.PathRole)
+        if path:
+            self._emit_and_autosave(path)
+
     def _emit_and_autosave(self, path: str):
         """Wird bei Doppel-Klick aufgerufen - wechselt zu Einzelansicht"""
         # Speichere aktuelles Bild im Panel falls vorhanden
@@ -997,11 +997,14 @@ class GalleryView(QWidget):
             wv, hv = max(1, vp.width()), max(1, vp.height())
             tw, th = self._thumb_size
             mode_str = "auto" if self._grid_mode == "auto" else str(self._grid_mode)
+            cs = self._cache.stats()
             txt = (f"Grid: {self._rows} x {self._cols}\n"
                    f"Thumb: {tw} x {th}px\n"
                    f"Viewport: {wv} x {hv}px\n"
                    f"Items/Page: {self._items_per_page}  Page: {self._current_page}/{self.page_spin.maximum()}\n"
-                   f"Mode: {mode_str}")
+                   f"Mode: {mode_str}\n"
+                   f"Cache: {cs['bytes'] // (1024 * 1024)}/{cs['limit_bytes'] // (1024 * 1024)} MB  "
+                   f"Hits: {cs['hits']}  Misses: {cs['misses']}")
             self._debug_label.setText(txt)
             self._debug_label.adjustSize()
             x = max(0, self.area.viewport().width() - self._debug_label.width() - 8)
@@ -1011,59 +1014,23 @@ class GalleryView(QWidget):
             pass
 
     def _render_grid(self):
-        # clear
-        while self.grid.count():
-            item = self.grid.takeAt(0)
-            w = item.widget()
-            if w:
-                w.setParent(None)
-        self._labels.clear()
-        self._path_to_label = {}
-        self._pending_idx = 0
-        
-        # Prüfe ob wir im Tag-gruppierten Modus sind
-        try:
-            mode = self.sort_combo.currentText()
-            is_tag_grouped = isinstance(mode, str) and "gruppiert" in mode.lower()
-        except Exception:
-            is_tag_grouped = False
-        
-        # Wähle Pfade basierend auf Modus
-        if is_tag_grouped and hasattr(self, '_tag_groups') and self._tag_groups:
-            # Zeige nur Bilder der aktuellen Tag-Gruppe
-            group_idx = self._current_page - 1
-            if 0 <= group_idx < len(self._tag_groups):
-                current_paths = self._tag_groups[group_idx]
-            else:
-                current_paths = []
+        """Übergibt die gefilterten Pfade an das Modell; gezeichnet wird nur Sichtbares."""
+        # Noch wartende Decodes der vorherigen Liste verwerfen
+        self._thumb_loader.cancel_pending()
+        self._request_seq = 0
+        self._model.set_paths(self._filtered_paths)
+        if self._current_selected_path and self._model.contains(self._current_selected_path):
+            self._select_path(self._current_selected_path)
         else:
-            # Normale Pagination
-            start_idx = (self._current_page - 1) * self._items_per_page
-            end_idx = min(start_idx + self._items_per_page, len(self._filtered_paths))
-            current_paths = self._filtered_paths[start_idx:end_idx]
-        
-        cols = max(1, self._cols or 5)
-        w, h = self._thumb_size
-        for idx, path in enumerate(current_paths):
-            r, c = divmod(idx, cols)
-            lbl = ClickableLabel(path)
-            # Placeholder bis geladen
-            lbl.setFixedSize(w, h)
-            lbl.setAlignment(Qt.AlignCenter)
-            lbl.setText("…")
-            lbl.setToolTip(os.path.basename(path))
-            lbl.clicked.connect(self._on_image_clicked)  # Einfach-Klick für Auswahl
-            lbl.doubleClicked.connect(self._emit_and_autosave)  # Doppel-Klick für Einzelansicht
-            self.grid.addWidget(lbl, r, c)
-            self._labels.append(lbl)
-            self._path_to_label[path] = lbl
-
-        # Start incremental loader
-        self._loader.start(10)  # alle 10ms ein Chunk\n        self._update_debug_overlay()\n
+            self._change_page(self._current_page)
+        self._update_pagination()
+        self._update_debug_overlay()
+        self._schedule_prefetch()
 
     def refresh_layout_from_settings(self):
         """Wendet geanderte Anzeige-/Thumbnail-Settings an (z. B. thumb_size)."""
-        self._cache.clear()
+        self._cache.clear('gallery')
+        self._cache.clear('gallery_preview')
         # Bereinige auch Timer (verhindert Memory Leak)
         if hasattr(self, '_refresh_timers'):
             for timer in list(self._refresh_timers.values()):
@@ -1074,9 +1041,14 @@ class GalleryView(QWidget):
                 except Exception:
                     pass
             self._refresh_timers.clear()
-        self._recalculate_layout()
-        self._update_pagination()
-        self._render_grid()
+        self._badge_sprites.clear()
+        self._apply_layout()
+        self._model.notify_all_changed()
+
+    def refresh_overlays(self):
+        """Zeichnet alle Overlays neu (z.B. neue Overlay-/Tag-Größe); Thumbnails bleiben"""
+        self._badge_sprites.clear()
+        self._model.notify_all_changed()
 
     def eventFilter(self, obj, event):
         if obj is self.area.viewport() and event.type() == QEvent.Resize:
@@ -1086,11 +1058,7 @@ class GalleryView(QWidget):
 
     def _handle_viewport_resize(self):
         try:
-            prev_items_per_page = getattr(self, '_items_per_page', 0)
-            self._recalculate_layout()
-            if self._items_per_page != prev_items_per_page:
-                self._update_pagination()
-            self._render_grid()
+            self._apply_layout()
         except Exception:
             pass
 
@@ -1116,93 +1084,210 @@ class GalleryView(QWidget):
         self._cache_layer = cache_layer
 
     def _on_panel_evaluation(self, path: str, state: dict):
-        if path in getattr(self, '_path_to_label', {}):
+        if self._model.contains(path):
             self.refresh_item(path, emit_signal=False, delay_ms=500)
 
-    def _load_chunk(self):
-        if self._pending_idx >= len(self._labels):
-            self._loader.stop()
+    # ---------------- Kacheln (vom GalleryModel/Delegate abgefragt) ----------------
+    # Basis-Thumbnail (Pixmap-Cache) und Overlays sind getrennt: der Delegate zeichnet das
+    # Thumbnail und ruft danach paint_tile_overlay() mit den gemerkten Metadaten auf.
+    def tile_pixmap(self, path: str):
+        """Basis-Thumbnail der Kachel; fehlt es, wird es angefordert (None = Platzhalter)"""
+        base = self._cache.get(('gallery', path, self._thumb_size))
+        if base is not None:
+            return base
+        # Vorschau sichtbar, endgültiges Thumbnail noch offen
+        self._request_thumbnail(path)
+        return self._cache.get(('gallery_preview', path, self._thumb_size))
+
+    def tile_tooltip(self, path: str) -> str:
+        info, use_flag, eval_data = self._metadata_row(path)
+        tooltip_lines = [os.path.basename(path)]
+        if info.get('tag'):
+            tooltip_lines.append(f"Tag: {info.get('tag')}")
+        if eval_data.get('image_type'):
+            tooltip_lines.append(f"Bildart: {eval_data.get('image_type')}")
+        if eval_data.get('quality'):
+            tooltip_lines.append(f"Qualität: {eval_data.get('quality')}")
+        if eval_data.get('categories'):
+            tooltip_lines.append(f"Schäden: {', '.join(eval_data.get('categories'))}")
+        tooltip_lines.append("Verwenden: Ja" if use_flag else "Verwenden: Nein")
+        return "\n".join(tooltip_lines)
+
+    def _request_thumbnail(self, path: str):
+        if path in self._failed:
             return
-        chunk = 10
-        w, h = self._thumb_size
-        end = min(self._pending_idx + chunk, len(self._labels))
-        for i in range(self._pending_idx, end):
-            lbl = self._labels[i]
-            path = lbl._path
-            cache_key = (path, self._thumb_size)
-            pix = self._cache.get(cache_key)
-            if pix is None:
-                p = QPixmap(path)
-                if not p.isNull():
-                    pix = p.scaled(w, h, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                    self._cache[cache_key] = pix
-            if pix is not None:
-                try:
-                    info = get_ocr_info(path)
-                except Exception:
-                    info = {}
-                use_flag = False
-                try:
-                    use_flag = get_used_flag(path)
-                except Exception:
-                    pass
-
-                final_pixmap = QPixmap(pix)
-                painter = QPainter(final_pixmap)
-                painter.setRenderHints(painter.renderHints() | QPainter.Antialiasing | QPainter.TextAntialiasing)
-
-                if not use_flag:
-                    painter.fillRect(final_pixmap.rect(), QColor(255, 255, 255, 140))
-
-                if info.get('tag'):
-                    code = str(info['tag']).strip()
-                    lines = [code]
-
-                    f = QFont(); f.setPointSize(self.settings_manager.get_gallery_tag_size())
-                    painter.setFont(f)
-                    fm = painter.fontMetrics()
-                    text_width = max((fm.horizontalAdvance(s) for s in lines), default=0)
-                    line_height = fm.height()
-
-                    padding = 4
-                    badge_width = text_width + 2 * padding
-                    badge_height = line_height * len(lines) + 2 * padding
+        # Zuletzt gezeichnete (= sichtbare) Kacheln zuerst dekodieren
+        self._request_seq += 1
+        self._thumb_loader.request(path, self._thumb_size, priority=self._request_seq,
+                                   warm_metadata=True, preview=True)
+
+    def _on_thumbnail_ready(self, path: str, size: tuple, image: QImage):
+        """Nimmt ein im Hintergrund dekodiertes Thumbnail entgegen (GUI-Thread)"""
+        if size != self._thumb_size:
+            return
+        if image.isNull():
+            self._failed.add(path)  # Nicht bei jedem Paint erneut versuchen
+            return
+        self._cache.put(('gallery', path, size), QPixmap.fromImage(image))
+        self._cache.pop(('gallery_preview', path, size))
+        self._model.notify_changed(path)
 
-                    x_pos = (final_pixmap.width() - badge_width) / 2
-                    y_pos = 5
+    def _on_thumbnail_preview(self, path: str, size: tuple, image: QImage):
+        """Zeigt das eingebettete EXIF-Vorschaubild, bis das richtige Thumbnail fertig ist"""
+        if image.isNull() or size != self._thumb_size or ('gallery', path, size) in self._cache:
+            return
+        if not self._model.contains(path):
+            return
+        self._cache.put(('gallery_preview', path, size), QPixmap.fromImage(image))
+        self._model.notify_changed(path)
 
-                    opacity = self.settings_manager.get_tag_opacity()
-                    painter.fillRect(int(x_pos), int(y_pos), int(badge_width), int(badge_height),
-                                     QColor(255, 255, 255, opacity))
-                    painter.setPen(QColor(0, 0, 0, 100))
-                    painter.drawRect(int(x_pos), int(y_pos), int(badge_width), int(badge_height))
+    def paint_tile_overlay(self, painter: QPainter, rect: QRect, path: str):
+        """Zeichnet Schleier, Tag-Badge und Status-Symbole über das Thumbnail in rect.
+        Nutzt nur gemerkte Metadaten, kein Dateizugriff beim Zeichnen."""
+        info, use_flag, eval_data = self._metadata_row(path)
+        painter.save()
+        try:
+            painter.translate(rect.topLeft())
+            bounds = QRect(0, 0, rect.width(), rect.height())
+            painter.setClipRect(bounds)
+            painter.setRenderHints(painter.renderHints() | QPainter.Antialiasing | QPainter.TextAntialiasing)
 
-                    painter.setPen(QColor(0, 0, 0))
-                    painter.drawText(int(x_pos + padding), int(y_pos + padding + line_height - fm.descent()), code)
+            if not use_flag:
+                painter.fillRect(bounds, QColor(255, 255, 255, 140))
 
-                self._add_status_icons2(painter, path, final_pixmap, use_flag)
+            code = str(info.get('tag') or '').strip()
+            if code:
+                sprite = self._tag_badge_sprite(code)
+                painter.drawPixmap((bounds.width() - sprite.width()) // 2, 5, sprite)
 
-                painter.end()
-                lbl.setPixmap(final_pixmap)
+            self._add_status_icons2(painter, path, bounds, use_flag, eval_data)
+        finally:
+            painter.restore()
 
-                tooltip_lines = [os.path.basename(path)]
-                if info.get('tag'):
-                    tooltip_lines.append(f"Tag: {info.get('tag')}")
-                eval_data = {}
+    def _tag_badge_sprite(self, code: str) -> QPixmap:
+        """Tag-Badge als kleines, wiederverwendetes Pixmap (je Text/Schriftgröße/Deckkraft)"""
+        font_size = self.settings_manager.get_gallery_tag_size()
+        opacity = self.settings_manager.get_tag_opacity()
+        key = (code, font_size, opacity)
+        sprite = self._badge_sprites.get(key)
+        if sprite is not None:
+            return sprite
+
+        f = QFont(); f.setPointSize(font_size)
+        fm = QFontMetrics(f)
+        padding = 4
+        badge_width = fm.horizontalAdvance(code) + 2 * padding
+        badge_height = fm.height() + 2 * padding
+
+        sprite = QPixmap(badge_width + 1, badge_height + 1)
+        sprite.fill(Qt.transparent)
+        painter = QPainter(sprite)
+        painter.setRenderHints(painter.renderHints() | QPainter.TextAntialiasing)
+        painter.setFont(f)
+        painter.fillRect(0, 0, badge_width, badge_height, QColor(255, 255, 255, opacity))
+        painter.setPen(QColor(0, 0, 0, 100))
+        painter.drawRect(0, 0, badge_width, badge_height)
+        painter.setPen(QColor(0, 0, 0))
+        painter.drawText(padding, padding + fm.height() - fm.descent(), code)
+        painter.end()
+
+        if len(self._badge_sprites) > 512:
+            self._badge_sprites.clear()
+        self._badge_sprites[key] = sprite
+        return sprite
+
+    def _metadata_row(self, path: str):
+        """Zeile der Metadatentabelle (info, use_flag, eval_data); fehlt sie, wird das Bild einmal gelesen"""
+        meta = self._meta_table.get(path)
+        if meta is None:
+            meta = self._tile_metadata(path)
+            self._meta_table[path] = meta
+        return meta
+
+    def _tag_of(self, path: str) -> str:
+        tag = self._metadata_row(path)[0].get('tag')
+        return str(tag) if tag else ''
+
+    def _load_metadata_table(self, folder: str, files: list[str]):
+        """Baut die In-Memory-Metadatentabelle eines Ordners einmalig auf.
+
+        Gültige Zeilen des persistenten Ordner-Index kommen aus einer einzigen
+        Abfrage. Neue/geänderte Bilder bekommen eine Platzhalterzeile und werden
+        im Hintergrund gelesen (_on_metadata_rows), der GUI-Thread liest nichts.
+        """
+        rows = {}
+        try:
+            from utils_metadata_index import get_metadata_index
+            index = get_metadata_index(folder) if folder else None
+            if index is not None:
+                rows = index.rows()
+        except Exception:
+            rows = {}
+        table = {}
+        missing = []
+        for path in files:
+            row = rows.get(os.path.basename(path))
+            if row is not None:
                 try:
-                    eval_data = get_evaluation(path)
-                except Exception:
+                    st = os.stat(path)
+                    if row['mtime_ns'] == st.st_mtime_ns and row['size'] == st.st_size:
+                        table[path] = self._with_pending(path, {'tag': row['tag']}, row['used'], dict(row['evaluation']))
+                        continue
+                except OSError:
                     pass
-                if eval_data.get('image_type'):
-                    tooltip_lines.append(f"Bildart: {eval_data.get('image_type')}")
-                if eval_data.get('quality'):
-                    tooltip_lines.append(f"Qualität: {eval_data.get('quality')}")
-                if eval_data.get('categories'):
-                    tooltip_lines.append(f"Schäden: {', '.join(eval_data.get('categories'))}")
-                tooltip_lines.append("Verwenden: Ja" if use_flag else "Verwenden: Nein")
-                lbl.setToolTip("\n".join(tooltip_lines))
-                lbl.setText("")
-        self._pending_idx = end
+            table[path] = self._with_pending(path, {}, True, {})
+            missing.append(path)
+        self._meta_table = table
+        self._rows_loading = set(missing)
+        self._row_loader.start(folder, missing)
+        self._log.info("gallery_metadata_table", extra={
+            "event": "gallery_metadata_table", "folder": folder, "count": len(table), "read": len(missing)})
+
+    def _on_metadata_rows(self, folder: str, rows: dict):
+        """Übernimmt im Hintergrund gelesene Zeilen; Kacheln zeichnen sich neu"""
+        if folder != self._current_folder:
+            return
+        for path, row in rows.items():
+            # Zwischenzeitlich per refresh_item verworfene Zeilen nicht überschreiben
+            if path in self._rows_loading:
+                self._rows_loading.discard(path)
+                self._meta_table[path] = self._with_pending(path, *row)
+        self.area.viewport().update()
+
+    def _on_metadata_rows_finished(self, folder: str):
+        """Alle Zeilen da: tag-abhängige Filter, Sortierung und Baum einmalig nachziehen"""
+        if folder != self._current_folder:
+            return
+        if getattr(self, "_code_filter", None) or self.sort_combo.currentText() == "OCR-Tag":
+            self._apply_filters()
+        self._rebuild_code_tree()
+
+    def _tile_metadata(self, path: str):
+        """Liest die Metadaten einer Kachel genau einmal (Snapshot).
+        Noch nicht geschriebene Änderungen aus dem Cache-Layer haben Vorrang."""
+        try:
+            snapshot = load_metadata_snapshot(path)
+        except Exception:
+            snapshot = MetadataSnapshot(path)
+        return self._with_pending(path, snapshot.ocr_info, snapshot.used, snapshot.evaluation)
+
+    def _with_pending(self, path: str, info: dict, use_flag: bool, eval_data: dict):
+        """Überlagert Metadaten mit den ungeschriebenen Änderungen des Cache-Layers (ohne Dateizugriff)"""
+        layer = self._cache_layer
+        if not layer:
+            return info, use_flag, eval_data
+        try:
+            pending = layer.get_pending(path)
+        except Exception:
+            pending = {}
+        if 'evaluation' in pending:
+            eval_data = pending['evaluation']
+        if pending.get('use') is not None:
+            use_flag = pending['use']
+        if 'tag' in pending:
+            info = dict(info)
+            info['tag'] = pending['tag'] or ''
+        return info, use_flag, eval_data
 
     def _add_status_icons(self, painter: QPainter, path: str, pixmap: QPixmap):
         """Fügt Status-Icons zu einem Thumbnail hinzu"""
@@ -1228,14 +1313,14 @@ class GalleryView(QWidget):
         painter.drawRect(x_start - icon_size - 2, y_start, icon_size, icon_size)
 
     def refresh_item(self, path: str, emit_signal: bool = False, delay_ms: int = 500):
-        """Aktualisiert ein Thumbnail mit optionaler Verzögerung für bessere Performance"""
-        try:
-            lbl = self._path_to_label.get(path)
-        except Exception:
-            lbl = None
-        if not lbl:
+        """Aktualisiert ein Thumbnail mit optionaler Verzögerung für bessere Performance.
+
+        Die Metadatenzeile wird auch für ausgefilterte Bilder aktualisiert, sonst
+        arbeiten Filter, Sortierung und Suche mit dem alten Tag weiter.
+        """
+        if path not in self._meta_table and not self._model.contains(path):
             return
-        
+
         # Stoppe vorhandenen Timer für diesen Pfad
         if path in self._refresh_timers:
             timer = self._refresh_timers[path]
@@ -1246,15 +1331,17 @@ class GalleryView(QWidget):
         # Erstelle neuen Timer für verzögertes Update
         def _do_refresh():
             try:
-                keys_to_del = [k for k in self._cache if k[0] == path]
-                for key in keys_to_del:
-                    del self._cache[key]
-                w, h = self._thumb_size
-                p = QPixmap(path)
-                if not p.isNull():
-                    self._cache[(path, self._thumb_size)] = p.scaled(w, h, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                    self._pending_idx = 0
-                    self._load_chunk()
+                # Nur das Overlay neu zeichnen: Thumbnail bleibt, Änderungen kommen aus dem Cache-Layer
+                meta = self._meta_table.get(path)
+                # Platzhalterzeilen verwerfen: beim nächsten Zugriff wird die Datei gelesen
+                if (meta is not None and path not in self._rows_loading
+                        and self._cache_layer and self._cache_layer.has_pending_changes(path)):
+                    self._meta_table[path] = self._with_pending(path, *meta)
+                else:
+                    self._meta_table.pop(path, None)
+                self._rows_loading.discard(path)
+                if self._model.contains(path):
+                    self._model.notify_changed(path)
                 
                 if emit_signal:
                     self.imageSelected.emit(path)
@@ -1276,24 +1363,27 @@ class GalleryView(QWidget):
             _do_refresh()
 
     # Neue, skalierende Badges (✓/X, Gene-?, Schadens-Chips, Typ-Icon)
-    def _add_status_icons2(self, painter: QPainter, path: str, pixmap: QPixmap, used: bool):
+    def _add_status_icons2(self, painter: QPainter, path: str, bounds: QRect, used: bool,
+                           eval_data: dict | None = None):
         try:
             # Keine Symbole, wenn Bild nicht verwendet
             if not used:
                 return
 
-            w, h = pixmap.width(), pixmap.height()
+            w, h = bounds.width(), bounds.height()
             base = min(w, h)
             m = self._overlay_metrics(base)
 
-            # Bewertung lesen (aus Cache-Layer falls verfügbar, sonst aus EXIF)
-            try:
-                if self._cache_layer:
-                    eval_data = self._cache_layer.get_evaluation(path) or {}
-                else:
-                    eval_data = get_evaluation(path) or {}
-            except Exception:
-                eval_data = {}
+            # Bewertung lesen, falls nicht schon per Snapshot übergeben
+            # (aus Cache-Layer falls verfügbar, sonst aus EXIF)
+            if eval_data is None:
+                try:
+                    if self._cache_layer:
+                        eval_data = self._cache_layer.get_evaluation(path) or {}
+                    else:
+                        eval_data = get_evaluation(path) or {}
+                except Exception:
+                    eval_data = {}
 
             categories = [str(c).strip() for c in (eval_data.get('categories') or []) if str(c).strip()]
             quality = (eval_data.get('quality') or '').strip()
@@ -1308,7 +1398,7 @@ class GalleryView(QWidget):
             has_damage = bool(other_damages) or quality_damage
 
             if has_damage or has_no_defect:
-                self._draw_main_status_badge(painter, ok=(has_no_defect and not has_damage), m=m)
+                self._draw_main_status_badge(painter, ok=(has_no_defect and not has_damage), m=m, h=h)
             if gene_flag:
                 self._draw_gene_badge(painter, m)
             if other_damages:
@@ -1343,11 +1433,13 @@ class GalleryView(QWidget):
             'chip_font_px': font_px,
         }
 
-    def _draw_main_status_badge(self, painter: QPainter, ok: bool, m: dict):
+    def _draw_main_status_badge(self, painter: QPainter, ok: bool, m: dict, h: int):
         size = m['main_badge']
         r = size // 2
         x = m['margin'] + r
-        y = painter.viewport().height() - m['margin'] - r
+        # Unten links in der Kachel: paint_tile_overlay verschiebt den Painter auf die Kachel
+        # und begrenzt ihn per setClipRect darauf – y daher aus der Kachelhöhe h, sonst abgeschnitten
+        y = h - m['margin'] - r
         painter.save()
         color = QColor(46, 204, 113, 230) if ok else QColor(231, 76, 60, 230)
         pen = QPen(QColor(255, 255, 255), max(1, size // 12))
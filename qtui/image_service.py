@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""
+Image Service
+Gemeinsame Dekodierung der Originalbilder für alle Tabs (gehört MainWindow).
+
+Vollaufgelöste Bilder werden im Hintergrund (QThreadPool) als QImage dekodiert und
+als QPixmap in einem byte-begrenzten LRU abgelegt; gleichzeitige Anfragen für
+denselben Pfad – auch eine synchrone load() während eines laufenden
+Hintergrund-Decodes – teilen sich einen einzigen Decode. Für die Einzelbildansicht
+gibt es zusätzlich eine schnelle Vorschau (Thumbnail oder verkleinerter Decode),
+bis das Original fertig ist. Galerie-Thumbnails laufen weiter über den
+ThumbnailLoader und den gemeinsamen Pixmap-Cache.
+
+Abgelegte Bilder gelten nur, solange (mtime_ns, size) der Datei gleich bleiben;
+nach einer externen Bearbeitung wird neu dekodiert.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Optional
+
+from PySide6.QtCore import QObject, QRunnable, QSize, QThreadPool, Signal
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+from utils_logging import get_logger
+from utils_helpers import KeyedLocks
+from .pixmap_cache import PixmapCache, get_pixmap_cache
+from .thumbnail_loader import PYRAMID_LEVELS, decode_thumbnail, load_cached_thumbnail
+
+_DEFAULT_LIMIT_MB = 1024
+_URGENT_PRIORITY = 1 << 20  # Das aktuell angezeigte Bild vor allen Vorab-Decodes
+_MIN_LIMIT_MB = 128  # Mindestens ein großes Foto muss hineinpassen
+_MAX_KNOWN_SIZES = 4096
+
+
+def _limit_from_settings() -> int:
+    try:
+        from .settings_manager import get_settings_manager
+        value = int(get_settings_manager().get('performance_image_cache_mb', _DEFAULT_LIMIT_MB))
+    except Exception:
+        value = _DEFAULT_LIMIT_MB
+    return max(_MIN_LIMIT_MB, value) * 1024 * 1024
+
+
+def decode_full_image(path: str) -> QImage:
+    """Dekodiert ein Bild in voller Auflösung (wie QPixmap(path)); thread-sicher.
+    Bei Fehlern leeres QImage."""
+    if not path:
+        return QImage()
+    reader = QImageReader(path)
+    image = reader.read()
+    return image if not image.isNull() else QImage()
+
+
+def _path_key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _file_stamp(path: str):
+    """(mtime_ns, size) der Datei oder None, wenn sie nicht lesbar ist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class _FullDecodeTask(QRunnable):
+    def __init__(self, service: 'ImageService', path: str, token: int):
+        super().__init__()
+        self._service = service
+        self._path = path
+        self._token = token
+
+    def run(self):
+        if self._service._tokens.get(self._path) != self._token:
+            return  # Verworfen oder durch eine dringendere Anfrage ersetzt
+        image = QImage()
+        try:
+            image = self._service._decode(self._path, handoff=True)
+        except Exception as e:
+            self._service._log.warning("image_decode_failed", extra={
+                "event": "image_decode_failed", "path": self._path, "error": str(e)})
+        # Signal eines GUI-Objekts aus dem Pool-Thread -> queued connection
+        self._service._decoded.emit(self._path, image, self._token)
+
+
+class _PreviewDecodeTask(QRunnable):
+    def __init__(self, service: 'ImageService', path: str, width: int, height: int):
+        super().__init__()
+        self._service = service
+        self._path = path
+        self._size = (width, height)
+
+    def run(self):
+        if self._path not in self._service._preview_inflight:
+            return  # Verworfen
+        image = QImage()
+        try:
+            # Verkleinert bereits im JPEG-Decoder, ein Bruchteil eines vollen Decodes
+            image = decode_thumbnail(self._path, *self._size)
+        except Exception:
+            pass
+        self._service._preview_decoded.emit(self._path, image)
+
+
+class ImageService(QObject):
+    """Ein Decode pro Datei, geteilt von Einzelbildansicht und Titelbildern."""
+
+    imageReady = Signal(str, QPixmap)  # (pfad, vollaufgelöstes bild oder leer) – im GUI-Thread
+    previewReady = Signal(str, QPixmap)  # (pfad, verkleinerte vorschau) – im GUI-Thread
+    _decoded = Signal(str, QImage, int)
+    _preview_decoded = Signal(str, QImage)
+
+    def __init__(self, parent=None, max_workers: int = 2):
+        super().__init__(parent)
+        self._log = get_logger('app', {"module": "qtui.image_service"})
+        self._store = PixmapCache(_limit_from_settings())  # {('full', pfad): QPixmap}
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max(1, max_workers))
+        # Eingestellte Decodes: {pfad: (token, priorität)}; Tasks mit veraltetem Token überspringen sich.
+        # Wird nur im GUI-Thread geschrieben, Pool-Threads lesen _tokens.
+        self._inflight: dict = {}
+        self._tokens: dict = {}
+        self._next_token = 0
+        self._locks = KeyedLocks()
+        self._handoff: dict = {}  # {pfad: QImage} vom Pool dekodiert, noch nicht übernommen
+        self._handoff_lock = threading.Lock()
+        self._preview_inflight: set = set()
+        self._sizes: dict = {}  # {pfad: QSize} Originalgröße aus dem Dateikopf
+        self._stamps: dict = {}  # {pfad: (mtime_ns, size)} Dateistand der abgelegten Daten
+        self._decoded_stamps: dict = {}  # {pfad: (mtime_ns, size)} vor dem Decode gelesen (unter _handoff_lock)
+        self._decoded.connect(self._on_decoded)
+        self._preview_decoded.connect(self._on_preview_decoded)
+
+    # ---- Vollauflösung ---------------------------------------------
+    def cached(self, path: str) -> Optional[QPixmap]:
+        """Vollaufgelöstes Bild, falls bereits dekodiert und die Datei unverändert ist (nur stat)"""
+        if not path or ('full', path) not in self._store or not self._is_current(path):
+            return None
+        return self._store.get(('full', path))
+
+    def load(self, path: str) -> QPixmap:
+        """Vollaufgelöstes Bild synchron. Läuft der Decode bereits im Hintergrund,
+        wird auf dessen Ergebnis gewartet statt erneut zu dekodieren."""
+        pix = self.cached(path)
+        if pix is not None:
+            return pix
+        image = self._decode(path, handoff=False)
+        with self._handoff_lock:
+            self._handoff.pop(path, None)
+        return self._store_image(path, image)
+
+    def request(self, path: str, *, priority: int = 0, urgent: bool = False) -> bool:
+        """Dekodiert im Hintergrund; Ergebnis per imageReady (mit Pfad, veraltete Ergebnisse
+        verwirft der Aufrufer). urgent=True stellt die Anfrage vor alle anderen – auch wenn
+        derselbe Pfad bereits mit niedriger Priorität wartet.
+        False wenn vorhanden oder bereits mit mindestens dieser Priorität in Arbeit."""
+        if not path or self.cached(path) is not None:
+            return False
+        if urgent:
+            priority = _URGENT_PRIORITY
+        queued = self._inflight.get(path)
+        if queued is not None and queued[1] >= priority:
+            return False
+        # Neues Token: ein noch wartender Task mit niedrigerer Priorität überspringt sich.
+        # Läuft er bereits, wartet der neue Task auf dessen Ergebnis (Lock pro Datei).
+        self._next_token += 1
+        token = self._next_token
+        self._inflight[path] = (token, priority)
+        self._tokens[path] = token
+        self._pool.start(_FullDecodeTask(self, path, token), priority)
+        return True
+
+    def retain(self, keep) -> int:
+        """Verwirft wartende Decodes aller Pfade außerhalb von keep (z.B. das Vorlade-Fenster
+        hinter dem Benutzer); deren Tasks überspringen sich. Anzahl verworfener Pfade."""
+        dropped = [p for p in self._inflight if p not in keep]
+        for path in dropped:
+            self._inflight.pop(path, None)
+            self._tokens.pop(path, None)
+            # Ein bereits abgelegtes Ergebnis holt kein Task mehr ab
+            self._drop_handoff(path)
+        return len(dropped)
+
+    def cancel_pending(self):
+        """Verwirft wartende Hintergrund-Decodes; laufende enden normal"""
+        self._tokens.clear()
+        self._pool.clear()
+        self._inflight.clear()
+        self._preview_inflight.clear()
+        with self._handoff_lock:
+            self._handoff.clear()
+
+    def apply_settings(self):
+        self._store.set_limit(_limit_from_settings())
+
+    def stats(self) -> dict:
+        stats = self._store.stats()
+        stats["inflight"] = len(self._inflight)
+        return stats
+
+    def shutdown(self, timeout_ms: int = 2000):
+        self.cancel_pending()
+        self._pool.waitForDone(timeout_ms)
+
+    # ---- Vorschau ---------------------------------------------------
+    def source_size(self, path: str) -> QSize:
+        """Originalgröße (nur der Dateikopf wird gelesen); ungültige QSize bei Fehlern"""
+        size = self._sizes.get(path) if self._is_current(path) else None
+        if size is None:
+            pix = self.cached(path)
+            size = pix.size() if pix is not None else QImageReader(path).size()
+            self._sizes[path] = size
+            self._remember_stamp(path)
+        return size
+
+    def preview(self, path: str) -> Optional[QPixmap]:
+        """Sofort verfügbare Vorschau ohne Decode des Originals: zuletzt erzeugte Vorschau
+        oder größte Stufe der Thumbnail-Pyramide aus dem Festplatten-Cache. None wenn keine."""
+        cache = get_pixmap_cache()
+        pix = cache.get(('image_preview', path)) if self._is_current(path) else None
+        if pix is not None:
+            return pix
+        image = QImage()
+        for level in reversed(PYRAMID_LEVELS):  # größte bereits erzeugte Stufe
+            image = load_cached_thumbnail(path, level, level)
+            if not image.isNull():
+                break
+        if image.isNull():
+            return None
+        pix = QPixmap.fromImage(image)
+        cache.put(('image_preview', path), pix)
+        self._remember_stamp(path)
+        return pix
+
+    def request_preview(self, path: str, width: int, height: int) -> bool:
+        """Verkleinerter Decode (passend zum Viewport) im Hintergrund, noch vor dem Original;
+        Ergebnis per previewReady."""
+        if not path or path in self._preview_inflight or width <= 0 or height <= 0:
+            return False
+        self._preview_inflight.add(path)
+        self._pool.start(_PreviewDecodeTask(self, path, int(width), int(height)), _URGENT_PRIORITY + 1)
+        return True
+
+    # ---- intern ----------------------------------------------------
+    def _decode(self, path: str, handoff: bool) -> QImage:
+        # Ein Lock pro Datei: ein zweiter Aufrufer wartet und übernimmt das Ergebnis
+        with self._locks.hold(_path_key(path)):
+            with self._handoff_lock:
+                image = self._handoff.get(path)
+            if image is not None:
+                return image
+            started = time.perf_counter()
+            stamp = _file_stamp(path)  # Vor dem Lesen: eine Änderung währenddessen gilt als neuer Stand
+            image = decode_full_image(path)
+            self._log.debug("image_decoded", extra={
+                "event": "image_decoded", "path": path,
+                "ms": int((time.perf_counter() - started) * 1000)})
+            with self._handoff_lock:
+                self._decoded_stamps[path] = stamp
+                if handoff and not image.isNull():
+                    self._handoff[path] = image
+            return image
+
+    def _drop_handoff(self, path: str):
+        with self._handoff_lock:
+            self._handoff.pop(path, None)
+
+    def _is_current(self, path: str) -> bool:
+        """False (und veraltete Einträge verworfen), wenn sich die Datei seit dem Ablegen geändert hat"""
+        if path not in self._stamps:
+            return True
+        if self._stamps[path] == _file_stamp(path):
+            return True
+        self._stamps.pop(path, None)
+        self._store.pop(('full', path))
+        self._sizes.pop(path, None)
+        get_pixmap_cache().pop(('image_preview', path))
+        self._log.info("image_file_changed", extra={"event": "image_file_changed", "path": path})
+        return False
+
+    def _store_image(self, path: str, image: QImage) -> QPixmap:
+        with self._handoff_lock:
+            stamp = self._decoded_stamps.pop(path, None)
+        if image.isNull():
+            return QPixmap()
+        pix = self.cached(path)
+        if pix is None:
+            pix = QPixmap.fromImage(image)
+            self._store.put(('full', path), pix)
+            self._remember_stamp(path, stamp)
+        return pix
+
+    def _remember_stamp(self, path: str, stamp=None):
+        """Merkt den Dateistand; Größe/Vorschau ohne Stand gibt es nicht (sonst ungeprüft)"""
+        if path in self._stamps and stamp is None:
+            return
+        if len(self._stamps) >= _MAX_KNOWN_SIZES:
+            cache = get_pixmap_cache()
+            for known in [p for p in self._stamps if ('full', p) not in self._store]:
+                self._stamps.pop(known, None)
+                self._sizes.pop(known, None)
+                cache.pop(('image_preview', known))
+        self._stamps[path] = stamp if stamp is not None else _file_stamp(path)
+
+    def _on_preview_decoded(self, path: str, image: QImage):
+        self._preview_inflight.discard(path)
+        if image.isNull():
+            return
+        pix = QPixmap.fromImage(image)
+        self._is_current(path)
+        get_pixmap_cache().put(('image_preview', path), pix)
+        self._remember_stamp(path)
+        self.previewReady.emit(path, pix)
+
+    def _on_decoded(self, path: str, image: QImage, token: int):
+        current = self._tokens.get(path)
+        if current is None or current == token:
+            self._inflight.pop(path, None)
+            self._tokens.pop(path, None)
+            self._drop_handoff(path)
+        # Sonst wartet noch ein neuerer Task auf dasselbe Bild und übernimmt das Ergebnis;
+        # verwirft retain()/cancel_pending() diesen Task, räumen sie den Eintrag weg
+        pix = self._store_image(path, image)
+        self.imageReady.emit(path, pix)  # leeres Pixmap, wenn die Datei nicht lesbar war
@@ -36,6 +36,7 @@ class MainWindow(QMainWindow):
         # Evaluation Cache System
         from .evaluation_cache import EvaluationCache
         self.evaluation_cache = EvaluationCache()
+        self._cache_builder = None  # Hintergrund-Aufbau (EvaluationCacheBuilder)
         
         # Evaluation Cache Layer für schnelles Speichern
         from .evaluation_cache_layer import EvaluationCacheLayer
@@ -48,6 +49,10 @@ class MainWindow(QMainWindow):
         # Starte Worker
         self.evaluation_cache_worker.start()
         
+        # Gemeinsame Bild-Dekodierung für alle Tabs (ein Decode pro Datei und Auflösung)
+        from .image_service import ImageService
+        self.image_service = ImageService(self)
+        
         # TreeView Rebuild Debouncing (verhindert zu häufige Updates)
         from PySide6.QtCore import QTimer
         self._tree_rebuild_timer = QTimer(self)
@@ -221,6 +226,7 @@ class MainWindow(QMainWindow):
     def _add_tabs(self):
         # Einzelbild
         self.single = SingleView(); self.single.progressChanged.connect(self._on_progress)
+        self.single.set_image_service(self.image_service)
         self.tabs.addTab(self.single, "Einzelbild")
         # Galerie
         self.gallery = GalleryView(); self.tabs.addTab(self.gallery, "Galerie")
@@ -230,6 +236,7 @@ class MainWindow(QMainWindow):
         self.gallery.imageSelectedWithTabSwitch.connect(lambda path: self._open_in_single(path, switch_tab=True))
         # Titelbilder (eigener Ordner)
         self.cover = CoverView(); self.tabs.addTab(self.cover, "Titelbilder")
+        self.cover.set_image_service(self.image_service)
         try:
             self.gallery.folderChanged.connect(self._sync_last_folder)
             self.single.folderChanged.connect(self._sync_last_folder)
@@ -421,9 +428,7 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 self._log.error("cover_auto_sync_failed", extra={"event": "cover_auto_sync_failed", "error": str(e)})
         
-        # Cache neu aufbauen und TreeView aktualisieren
-        if hasattr(self, 'evaluation_cache') and folder:
-            self.evaluation_cache.build_cache(folder)
+        # Cache im Hintergrund neu aufbauen und TreeView aktualisieren
         self._rebuild_ocr_tree()
         
         # Gene-Counter aktualisieren
@@ -491,6 +496,15 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         """Wird beim Schließen des Fensters aufgerufen"""
+        # Laufenden Cache-Aufbau abbrechen
+        builder = getattr(self, '_cache_builder', None)
+        self._cancel_evaluation_cache_build()
+        if builder is not None:
+            try:
+                builder.wait(2000)
+            except Exception:
+                pass
+        
         # Stoppe Cache-Worker und flushe alle pending changes
         if hasattr(self, 'evaluation_cache_worker') and self.evaluation_cache_worker:
             try:
@@ -508,6 +522,31 @@ class MainWindow(QMainWindow):
             except Exception:
                 pass
         
+        # Persistenten Metadaten-Index und Thumbnail-Cache auf Platte bringen
+        try:
+            from utils_metadata_index import flush_all_indexes
+            flush_all_indexes()
+        except Exception:
+            pass
+        try:
+            from utils_thumbnail_cache import flush_thumbnail_store
+            flush_thumbnail_store()
+        except Exception:
+            pass
+        try:
+            self.image_service.shutdown()
+        except Exception:
+            pass
+        try:
+            if getattr(self, '_annotation_exporter', None):
+                self._annotation_exporter.shutdown()
+        except Exception:
+            pass
+        try:
+            self.gallery._row_loader.shutdown()
+        except Exception:
+            pass
+        
         super().closeEvent(event)
 
     def _on_global_use_changed(self, path: str, value: bool):
@@ -531,19 +570,24 @@ class MainWindow(QMainWindow):
     
     # ---------------------------------------------------------------
     # OCR-Tag TreeView
-    def _rebuild_ocr_tree(self):
-        """Baut hierarchische TreeView mit Kategorien und Kürzeln auf."""
+    def _rebuild_ocr_tree(self, refresh_cache: bool = True):
+        """Baut hierarchische TreeView mit Kategorien und Kürzeln auf.
+        
+        Mit refresh_cache wird der Bewertungs-Cache im Hintergrund neu gelesen;
+        der Baum zeigt bis dahin den aktuellen (ggf. teilweisen) Stand und wird
+        bei Teilergebnissen und zum Abschluss erneut gezeichnet.
+        """
         from PySide6.QtGui import QColor
         
-        model = getattr(self, '_ocr_model', None)
-        if not model:
-            return
-
         folder = getattr(self, '_current_folder', '') or ''
         
         # Cache neu aufbauen wenn Ordner vorhanden
-        if folder and hasattr(self, 'evaluation_cache'):
-            self.evaluation_cache.build_cache(folder)
+        if refresh_cache and folder and hasattr(self, 'evaluation_cache'):
+            self._start_evaluation_cache_build(folder)
+        
+        model = getattr(self, '_ocr_model', None)
+        if not model:
+            return
         
         model.removeRows(0, model.rowCount())
         
@@ -656,6 +700,83 @@ class MainWindow(QMainWindow):
             except Exception:
                 pass
     
+    # ---------------------------------------------------------------
+    # Bewertungs-Cache im Hintergrund aufbauen
+    def _start_evaluation_cache_build(self, folder: str):
+        """Startet den parallelen Cache-Aufbau; ein laufender Aufbau wird abgebrochen"""
+        if not hasattr(self, 'evaluation_cache'):
+            return
+        self._cancel_evaluation_cache_build()
+        if not folder or not os.path.isdir(folder):
+            self.evaluation_cache.build_cache(folder)
+            return
+        
+        from .evaluation_cache_builder import EvaluationCacheBuilder
+        previous = self.evaluation_cache.begin_build(folder)
+        builder = EvaluationCacheBuilder(self.evaluation_cache, folder, self, previous=previous)
+        builder.partialResults.connect(self._on_cache_build_partial)
+        builder.progress.connect(self._on_cache_build_progress)
+        builder.buildFinished.connect(self._on_cache_build_finished)
+        builder.finished.connect(builder.deleteLater)
+        self._cache_builder = builder
+        builder.start()
+        self._log.info("cache_build_started", extra={"event": "cache_build_started", "folder": folder})
+    
+    def _cancel_evaluation_cache_build(self):
+        """Bricht einen laufenden Aufbau ab, ohne auf den Thread zu warten"""
+        builder = getattr(self, '_cache_builder', None)
+        self._cache_builder = None
+        if builder is not None:
+            try:
+                builder.cancel()
+            except Exception:
+                pass
+    
+    def _schedule_partial_tree_update(self):
+        """Zeichnet den Baum während des Aufbaus gedrosselt neu (ohne erneutes Lesen)"""
+        timer = getattr(self, '_tree_partial_timer', None)
+        if timer is None:
+            from PySide6.QtCore import QTimer
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda: self._rebuild_ocr_tree(refresh_cache=False))
+            self._tree_partial_timer = timer
+        if not timer.isActive():
+            timer.start(300)
+    
+    def _on_cache_build_partial(self, folder: str, records: dict):
+        if self.sender() is not getattr(self, '_cache_builder', None):
+            return  # Veralteter (abgebrochener) Aufbau
+        self.evaluation_cache.apply_records(folder, records)
+        self._schedule_partial_tree_update()
+    
+    def _on_cache_build_progress(self, folder: str, done: int, total: int):
+        if self.sender() is not getattr(self, '_cache_builder', None):
+            return
+        try:
+            self.statusBar().showMessage(f"Bewertungen werden gelesen: {done}/{total}")
+        except Exception:
+            pass
+    
+    def _on_cache_build_finished(self, folder: str, records):
+        if self.sender() is not getattr(self, '_cache_builder', None):
+            return
+        self._cache_builder = None
+        self.evaluation_cache.finish_build(folder, records)
+        try:
+            self.statusBar().clearMessage()
+        except Exception:
+            pass
+        self._log.info("cache_build_finished", extra={
+            "event": "cache_build_finished", "folder": folder,
+            "count": len(records) if records is not None else None,
+        })
+        timer = getattr(self, '_tree_partial_timer', None)
+        if timer is not None:
+            timer.stop()
+        self._rebuild_ocr_tree(refresh_cache=False)
+        self._update_gene_counter()
+    
     def _calculate_kurzel_progress(self, kurzel_code: str) -> tuple:
         """Berechnet Bewertungsfortschritt für ein Kürzel"""
         if not hasattr(self, 'evaluation_cache'):
@@ -998,6 +1119,10 @@ class MainWindow(QMainWindow):
         open_image_action = tools_menu.addAction("Originalbild öffnen...")
         open_image_action.triggered.connect(self._open_current_image)
         
+        export_annotated_action = tools_menu.addAction("Annotierte Bilder exportieren...")
+        export_annotated_action.setToolTip("Zeichnungen in Kopien der Bilder einbrennen (für den Bericht)")
+        export_annotated_action.triggered.connect(self._export_annotated_images)
+        
         tools_menu.addSeparator()
         
         config_editor_action = tools_menu.addAction("Konfiguration bearbeiten...")
@@ -1056,6 +1181,48 @@ class MainWindow(QMainWindow):
             return
         QDesktopServices.openUrl(QUrl.fromLocalFile(path))
 
+    def _export_annotated_images(self):
+        """Brennt die Zeichnungen aller Bilder des Ordners in Kopien ein (Hintergrund)"""
+        folder = getattr(self, '_current_folder', '') or ''
+        if not folder or not os.path.isdir(folder):
+            QMessageBox.information(self, "Kein Ordner", "Bitte zuerst einen Ordner öffnen.")
+            return
+        from .annotation_export import AnnotationExporter, annotated_directory, folder_images
+        # Noch nicht gespeicherte Zeichnungen des aktuellen Bildes zuerst sichern
+        try:
+            self.single.flush_drawings()
+        except Exception:
+            pass
+        if getattr(self, '_annotation_exporter', None) is None:
+            self._annotation_exporter = AnnotationExporter(self)
+            self._annotation_exporter.progress.connect(self._on_annotation_export_progress)
+            self._annotation_exporter.finished.connect(self._on_annotation_export_finished)
+        if not self._annotation_exporter.start(folder_images(folder), annotated_directory(folder)):
+            QMessageBox.information(self, "Export läuft", "Der Export annotierter Bilder läuft bereits.")
+
+    def _on_annotation_export_progress(self, done: int, total: int):
+        try:
+            self.statusBar().showMessage(f"Annotierte Bilder werden exportiert: {done}/{total}")
+        except Exception:
+            pass
+
+    def _on_annotation_export_finished(self, target_dir: str, result: dict):
+        try:
+            self.statusBar().clearMessage()
+        except Exception:
+            pass
+        written = len(result.get('written', []))
+        skipped = result.get('skipped', 0)
+        removed = len(result.get('removed', []))
+        failed = result.get('failed', [])
+        text = f"{written} Bild(er) exportiert, {skipped} unverändert, {removed} entfernt.\nZiel: {target_dir}"
+        if failed:
+            names = "\n".join(os.path.basename(p) for p in failed[:10])
+            QMessageBox.warning(self, "Export annotierter Bilder",
+                                f"{text}\n\n{len(failed)} Fehler:\n{names}")
+        else:
+            QMessageBox.information(self, "Export annotierter Bilder", text)
+
     def _show_open_folder_tooltip(self):
         text = self._open_action_tooltip or "Kein Ordner gewählt"
         QToolTip.showText(QCursor.pos(), text, self)
@@ -1323,6 +1490,11 @@ class MainWindow(QMainWindow):
             if hasattr(self, 'show_shortcuts_action'):
                 self.show_shortcuts_action.setChecked(self.settings_manager.get("show_keyboard_shortcuts", True))
         
+        # Geänderte Bewertungsregeln: Bewertungsstatus aller Bilder neu bestimmen
+        if "evaluation_rules" in settings_dict and hasattr(self, 'evaluation_cache'):
+            self.evaluation_cache.invalidate(full=True)
+            self._schedule_tree_rebuild()
+        
         # Theme anwenden
         if "theme" in settings_dict:
             self._apply_theme_from_settings()
@@ -1336,14 +1508,32 @@ class MainWindow(QMainWindow):
             if hasattr(self, 'gallery') and self.gallery:
                 # Galerie neu rendern, damit neue Icon-Größe angewendet wird
                 try:
-                    self.gallery._pending_idx = 0
-                    self.gallery._load_chunk()
+                    self.gallery.refresh_overlays()
                 except Exception:
                     pass
         
         # Thumbnail-Größe aktualisieren
         if "thumb_size" in settings_dict:
             self._update_thumbnail_settings()
+        
+        # Budget des gemeinsamen Pixmap-Caches
+        if "performance_pixmap_cache_mb" in settings_dict:
+            try:
+                from .pixmap_cache import apply_pixmap_cache_settings
+                apply_pixmap_cache_settings()
+            except Exception:
+                pass
+        if "performance_tiled_level_cache_mb" in settings_dict:
+            try:
+                from .tiled_image_item import apply_level_cache_settings
+                apply_level_cache_settings()
+            except Exception:
+                pass
+        if "performance_image_cache_mb" in settings_dict:
+            try:
+                self.image_service.apply_settings()
+            except Exception:
+                pass
     
     def _apply_theme_from_settings(self):
         """Theme aus Einstellungen anwenden"""
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Metadata Row Loader
+Liest die Metadatenzeilen der Galerie (Tag, Verwenden, Bewertung) für Bilder,
+die nicht im Ordner-Index stehen, außerhalb des GUI-Threads.
+
+Ergebnisse kommen batchweise per rowsReady im GUI-Thread an; die Galerie
+zeichnet bis dahin Platzhalterzeilen.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from utils_exif import load_metadata_snapshot, MetadataSnapshot
+from utils_logging import get_logger
+from .evaluation_cache import _default_build_workers
+
+_BATCH_SIZE = 64
+
+_log = get_logger('app', {"module": "qtui.metadata_row_loader"})
+
+
+def read_row(path: str):
+    """(ocr_info, use_flag, eval_data) eines Bildes aus einem einzigen Snapshot (thread-sicher)"""
+    try:
+        snapshot = load_metadata_snapshot(path)
+    except Exception:
+        snapshot = MetadataSnapshot(path)
+    return snapshot.ocr_info, snapshot.used, snapshot.evaluation
+
+
+class _RowTask(QRunnable):
+    def __init__(self, loader: 'MetadataRowLoader', folder: str, paths: list, cancel: threading.Event):
+        super().__init__()
+        self._loader = loader
+        self._folder = folder
+        self._paths = paths
+        self._cancel = cancel
+
+    def run(self):
+        total = len(self._paths)
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(_default_build_workers(), total))) as pool:
+                for start in range(0, total, _BATCH_SIZE):
+                    if self._cancel.is_set():
+                        return
+                    chunk = self._paths[start:start + _BATCH_SIZE]
+                    rows = dict(zip(chunk, pool.map(read_row, chunk)))
+                    if self._cancel.is_set():
+                        return
+                    self._loader.rowsReady.emit(self._folder, rows)
+        except Exception as e:
+            _log.error("metadata_rows_failed", extra={
+                "event": "metadata_rows_failed", "folder": self._folder, "error": str(e)})
+        if not self._cancel.is_set():
+            self._loader.finished.emit(self._folder)
+
+
+class MetadataRowLoader(QObject):
+    """Ein Ordner zur Zeit; start() bricht einen laufenden Ordner ab."""
+
+    rowsReady = Signal(str, dict)  # (ordner, {pfad: (ocr_info, use_flag, eval_data)})
+    finished = Signal(str)  # (ordner)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._cancel = threading.Event()
+
+    def start(self, folder: str, paths: list):
+        self.cancel()
+        if not paths:
+            return
+        self._cancel = threading.Event()
+        self._pool.start(_RowTask(self, folder, list(paths), self._cancel))
+
+    def cancel(self):
+        """Verwirft den laufenden Ordner; bereits gesendete Batches bleiben gültig"""
+        self._cancel.set()
+        self._pool.clear()
+
+    def shutdown(self, timeout_ms: int = 2000):
+        self.cancel()
+        self._pool.waitForDone(timeout_ms)
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Pixmap Cache
+Gemeinsamer LRU-Cache für QPixmaps mit Byte-Budget (Breite × Höhe × Farbtiefe).
+Alle Ansichten legen ihre Thumbnails hier ab; Schlüssel sind Tupel, deren erstes
+Element die Ansicht benennt (z.B. ('gallery', pfad, größe)).
+Nur im GUI-Thread verwenden (QPixmap).
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+from PySide6.QtGui import QPixmap
+from utils_logging import get_logger
+
+_DEFAULT_LIMIT_MB = 256
+_MIN_LIMIT_MB = 16  # Sichtbare Kacheln müssen immer hineinpassen
+
+_cache: Optional["PixmapCache"] = None
+
+
+def pixmap_bytes(pix: QPixmap) -> int:
+    """Speicherbedarf eines Pixmaps: Breite × Höhe × Bytes pro Pixel"""
+    if pix is None or pix.isNull():
+        return 0
+    return pix.width() * pix.height() * max(1, pix.depth() // 8)
+
+
+class PixmapCache:
+    """LRU über QPixmaps, begrenzt durch ein Byte-Budget; führt Treffer-Statistik."""
+
+    def __init__(self, limit_bytes: int):
+        self._log = get_logger('app', {"module": "qtui.pixmap_cache"})
+        self._entries: "OrderedDict[Hashable, tuple[QPixmap, int]]" = OrderedDict()
+        self._bytes = 0
+        self._limit = max(0, int(limit_bytes))
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "inserts": 0}
+
+    def get(self, key: Hashable) -> Optional[QPixmap]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return entry[0]
+
+    def put(self, key: Hashable, pix: QPixmap) -> bool:
+        """Legt ein Pixmap ab; zu große Einzelbilder werden nicht gecacht"""
+        self.pop(key)
+        size = pixmap_bytes(pix)
+        if size <= 0 or size > self._limit:
+            return False
+        self._entries[key] = (pix, size)
+        self._bytes += size
+        self._stats["inserts"] += 1
+        self._evict()
+        return True
+
+    def pop(self, key: Hashable) -> Optional[QPixmap]:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self._bytes -= entry[1]
+        return entry[0]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Entfernt alle Einträge, deren Schlüssel predicate erfüllt"""
+        keys = [k for k in self._entries if predicate(k)]
+        for key in keys:
+            self.pop(key)
+        return len(keys)
+
+    def clear(self, namespace: Optional[str] = None):
+        """Leert den Cache komplett oder nur die Einträge einer Ansicht"""
+        if namespace is None:
+            self._entries.clear()
+            self._bytes = 0
+            return
+        self.discard_where(lambda k: isinstance(k, tuple) and k and k[0] == namespace)
+
+    def set_limit(self, limit_bytes: int):
+        self._limit = max(0, int(limit_bytes))
+        self._evict()
+
+    def _evict(self):
+        evicted = 0
+        while self._bytes > self._limit and self._entries:
+            _key, (_pix, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            evicted += 1
+        if evicted:
+            self._stats["evictions"] += evicted
+            self._log.debug("pixmap_cache_evicted", extra={
+                "event": "pixmap_cache_evicted", "count": evicted, "bytes": self._bytes})
+
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        stats["entries"] = len(self._entries)
+        stats["bytes"] = self._bytes
+        stats["limit_bytes"] = self._limit
+        return stats
+
+
+def _limit_from_settings() -> int:
+    try:
+        from .settings_manager import get_settings_manager
+        value = int(get_settings_manager().get('performance_pixmap_cache_mb', _DEFAULT_LIMIT_MB))
+    except Exception:
+        value = _DEFAULT_LIMIT_MB
+    return max(_MIN_LIMIT_MB, value) * 1024 * 1024
+
+
+def get_pixmap_cache() -> PixmapCache:
+    """Prozessweiter Pixmap-Cache (Budget aus Setting 'performance_pixmap_cache_mb')"""
+    global _cache
+    if _cache is None:
+        _cache = PixmapCache(_limit_from_settings())
+    return _cache
+
+
+def apply_pixmap_cache_settings():
+    """Übernimmt ein geändertes Budget, ohne den Cache zu leeren"""
+    if _cache is not None:
+        _cache.set_limit(_limit_from_settings())
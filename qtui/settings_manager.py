@@ -288,6 +288,20 @@ class SettingsManager(QObject):
             "performance_lazy_loading": True,
             "performance_cache_evaluation_data": True,
             "performance_max_cache_size": 1000,
+            "performance_metadata_cache_size": 5000,
+            "performance_cache_build_workers": 0,  # 0 = automatisch
+            "performance_metadata_index_enabled": True,  # SQLite-Index pro Ordner
+            "performance_metadata_index_location": "appdata",  # "appdata" oder "folder"
+            "performance_flush_debounce_ms": 500,  # Ruhezeit bevor Bewertungen in EXIF geschrieben werden
+            "performance_thumbnail_workers": 0,  # Decoder-Threads für Thumbnails, 0 = automatisch
+            "performance_thumbnail_disk_cache_enabled": True,  # Thumbnails im App-Cache ablegen
+            "performance_thumbnail_disk_cache_mb": 1024,  # Obergrenze, LRU-Verdrängung
+            "performance_pixmap_cache_mb": 256,  # Gemeinsamer Pixmap-Cache aller Ansichten (RAM)
+            "performance_image_cache_mb": 1024,  # Vollaufgelöste Bilder im Bild-Service (RAM)
+            "performance_single_prefetch_mb": 512,  # Vorlade-Fenster der Einzelbildansicht (Teil des Bild-Service-Budgets)
+            "performance_tiled_view_min_mp": 16,  # Ab dieser Größe (Megapixel) kachelweise mit Detailstufen anzeigen, 0 = nie
+            "performance_tiled_level_cache_mb": 96,  # Verkleinerte Detailstufen großer Bilder (eigener RAM-Cache)
+            "performance_gallery_prefetch_pages": 1,  # Nachbarseiten, die die Galerie vorab lädt
             
             # Logging-Einstellungen
             "logging_log_level": "info",
@@ -299,6 +313,7 @@ class SettingsManager(QObject):
             # Pfade
             "paths_last_folder": "",
             "paths_backup_directory": "Backups",
+            "paths_annotated_directory": "Annotiert",  # Export der Bilder mit eingebrannten Zeichnungen
             "paths_log_directory": "logs",
             "paths_temp_directory": "temp",
             
@@ -5,7 +5,7 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QGraph
                                 QComboBox, QSpinBox, QGroupBox, QButtonGroup, QRadioButton,
                                 QDialog, QDialogButtonBox, QPlainTextEdit, QMessageBox, QScrollArea,
                                 QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
-from PySide6.QtGui import QPixmap, QPainter, QKeySequence, QShortcut, QPen, QColor, QAction
+from PySide6.QtGui import QPixmap, QPainter, QKeySequence, QShortcut, QPen, QColor, QAction, QTransform
 from PySide6.QtCore import Qt, Signal, QObject, QThread, QPointF, QTimer, QSize
 from utils_logging import get_logger
 from utils_exif import (
@@ -19,16 +19,18 @@ from utils_exif import (
     get_gene_flag,
     set_gene_flag,
     get_evaluation,
+    load_metadata_snapshot,
+    MetadataSnapshot,
 )
 # OCR-Erkennung entfernt: keine Abhängigkeit zu core_ocr/DetectParams
 from config_manager import config_manager
 from .settings_manager import get_settings_manager
 from .drawing_tools import DrawingManager, DrawingMode
+from .tiled_image_item import TiledImageItem, use_tiles_for
 from .evaluation_panel import EvaluationPanel
 from .widgets import ToggleSwitch
 import os
-import shutil
-import tempfile
+import time
 
 
 class DynamicPlainTextEdit(QPlainTextEdit):
@@ -111,6 +113,12 @@ class DynamicPlainTextEdit(QPlainTextEdit):
         self.setMinimumHeight(height)
 
 
+_DEFAULT_PREFETCH_MB = 512
+_ASSUMED_IMAGE_BYTES = 6000 * 4000 * 4  # 24-MP-Foto, solange die Größe unbekannt ist
+_FAST_NAV_RATE = 4.0  # Bilder/s, ab hier gilt gedrückt gehaltene Pfeiltaste
+_MAX_NAV_RATE = 60.0
+
+
 class SingleView(QWidget):
     progressChanged = Signal(int, int, int)  # current_index(1-based), total, evaluated_count
     folderChanged = Signal(str)
@@ -132,10 +140,18 @@ class SingleView(QWidget):
         self._current_folder = ""
         
         # Image Precaching für schnelleren Wechsel
-        self._image_cache = {}  # {path: QPixmap}
-        self._cache_range = 8  # 8 Bilder vorher + 8 nachher = 16 Bilder gecacht
-        self._max_cache_size = 25  # Maximale Cache-Größe
-        self._original_backup_paths = set()
+        # Dekodiert wird über den gemeinsamen Bild-Service (von MainWindow gesetzt)
+        self._image_service = None
+        self._pending_full = None  # Pfad, dessen Vollbild gerade im Hintergrund dekodiert wird
+        self._preview_shown = None  # Pfad, für den derzeit nur die Vorschau angezeigt wird
+        self._cache_range = 16  # maximale Vorlade-Distanz; die Anzahl bestimmt das Byte-Budget
+        # Navigationsrichtung (+1/-1, 0 = unbekannt) und -tempo (Bilder/s) für das Vorladen
+        self._nav_direction = 0
+        self._nav_rate = 0.0
+        self._nav_last = (-1, 0.0)
+        self._precache_timer = QTimer(self)
+        self._precache_timer.setSingleShot(True)
+        self._precache_timer.timeout.connect(self._precache_adjacent_images)
         self._pending_drawing_task = None
         self._drawing_flush_scheduled = False
         self._drawing_save_in_progress = False
@@ -745,6 +761,11 @@ class SingleView(QWidget):
     # API
     def load_image(self, path: str):
         self._log.info("image_load", extra={"event": "image_load", "path": path})
+        self._note_navigation(self._current_index)
+        
+        self._pending_full = None
+        self._preview_shown = None
+        preview = None
         
         # Prüfe ob Datei existiert und nicht leer ist
         if not os.path.exists(path) or os.path.getsize(path) == 0:
@@ -752,20 +773,27 @@ class SingleView(QWidget):
             # Verwende leeres Pixmap für defekte Dateien
             pix = QPixmap()
         # Prüfe Cache zuerst (schnellster Weg)
-        elif path in self._image_cache:
-            pix = self._image_cache[path]
         else:
             # WICHTIG: Einzelbild-Ansicht lädt immer Original-Qualität ohne Kompression!
-            pix = QPixmap(path)
-            # In Cache speichern (nur wenn gültig)
-            if not pix.isNull():
-                self._image_cache[path] = pix
+            # Bereits vorab (oder in einem anderen Tab) dekodierte Bilder kommen aus dem Service
+            pix = self._images().cached(path)
+            if pix is None:
+                # Nicht im GUI-Thread dekodieren: vor alle Vorab-Decodes stellen und
+                # das Ergebnis in _on_full_image_ready anzeigen
+                self._pending_full = path
+                service = self._images()
+                service.request(path, urgent=True)
+                # Bis dahin eine Vorschau: Thumbnail aus dem Cache, sonst verkleinerter Decode
+                preview = service.preview(path)
+                if preview is None:
+                    viewport = self.view.viewport().size()
+                    service.request_preview(path, viewport.width(), viewport.height())
         
         # Bild sofort anzeigen (höchste Priorität)
         scene = self.view.scene()
         if scene:
-            scene.clear()
-            if not pix.isNull():
+            self.view.clear_image()
+            if pix is not None and not pix.isNull():
                 self.view.set_pixmap(pix)
         
         # UI sofort aktualisieren (für instant Feedback)
@@ -774,12 +802,54 @@ class SingleView(QWidget):
         self._update_nav()
         self._update_action_tooltips()
         
+        # Vorladen unabhängig vom Decode des aktuellen Bildes planen
+        self._schedule_precache()
+        
+        if preview is not None:
+            self._show_preview(path, preview)
+        elif self._pending_full:
+            return  # Details und Precaching folgen, sobald Vorschau oder Bild da sind
+        else:
+            self._schedule_image_details(path)
+    
+    def _schedule_image_details(self, path: str):
         # ALLES andere asynchron laden (nicht blockierend)
         from PySide6.QtCore import QTimer
         QTimer.singleShot(0, lambda: self._load_image_details(path))
-        
-        # Precaching im Hintergrund starten (niedrigere Priorität)
-        QTimer.singleShot(100, self._precache_adjacent_images)
+    
+    def _show_preview(self, path: str, preview: QPixmap):
+        """Vorschau in Originalkoordinaten anzeigen; Details können sofort folgen,
+        weil das Original später ohne Reset der Szene eingesetzt wird"""
+        size = self._images().source_size(path)
+        if not self.view.scene() or preview.isNull() or not size.isValid():
+            return
+        self.view.set_pixmap(preview, source_size=size)
+        self._preview_shown = path
+        self._schedule_image_details(path)
+
+    def _on_preview_ready(self, path: str, preview: QPixmap):
+        # Nur solange das Original des angezeigten Bildes noch fehlt
+        if not path or path != self._pending_full or path != self._current_path():
+            return
+        if self._preview_shown != path:
+            self._show_preview(path, preview)
+
+    def _on_full_image_ready(self, path: str, pix: QPixmap):
+        """Hintergrund-Decode fertig; Ergebnisse für nicht mehr angezeigte Bilder verwerfen"""
+        if not path or path != self._pending_full or path != self._current_path():
+            return
+        self._pending_full = None
+        if self._preview_shown == path:
+            # Vorschau austauschen: Zoom, Ausschnitt, OCR-Label und Zeichnungen bleiben
+            self._preview_shown = None
+            if not pix.isNull():
+                self.view.set_pixmap(pix, reset=False)
+            return
+        scene = self.view.scene()
+        if scene and not pix.isNull():
+            self.view.set_pixmap(pix)
+        # OCR-Label und Zeichnungen erst jetzt in die Szene legen (set_pixmap leert sie)
+        self._schedule_image_details(path)
     
     def _load_image_details(self, path: str):
         """Lädt Metadaten und Details asynchron im Hintergrund"""
@@ -794,14 +864,16 @@ class SingleView(QWidget):
         self._refresh_gene_button()
         self._refresh_use_toggle()
         
+        # Metadaten einmal lesen; Notizen, OCR und Zeichnungen teilen den Snapshot
         try:
-            md = read_metadata(path) or {}
+            snapshot = load_metadata_snapshot(path)
         except Exception:
-            md = {}
+            snapshot = MetadataSnapshot(path)
+        md = snapshot.data
         
         # Schadensbeschreibung laden
         try:
-            eval_obj = get_evaluation(path) or {}
+            eval_obj = snapshot.evaluation
             notes = eval_obj.get('notes') or md.get('damage_description') or ''
         except Exception:
             notes = ''
@@ -815,13 +887,14 @@ class SingleView(QWidget):
             self._notes_loading = False
         
         # OCR-Info laden
-        try:
-            o = get_ocr_info(path)
-        except Exception:
-            o = {}
+        o = snapshot.ocr_info
         
         try:
             raw_tag = str(o.get('tag', '')).strip() if isinstance(o, dict) else ''
+            pending = self._cache_layer.get_pending(path) if self._cache_layer else {}
+            if 'tag' in pending:
+                # Noch nicht geschriebener Tag hat Vorrang vor EXIF
+                raw_tag = str(pending['tag'] or '').strip()
             if raw_tag:
                 display_tag = raw_tag.upper()
                 self.ocr_label.setText(display_tag)
@@ -839,7 +912,7 @@ class SingleView(QWidget):
         # Zeichnungen laden
         try:
             # Versuche zuerst aus Metadaten zu laden
-            drawings_data = md.get('drawings', [])
+            drawings_data = snapshot.drawings
             
             # Falls keine Zeichnungen in Metadaten, versuche Cache
             if not drawings_data and path in self._drawings_cache:
@@ -899,10 +972,36 @@ class SingleView(QWidget):
         # Bild sofort laden (ohne zu warten)
         self.load_image(path)
     
+    def set_image_service(self, service):
+        """Setzt den gemeinsamen Bild-Service (wird von MainWindow aufgerufen)"""
+        if self._image_service is not None:
+            try:
+                self._image_service.imageReady.disconnect(self._on_full_image_ready)
+                self._image_service.previewReady.disconnect(self._on_preview_ready)
+            except Exception:
+                pass
+        self._image_service = service
+        if service is not None:
+            service.imageReady.connect(self._on_full_image_ready)
+            service.previewReady.connect(self._on_preview_ready)
+
+    def _images(self):
+        # Ohne MainWindow (z.B. eigenständig geöffnet) einen eigenen Service anlegen
+        if self._image_service is None:
+            from .image_service import ImageService
+            self.set_image_service(ImageService(self))
+        return self._image_service
+
     def set_cache_layer(self, cache_layer):
         """Setzt den Cache-Layer (wird von MainWindow aufgerufen)"""
         self._cache_layer = cache_layer
 
+    def _store_ocr_tag(self, path: str, tag, box=None) -> bool:
+        # Mit Cache-Layer gepuffert (ein gemeinsamer EXIF-Write), sonst direkt
+        if self._cache_layer:
+            return self._cache_layer.set_ocr_tag(path, tag, box=box)
+        return set_ocr_info(path, tag=tag, box=box)
+
     def _edit_ocr_tag(self):
         # Öffnet den Dialog, trägt Änderungen in EXIF ein und aktualisiert Overlay/Label
         path = self._current_path()
@@ -910,17 +1009,18 @@ class SingleView(QWidget):
             return
         try:
             from .dialogs import OcrEditDialog
-            info = get_ocr_info(path)
-            dlg = OcrEditDialog(self, tag=info.get('tag', ''))
+            current_tag = self._cache_layer.get_ocr_tag(path) if self._cache_layer else get_ocr_info(path).get('tag', '')
+            dlg = OcrEditDialog(self, tag=current_tag)
             if dlg.exec() == QDialog.Accepted:
                 tag = dlg.result_tag()
                 # Tag normalisieren: Leerstring oder nur Whitespace = None (kein Tag)
                 tag_clean = tag.strip() if tag else ""
                 tag_value = tag_clean.upper() if tag_clean else None
                 
-                # Speichere in EXIF (None -> Tag entfernen)
+                # Speichern (None -> Tag entfernen); über den Cache-Layer mit anstehenden
+                # Bewertungs-/Verwenden-Änderungen zu einem Schreibvorgang zusammengefasst
                 try:
-                    if not set_ocr_info(path, tag=tag_value):
+                    if not self._store_ocr_tag(path, tag_value):
                         raise Exception("set_ocr_info returned False - Tag konnte nicht gespeichert werden")
                     display_tag = tag_value if tag_value else "—"
                     if tag_value:
@@ -976,8 +1076,8 @@ class SingleView(QWidget):
         # Beim Ordnerwechsel ggf. aktuelle Bewertung sichern
         self._save_current_exif()
         
-        # Cache leeren bei Ordnerwechsel (verhindert Memory Leak)
-        self._image_cache.clear()
+        # Vorab-Decodes des alten Ordners verwerfen (der Speicher ist byte-begrenzt)
+        self._images().cancel_pending()
         
         # Bereinige auch Cache-Layer für alten Ordner (verhindert RAM-Überlauf)
         if self._cache_layer:
@@ -1046,6 +1146,12 @@ class SingleView(QWidget):
         # UI aktualisieren
         self._update_labels()
         self._update_nav()
+        
+        # Nachbarn haben sich geändert: Richtung verwerfen und neu vorladen
+        self._nav_direction = 0
+        self._nav_rate = 0.0
+        self._nav_last = (self._current_index, time.monotonic())
+        self._schedule_precache()
     
     def _update_sort_button_style(self, is_alphabetic: bool):
         """Aktualisiert Button-Style: Grün für ABC, Grau für TreeView"""
@@ -1200,7 +1306,7 @@ class SingleView(QWidget):
             pass
         # Auto-Speichern in EXIF
         try:
-            set_ocr_info(path_now, tag=txt if txt and txt != '—' else None, box=box)
+            self._store_ocr_tag(path_now, txt if txt and txt != '—' else None, box=box)
             self._log.info("ocr_tag_saved", extra={"event": "ocr_tag_saved", "path": path_now, "tag": txt})
         except Exception:
             pass
@@ -1382,43 +1488,87 @@ class SingleView(QWidget):
     def current_path(self) -> str | None:
         return self._current_path()
     
+    def _note_navigation(self, index: int):
+        """Merkt Richtung und Tempo der Navigation (Einzelschritte); Sprünge setzen beides zurück"""
+        now = time.monotonic()
+        last_index, last_time = self._nav_last
+        step = index - last_index if last_index >= 0 and index >= 0 else 0
+        if step and abs(step) <= 2:
+            direction = 1 if step > 0 else -1
+            elapsed = now - last_time
+            if direction == self._nav_direction and elapsed > 0:
+                # Gleitender Mittelwert, damit einzelne Ausreißer das Fenster nicht umwerfen
+                self._nav_rate = 0.5 * self._nav_rate + 0.5 * min(_MAX_NAV_RATE, abs(step) / elapsed)
+            else:
+                self._nav_direction = direction
+                self._nav_rate = 0.0
+        elif step:
+            self._nav_direction = 0
+            self._nav_rate = 0.0
+        self._nav_last = (index, now)
+
+    def _schedule_precache(self):
+        # Bei zügigem Blättern sofort vorausladen, sonst kurz warten (Einzelklick, Sprung)
+        fast = self._nav_direction != 0 and self._nav_rate >= _FAST_NAV_RATE
+        self._precache_timer.start(0 if fast else 100)
+
+    def _prefetch_budget(self, service) -> int:
+        try:
+            mb = int(self.settings_manager.get('performance_single_prefetch_mb', _DEFAULT_PREFETCH_MB))
+        except Exception:
+            mb = _DEFAULT_PREFETCH_MB
+        # Die andere Hälfte des Bild-Service-Budgets bleibt für das aktuelle und zuletzt gesehene Bilder
+        limit = service.stats().get("limit_bytes", 0)
+        return max(0, min(mb * 1024 * 1024, limit // 2))
+
     def _precache_adjacent_images(self):
-        """Lädt benachbarte Bilder im Hintergrund vor"""
+        """Lädt Nachbarbilder in Navigationsrichtung vor, begrenzt durch das Byte-Budget.
+
+        Die Reihenfolge ist die der Dateiliste, also auch die TreeView-Sortierung
+        (_sort_by_treeview). Wartende Decodes außerhalb des neuen Fensters werden verworfen.
+        """
         if self._current_index < 0 or not self._image_paths:
             return
         
         try:
-            # Bestimme Bereich zum Vorladen (konfigurierbar via self._cache_range)
-            cache_range = getattr(self, '_cache_range', 8)
-            start_idx = max(0, self._current_index - cache_range)
-            end_idx = min(len(self._image_paths), self._current_index + cache_range + 1)
+            service = self._images()
+            current_path = self._current_path() or ""
+            current = service.cached(current_path)
+            size = current.size() if current is not None else service.source_size(current_path)
+            per_image = size.width() * size.height() * 4 if size.isValid() else _ASSUMED_IMAGE_BYTES
+            count = min(2 * self._cache_range, self._prefetch_budget(service) // max(1, per_image))
             
-            # Lade Bilder die noch nicht im Cache sind
-            for idx in range(start_idx, end_idx):
-                if idx == self._current_index:
-                    continue  # Aktuelles Bild ist bereits geladen
-                
-                path = self._image_paths[idx]
-                if path not in self._image_cache:
-                    try:
-                        pix = QPixmap(path)
-                        if not pix.isNull():
-                            self._image_cache[path] = pix
-                    except Exception:
-                        pass
+            # Fenster aufteilen: unbekannte Richtung symmetrisch, sonst überwiegend voraus
+            direction = self._nav_direction or 1
+            if self._nav_direction == 0:
+                ahead = (count + 1) // 2
+            elif self._nav_rate >= _FAST_NAV_RATE:
+                ahead = count - min(1, count // 4)
+            else:
+                ahead = count - count // 4
+            ahead = min(ahead, self._cache_range)
+            behind = min(count - ahead, self._cache_range)
             
-            # Cache-Größe begrenzen (entferne alte Einträge)
-            max_cache = getattr(self, '_max_cache_size', 25)
-            if len(self._image_cache) > max_cache:
-                # Entferne Bilder die am weitesten vom aktuellen Index entfernt sind
-                current_path = self._current_path()
-                paths_to_keep = set(self._image_paths[start_idx:end_idx])
-                if current_path:
-                    paths_to_keep.add(current_path)
-                
-                for path in list(self._image_cache.keys()):
-                    if path not in paths_to_keep:
-                        del self._image_cache[path]
+            wanted = []  # (index, priorität): voraus vor zurück, jeweils nächste zuerst
+            for distance in range(1, ahead + 1):
+                wanted.append((self._current_index + direction * distance, 2 * self._cache_range - distance))
+            for distance in range(1, behind + 1):
+                wanted.append((self._current_index - direction * distance, self._cache_range - distance))
+            wanted = [(idx, prio) for idx, prio in wanted if 0 <= idx < len(self._image_paths)]
+            
+            # Übersprungene Bilder (schnelles Blättern, Richtungswechsel) nicht mehr dekodieren
+            keep = {self._image_paths[idx] for idx, _ in wanted}
+            keep.add(current_path)
+            dropped = service.retain(keep)
+            requested = 0
+            for idx, prio in wanted:
+                # Im Hintergrund dekodieren, die GUI bleibt bedienbar
+                if service.request(self._image_paths[idx], priority=prio):
+                    requested += 1
+            self._log.debug("single_prefetch", extra={
+                "event": "single_prefetch", "direction": self._nav_direction,
+                "rate": round(self._nav_rate, 1), "ahead": ahead, "behind": behind,
+                "requested": requested, "dropped": dropped})
         
         except Exception:
             pass
@@ -1652,7 +1802,7 @@ class SingleView(QWidget):
             return False
     
     def _save_current_drawings(self):
-        """Persistiert Zeichnungen, erstellt Sicherung und exportiert annotiertes Bild."""
+        """Persistiert Zeichnungen (als Vektoren in den Metadaten)."""
         path = self._current_path()
         manager = getattr(self.view, 'drawing_manager', None)
         if not path or not manager:
@@ -1683,6 +1833,12 @@ class SingleView(QWidget):
         except Exception as e:
             self._log.error("drawing_save_failed", extra={"error": str(e), "path": path})
 
+    def flush_drawings(self):
+        """Speichert die Zeichnungen des aktuellen Bildes sofort (z.B. vor dem Export)"""
+        self._save_current_drawings()
+        if self._pending_drawing_task and not self._drawing_save_in_progress:
+            self._flush_pending_drawings()
+
     def _flush_pending_drawings(self):
         """Verarbeitet gespeicherte Zeichnungen sequentiell, um Überschneidungen zu vermeiden."""
         self._drawing_flush_scheduled = False
@@ -1707,46 +1863,18 @@ class SingleView(QWidget):
                     QTimer.singleShot(0, self._flush_pending_drawings)
 
     def _persist_drawings(self, path: str, drawings: list[dict]):
+        """Speichert die Zeichnungen nur als Vektoren in den Metadaten.
+
+        Das Original bleibt unverändert; die Ansicht zeichnet die Vektoren live,
+        eingebrannt wird erst beim Export (qtui.annotation_export)."""
         if not path:
             return
 
         # Aktualisiere Cache sofort (auch wenn Speichern später fehlschlägt)
         self._drawings_cache[path] = [dict(item) for item in drawings] if drawings else []
 
-        # Sicherung des Originalbilds (einmalig)
-        try:
-            backup_path = self._ensure_original_backup(path)
-            if backup_path:
-                self._log.info(
-                    "image_backup_created",
-                    extra={"event": "image_backup_created", "original": path, "backup": backup_path},
-                )
-        except Exception as e:
-            self._log.error(
-                "image_backup_failed", extra={"error": str(e), "path": path}
-            )
-
-        # Aktuelle Metadaten sichern, damit sie nach dem Export wiederhergestellt werden können
-        metadata_snapshot = {}
-        metadata_read_success = False
-        try:
-            md = read_metadata(path)
-            if isinstance(md, dict):
-                metadata_snapshot = md.copy()
-                metadata_read_success = True
-            else:
-                metadata_snapshot = {}
-        except Exception as e:
-            self._log.error("drawing_metadata_read_failed", extra={"error": str(e), "path": path})
-            metadata_snapshot = {}
-
-        if drawings:
-            metadata_snapshot["drawings"] = [dict(item) for item in drawings]
-        else:
-            metadata_snapshot.pop("drawings", None)
-
-        # Annotiertes Bild exportieren und anschließend Metadaten wiederherstellen
         if drawings:
+            # Annotierte Bilder sollen in den Bericht
             try:
                 panel = getattr(self, '_evaluation_panel', None)
                 if panel and hasattr(panel, 'get_state'):
@@ -1755,167 +1883,34 @@ class SingleView(QWidget):
                         panel.set_use(True)
             except Exception:
                 pass
-            temp_path = None
-            try:
-                _, ext = os.path.splitext(path)
-                fd, temp_path = tempfile.mkstemp(suffix=ext or ".jpg", dir=os.path.dirname(path))
-                os.close(fd)
-            except Exception as e:
-                self._log.error("annotated_image_temp_failed", extra={"error": str(e), "path": path})
-                return
-
-            annotated_path = self._export_annotated_image(path, target_path=temp_path)
-            if annotated_path and os.path.exists(annotated_path):
-                self._log.info(
-                    "annotated_image_saved",
-                    extra={
-                        "event": "annotated_image_saved",
-                        "original": path,
-                        "annotated": annotated_path,
-                    },
-                )
-                metadata_ok = False
-                try:
-                    metadata_ok = write_metadata(annotated_path, metadata_snapshot)
-                except Exception as e:
-                    self._log.error("drawing_metadata_write_failed", extra={"error": str(e), "path": path})
-                    metadata_ok = False
-
-                if not metadata_ok:
-                    try:
-                        os.remove(annotated_path)
-                    except Exception:
-                        pass
-                    self._log.error(
-                        "drawing_metadata_failed",
-                        extra={"event": "drawing_metadata_failed", "path": path},
-                    )
-                    return
-
-                try:
-                    os.replace(annotated_path, path)
-                except Exception as e:
-                    self._log.error("annotated_image_replace_failed", extra={"error": str(e), "path": path})
-                    try:
-                        os.remove(annotated_path)
-                    except Exception:
-                        pass
-                    return
-
-                self._log.info(
-                    "annotated_image_committed",
-                    extra={"event": "annotated_image_committed", "path": path},
-                )
-                self._refresh_after_image_update(path)
-            else:
-                self._log.error(
-                    "annotated_image_failed",
-                    extra={"event": "annotated_image_failed", "path": path},
-                )
-                if annotated_path and os.path.exists(annotated_path):
-                    try:
-                        os.remove(annotated_path)
-                    except Exception:
-                        pass
-        else:
-            # Keine Zeichnungen: Metadaten ggf. aktualisieren (z. B. Löschen des Drawings-Blocks)
-            try:
-                if metadata_read_success:
-                    write_metadata(path, metadata_snapshot)
-            except Exception as e:
-                self._log.error("drawing_metadata_write_failed", extra={"error": str(e), "path": path})
-
-    def _ensure_original_backup(self, image_path: str) -> str | None:
-        if not image_path:
-            return None
-
-        if image_path in self._original_backup_paths:
-            return None
 
-        directory = os.path.dirname(image_path)
-        filename = os.path.basename(image_path)
-        backup_dir_name = self.settings_manager.get("paths_backup_directory", "Backups") or "Backups"
-        backup_dir = os.path.join(directory, backup_dir_name)
-        os.makedirs(backup_dir, exist_ok=True)
-
-        backup_path = os.path.join(backup_dir, filename)
-        if os.path.exists(backup_path):
-            self._original_backup_paths.add(image_path)
-            return backup_path
-
-        shutil.copy2(image_path, backup_path)
-        self._original_backup_paths.add(image_path)
-        return backup_path
-
-    def _export_annotated_image(self, original_path: str, *, target_path: str | None = None) -> str | None:
         try:
-            from PySide6.QtGui import QImage, QPainter
-
-            scene = self.view.scene()
-            if not scene or not scene.items():
-                return None
-
-            rect = scene.itemsBoundingRect()
-            if rect.isNull() or rect.width() <= 0 or rect.height() <= 0:
-                return None
-
-            # Overlay (OCR-Tag) temporär ausblenden, damit er nicht eingebrannt wird
-            hidden_items = self.view.begin_export_without_overlay()
-            try:
-                image = QImage(int(rect.width()), int(rect.height()), QImage.Format_RGB32)
-                image.fill(Qt.white)
-
-                painter = QPainter(image)
-                painter.setRenderHints(QPainter.Antialiasing | QPainter.SmoothPixmapTransform)
-                scene.render(painter, target=image.rect(), source=rect)
-                painter.end()
-            finally:
-                self.view.end_export_without_overlay(hidden_items)
-
-            destination = target_path or original_path
-            ext = os.path.splitext(destination)[1].lower()
-            if ext in {".jpg", ".jpeg"}:
-                if not image.save(destination, "JPEG", 95):
-                    return None
-            else:
-                if not image.save(destination):
-                    return None
-
-            return destination
+            md = read_metadata(path)
+            metadata = md.copy() if isinstance(md, dict) else {}
         except Exception as e:
-            self._log.error("annotated_image_exception", extra={"error": str(e), "path": original_path})
-            return None
-
-    def _refresh_after_image_update(self, path: str):
-        if not path:
+            # Ohne gelesene Metadaten nicht schreiben, sonst gingen Bewertung & Co. verloren
+            self._log.error("drawing_metadata_read_failed", extra={"error": str(e), "path": path})
             return
 
-        try:
-            if path in self._image_cache:
-                del self._image_cache[path]
-        except Exception:
-            pass
+        if drawings:
+            metadata["drawings"] = [dict(item) for item in drawings]
+        elif "drawings" in metadata:
+            metadata.pop("drawings", None)
+        else:
+            return
 
         try:
-            pix = QPixmap(path)
-            if not pix.isNull():
-                self._image_cache[path] = pix
-                if hasattr(self.view, 'set_pixmap'):
-                    self.view.set_pixmap(pix, reset=False)
-                    # Overlay nach dem erneuten Laden sicherstellen
-                    current_tag = self.ocr_label.text() if hasattr(self, 'ocr_label') else ''
-                    if current_tag and current_tag.strip() and current_tag.strip() != "—":
-                        self.view.set_ocr_label(self._tag_with_heading(current_tag.strip()))
-                    else:
-                        self.view.set_ocr_label("")
+            ok = write_metadata(path, metadata)
         except Exception as e:
-            self._log.error("image_reload_failed", extra={"error": str(e), "path": path})
-
-        try:
-            if hasattr(self.view, 'viewport'):
-                self.view.viewport().update()
-        except Exception:
-            pass
+            self._log.error("drawing_metadata_write_failed", extra={"error": str(e), "path": path})
+            return
+        if not ok:
+            self._log.error("drawing_metadata_failed", extra={"event": "drawing_metadata_failed", "path": path})
+            return
+        self._log.info(
+            "drawings_saved",
+            extra={"event": "drawings_saved", "path": path, "count": len(drawings or [])},
+        )
 
         try:
             window = self.window()
@@ -1974,8 +1969,11 @@ class SingleView(QWidget):
             current_tag = ""
             path = self._current_path()
             if path:
-                ocr_info = get_ocr_info(path)
-                current_tag = ocr_info.get('tag', '') if ocr_info else ''
+                if self._cache_layer:
+                    current_tag = self._cache_layer.get_ocr_tag(path)
+                else:
+                    ocr_info = get_ocr_info(path)
+                    current_tag = ocr_info.get('tag', '') if ocr_info else ''
 
             config = self.settings_manager.get_text_snippet_config()
             tag_map = config.get('tags', {})
@@ -2166,6 +2164,7 @@ class ImageView(QGraphicsView):
         self.setRenderHints(self.renderHints() | QPainter.Antialiasing | QPainter.SmoothPixmapTransform)
         self.setDragMode(QGraphicsView.NoDrag)  # Drag Mode wird vom Drawing Manager gesteuert
         self._pix = None
+        self._source_size = None  # Originalgröße, solange nur eine verkleinerte Vorschau angezeigt wird
         self._rect_item = None
         self._tag_item = None
         self._tag_bg_item = None
@@ -2187,27 +2186,53 @@ class ImageView(QGraphicsView):
         self._manual_zoom_active = False  # Flag: Wurde manuell gezoomt (nicht durch fit_to_view)
         self._zoom_mode = "fit_to_view"  # "fit_to_view", "1:1", oder "manual"
 
-    def set_pixmap(self, pix: QPixmap, *, reset: bool = True):
+    def set_pixmap(self, pix: QPixmap, *, reset: bool = True, source_size: QSize | None = None):
+        """Zeigt ein Bild an. source_size: Originalgröße, wenn pix nur eine verkleinerte
+        Vorschau ist – das Item wird dann hochskaliert, damit Szenenkoordinaten (Zeichnungen,
+        OCR-Label) immer in Originalpixeln bleiben. reset=False tauscht nur das Bild aus;
+        bleibt die Größe in der Szene gleich, bleiben Zoom und Ausschnitt unverändert."""
         self._pix = pix
+        self._source_size = source_size if source_size is not None and source_size.isValid() else None
         sc = self.scene()
         if not sc:
             return
 
+        old_rect = None
         if reset or self._pix_item is None:
+            self._release_pix_item()
             sc.clear()
-            self._pix_item = sc.addPixmap(pix)
-            if self._pix_item:
-                self._pix_item.setZValue(-100)
+            self._pix_item = self._add_pix_item(sc, pix)
         else:
             try:
                 if self._pix_item:
-                    self._pix_item.setPixmap(pix)
+                    old_rect = self._pix_item.sceneBoundingRect()
+                    if self._wants_tiles(pix) == isinstance(self._pix_item, TiledImageItem):
+                        self._pix_item.setPixmap(pix)
+                    else:
+                        # z.B. Vorschau -> großes Original: Item-Art wechseln, Rest der Szene bleibt
+                        self._release_pix_item()
+                        sc.removeItem(self._pix_item)
+                        self._pix_item = self._add_pix_item(sc, pix)
             except Exception:
                 # Fallback: vollständiger Reset
                 sc.clear()
-                self._pix_item = sc.addPixmap(pix)
-                if self._pix_item:
-                    self._pix_item.setZValue(-100)
+                self._pix_item = self._add_pix_item(sc, pix)
+        
+        if self._pix_item:
+            self._pix_item.setTransformationMode(Qt.SmoothTransformation)
+            # Vorschau getrennt in x und y strecken, damit sie exakt die Originalfläche abdeckt
+            # (die Vorschauhöhe ist gerundet, ein einheitlicher Faktor ginge um Pixel daneben)
+            transform = QTransform()
+            if self._source_size is not None and pix.width() > 0 and pix.height() > 0:
+                transform = QTransform.fromScale(self._source_size.width() / pix.width(),
+                                                 self._source_size.height() / pix.height())
+            self._pix_item.setTransform(transform)
+            new_rect = self._pix_item.sceneBoundingRect()
+            if (old_rect is not None and abs(old_rect.width() - new_rect.width()) < 0.5
+                    and abs(old_rect.height() - new_rect.height()) < 0.5):
+                # Vorschau -> Original (gleiche Fläche): Zoom und Pan beibehalten
+                self.viewport().update()
+                return
         
         # Zoom-Modus beibehalten beim Wechseln der Bilder
         if self._zoom_mode == "1:1":
@@ -2231,7 +2256,7 @@ class ImageView(QGraphicsView):
                     self._update_zoom_label()
                     # Zentriere das Bild
                     if self._pix:
-                        self.centerOn(self._pix.width() / 2, self._pix.height() / 2)
+                        self.centerOn(self._image_size().width() / 2, self._image_size().height() / 2)
                     # Zoom-Modus bleibt "1:1" (nicht zurücksetzen)
         elif self._zoom_mode == "manual" and self._zoom_factor != 1.0:
             # Manueller Zoom beibehalten
@@ -2254,6 +2279,45 @@ class ImageView(QGraphicsView):
             self._manual_zoom_active = False
             self.fit_to_view()
 
+    def clear_image(self):
+        """Leert die Szene und gibt die Detailstufen des bisherigen Bildes frei"""
+        self._release_pix_item()
+        self._pix_item = None
+        sc = self.scene()
+        if sc:
+            sc.clear()
+
+    def _wants_tiles(self, pix: QPixmap) -> bool:
+        try:
+            min_mp = float(self.settings_manager.get('performance_tiled_view_min_mp', 16))
+        except Exception:
+            min_mp = 16.0
+        return use_tiles_for(pix, min_mp)
+
+    def _add_pix_item(self, sc, pix: QPixmap):
+        # Sehr große Bilder kachelweise mit Detailstufen, sonst ein einfaches Pixmap-Item
+        if self._wants_tiles(pix):
+            item = TiledImageItem(pix)
+            sc.addItem(item)
+        else:
+            item = sc.addPixmap(pix)
+        if item:
+            item.setZValue(-100)
+        return item
+
+    def _release_pix_item(self):
+        if isinstance(self._pix_item, TiledImageItem):
+            try:
+                self._pix_item.release()
+            except Exception:
+                pass
+
+    def _image_size(self) -> QSize:
+        """Größe des angezeigten Bildes in Szenenkoordinaten (Originalpixel)"""
+        if self._source_size is not None:
+            return self._source_size
+        return self._pix.size() if self._pix else QSize()
+
     def set_box(self, x: int, y: int, w: int, h: int):
         sc = self.scene()
         try:
@@ -2321,7 +2385,7 @@ class ImageView(QGraphicsView):
         
         # Position: oben in der Mitte des Bildes
         if self._pix:
-            pix_width = self._pix.width()
+            pix_width = self._image_size().width()
             
             # Text zentrieren im Hintergrund-Kasten
             text_width = text_rect.width()
@@ -2350,28 +2414,6 @@ class ImageView(QGraphicsView):
         if hasattr(self, 'viewport'):
             self.viewport().update()
 
-    def begin_export_without_overlay(self):
-        hidden = []
-        for item in (self._tag_item, self._tag_bg_item):
-            try:
-                if item is not None and item.isVisible():
-                    item.setVisible(False)
-                    hidden.append(item)
-            except Exception:
-                pass
-        return hidden
-
-    def end_export_without_overlay(self, hidden_items):
-        if not hidden_items:
-            return
-        for item in hidden_items:
-            try:
-                item.setVisible(True)
-            except Exception:
-                pass
-        if hasattr(self, 'viewport'):
-            self.viewport().update()
-
     def set_context_edit_handler(self, cb):
         self._context_edit_callback = cb
 
@@ -2424,7 +2466,7 @@ class ImageView(QGraphicsView):
                         self.scale(target_scale, target_scale)
                         # Zentriere das Bild
                         if self._pix:
-                            self.centerOn(self._pix.width() / 2, self._pix.height() / 2)
+                            self.centerOn(self._image_size().width() / 2, self._image_size().height() / 2)
         
         # Positioniere Navigation-Overlay am unteren Rand (nur wenn "overlay" aktiv)
         nav_position = self.settings_manager.get("navigation_position", "below") or "below"
@@ -2493,7 +2535,7 @@ class ImageView(QGraphicsView):
         self._update_zoom_label()
         # Zentriere das Bild
         if self._pix:
-            self.centerOn(self._pix.width() / 2, self._pix.height() / 2)
+            self.centerOn(self._image_size().width() / 2, self._image_size().height() / 2)
         # 1:1 Zoom-Modus setzen
         self._manual_zoom_active = False
         self._zoom_mode = "1:1"
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+"""
+Thumbnail Loader
+Dekodiert Vorschaubilder im Hintergrund (QThreadPool) mit verkleinertem JPEG-Decode
+und persistentem Festplatten-Cache (utils_thumbnail_cache).
+
+Thumbnails bis PYRAMID_LEVELS[-1] Pixel entstehen aus einer Pyramide fester Stufen,
+die in einem einzigen Decode-Durchgang erzeugt und gespeichert wird. Jede Zielgröße
+wird aus der nächstgrößeren Stufe verkleinert; ein Wechsel der Rastergröße liest
+das Original also nicht erneut. Die großen Stufen (über _BASE_TOP, für die
+2-Spalten-Raster) entstehen erst, wenn eine Kachel sie braucht.
+"""
+
+import os
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QObject, QRunnable, QThreadPool, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader
+from utils_logging import get_logger
+from utils_exif import get_exif_thumbnail
+from utils_thumbnail_cache import get_thumbnail_store
+from utils_helpers import KeyedLocks
+
+# Kantenlänge der quadratischen Begrenzungsbox je Stufe; 2048 deckt Zellen der
+# "2 x n"/"n x 2"-Raster bis zu einem 4K-Fenster ab
+PYRAMID_LEVELS = (128, 256, 512, 1024, 2048)
+_BASE_TOP = 512  # Standard-Decode: Stufen bis hierher, größere nur bei Bedarf
+
+# Prozessweit: dieselbe Datei wird nie von zwei Loadern (Galerie, Titelbilder) parallel dekodiert
+_decode_locks = KeyedLocks()
+
+
+def _default_thumbnail_workers() -> int:
+    """Anzahl Decoder-Threads: Setting oder automatisch (max. 4, ein Kern bleibt frei)"""
+    try:
+        from .settings_manager import get_settings_manager
+        value = int(get_settings_manager().get('performance_thumbnail_workers', 0) or 0)
+        if value > 0:
+            return value
+    except Exception:
+        pass
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+def decode_thumbnail(path: str, width: int, height: int) -> QImage:
+    """Liest ein Bild direkt in Zielgröße (KeepAspectRatio).
+
+    Über QImageReader.setScaledSize skaliert der JPEG-Decoder bereits im
+    DCT-Bereich, ein 20-MP-Foto wird also nie vollständig dekodiert.
+    Thread-sicher (nur QImage, kein QPixmap). Bei Fehlern: leeres QImage.
+    """
+    reader = QImageReader(path)
+    src = reader.size()
+    target = None
+    if src.isValid() and width > 0 and height > 0:
+        target = src.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio)
+        if target.width() < src.width() or target.height() < src.height():
+            reader.setScaledSize(target)
+    img = reader.read()
+    if img.isNull():
+        return QImage()
+    if width > 0 and height > 0:
+        if target is None:
+            target = img.size().scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio)
+        if img.size() != target:
+            img = img.scaled(target, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    return img
+
+
+def _encode_thumbnail(image: QImage) -> tuple:
+    """Kodiert ein Thumbnail für den Festplatten-Cache: (bytes, endung)"""
+    fmt, ext = ("PNG", "png") if image.hasAlphaChannel() else ("JPG", "jpg")
+    data = QByteArray()
+    buf = QBuffer(data)
+    buf.open(QIODevice.OpenModeFlag.WriteOnly)
+    ok = image.save(buf, fmt, 85)
+    buf.close()
+    return (bytes(data), ext) if ok else (b"", ext)
+
+
+def pyramid_level_for(width: int, height: int):
+    """Kleinste Pyramidenstufe, aus der (width, height) verkleinert werden kann; None wenn zu groß"""
+    edge = max(int(width), int(height))
+    for level in PYRAMID_LEVELS:
+        if level >= edge:
+            return level
+    return None
+
+
+def _fit(image: QImage, width: int, height: int) -> QImage:
+    """Bringt eine Pyramidenstufe auf die Zielgröße (KeepAspectRatio)"""
+    if image.isNull():
+        return image
+    target = image.size().scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio)
+    if target == image.size():
+        return image
+    return image.scaled(target, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+
+def _load_cached(path: str, width: int, height: int, st=None) -> QImage:
+    store = get_thumbnail_store()
+    if store is None:
+        return QImage()
+    try:
+        data = store.get(path, width, height, st)
+        if data:
+            return QImage.fromData(data)
+    except Exception:
+        pass
+    return QImage()
+
+
+def _store_image(path: str, width: int, height: int, image: QImage, st):
+    store = get_thumbnail_store()
+    if store is None or image.isNull():
+        return
+    try:
+        data, ext = _encode_thumbnail(image)
+        store.put(path, width, height, data, ext, st)
+    except Exception:
+        pass
+
+
+def load_cached_thumbnail(path: str, width: int, height: int) -> QImage:
+    """Thumbnail nur aus dem Festplatten-Cache; leeres QImage, wenn nicht vorhanden."""
+    level = pyramid_level_for(width, height)
+    if level is None:
+        return _load_cached(path, width, height)
+    return _fit(_load_cached(path, level, level), width, height)
+
+
+def _decode_pyramid(path: str, st, top: int = _BASE_TOP) -> dict:
+    """Ein Decode in Stufe top, kleinere Stufen daraus verkleinert; alle werden abgelegt."""
+    top = max(top, _BASE_TOP)
+    image = decode_thumbnail(path, top, top)
+    if image.isNull():
+        return {}
+    levels = {top: image}
+    for level in reversed([lv for lv in PYRAMID_LEVELS if lv < top]):
+        image = image.scaled(level, level, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        levels[level] = image
+    for level, img in levels.items():
+        _store_image(path, level, level, img, st)
+    return levels
+
+
+def _decode_and_store(path: str, width: int, height: int) -> QImage:
+    """Dekodiert verkleinert und legt das Ergebnis im Festplatten-Cache ab."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return QImage()
+    level = pyramid_level_for(width, height)
+    with _decode_locks.hold(os.path.normcase(os.path.abspath(path))):
+        if level is not None:
+            # Ein anderer Loader hat die Pyramide evtl. gerade erzeugt
+            cached = _load_cached(path, level, level, st)
+            if cached.isNull():
+                cached = _decode_pyramid(path, st, level).get(level, QImage())
+            return _fit(cached, width, height)
+        img = decode_thumbnail(path, width, height)
+        _store_image(path, width, height, img, st)
+        return img
+
+
+def load_thumbnail(path: str, width: int, height: int) -> QImage:
+    """Thumbnail aus dem Festplatten-Cache oder frisch dekodiert (und dort abgelegt).
+    Thread-sicher; bei Fehlern leeres QImage."""
+    img = load_cached_thumbnail(path, width, height)
+    if img.isNull():
+        img = _decode_and_store(path, width, height)
+    return img
+
+
+def load_exif_preview(path: str, width: int, height: int) -> QImage:
+    """Eingebettetes EXIF-Vorschaubild auf Zielgröße gebracht (nur Dateikopf wird gelesen).
+    Leeres QImage, wenn das Bild keines enthält."""
+    data = get_exif_thumbnail(path)
+    if not data:
+        return QImage()
+    img = QImage.fromData(data)
+    if img.isNull() or width <= 0 or height <= 0:
+        return img
+    return img.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+
+class _ThumbnailTask(QRunnable):
+    """Ein Dekodier-Auftrag; meldet das Ergebnis über den Loader zurück.
+
+    Mit preview=True läuft er zweistufig: erst Festplatten-Cache bzw. EXIF-Vorschau
+    (schnell, hohe Priorität), danach stellt er den vollständigen Decode mit der
+    ursprünglichen Priorität hinten an.
+    """
+
+    def __init__(self, loader: 'ThumbnailLoader', path: str, size: tuple, warm_metadata: bool,
+                 generation: int, priority: int = 0, preview: bool = False, prefetch: bool = False):
+        super().__init__()
+        self._loader = loader
+        self._path = path
+        self._size = size
+        self._warm_metadata = warm_metadata
+        self._generation = generation
+        self._priority = priority
+        self._preview = preview
+        self._prefetch = prefetch
+        self._checked_cache = False
+
+    def run(self):
+        width, height = self._size
+        if self._prefetch and (self._path, self._size) not in self._loader._prefetch_keys:
+            return  # Vorab-Laden verworfen oder inzwischen als reguläre Anfrage eingestellt
+        if self._warm_metadata:
+            # Metadaten-LRU vorwärmen, damit der GUI-Thread beim Zeichnen nicht liest
+            try:
+                from utils_exif import read_metadata
+                read_metadata(self._path)
+            except Exception:
+                pass
+
+        if self._preview:
+            try:
+                image = load_cached_thumbnail(self._path, width, height)
+                if not image.isNull():
+                    self._loader._taskFinished.emit(self._path, self._size, image)
+                    return
+                preview = load_exif_preview(self._path, width, height)
+                if not preview.isNull():
+                    self._loader._previewFinished.emit(self._path, self._size, preview)
+            except Exception as e:
+                self._loader._log.warning("thumbnail_preview_failed", extra={"event": "thumbnail_preview_failed", "path": self._path, "error": str(e)})
+            self._loader._resubmit(self._path, self._size, self._generation, self._priority)
+            return
+
+        image = QImage()
+        try:
+            # Nach der Vorschau-Stufe ist der Festplatten-Cache bereits geprüft
+            if self._checked_cache:
+                image = _decode_and_store(self._path, width, height)
+            else:
+                image = load_thumbnail(self._path, width, height)
+        except Exception as e:
+            self._loader._log.warning("thumbnail_decode_failed", extra={"event": "thumbnail_decode_failed", "path": self._path, "error": str(e)})
+        # Signal eines GUI-Objekts aus dem Pool-Thread -> queued connection
+        self._loader._taskFinished.emit(self._path, self._size, image)
+
+
+class ThumbnailLoader(QObject):
+    """Verteilt Thumbnail-Decodes auf einen eigenen QThreadPool.
+
+    Ergebnisse kommen als QImage per thumbnailReady im GUI-Thread an; erst dort
+    wird daraus ein QPixmap. Bereits erzeugte Thumbnails kommen aus dem
+    Festplatten-Cache. Mit preview=True wird vorab das eingebettete EXIF-Vorschaubild
+    per previewReady geliefert (erster Paint in Millisekunden). Doppelte Anfragen für
+    (Pfad, Größe) werden zusammengefasst, cancel_pending() verwirft noch nicht
+    gestartete Aufträge. Anfragen mit prefetch=True laufen mit niedriger Priorität,
+    lassen sich gezielt per cancel_prefetch() verwerfen und werden von einer
+    regulären Anfrage für dasselbe Bild abgelöst.
+    """
+
+    thumbnailReady = Signal(str, object, QImage)  # (pfad, (breite, höhe), bild)
+    previewReady = Signal(str, object, QImage)  # (pfad, (breite, höhe), vorläufiges bild)
+    _taskFinished = Signal(str, object, QImage)
+    _previewFinished = Signal(str, object, QImage)
+
+    _PREVIEW_PRIORITY_BOOST = 1 << 24  # Vorschauen vor allen vollständigen Decodes
+
+    def __init__(self, parent=None, max_workers: int = 0):
+        super().__init__(parent)
+        self._log = get_logger('app', {"module": "qtui.thumbnail_loader"})
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_workers or _default_thumbnail_workers())
+        self._inflight: set = set()  # {(pfad, (breite, höhe))}
+        self._prefetch_keys: set = set()  # Teilmenge von _inflight: nur vorab angefordert
+        self._generation = 0  # Wird von cancel_pending erhöht; veraltete Aufträge stellen nichts nach
+        self._taskFinished.connect(self._on_task_finished)
+        self._previewFinished.connect(self._on_preview_finished)
+
+    def request(self, path: str, size: tuple, *, priority: int = 0, warm_metadata: bool = False,
+                preview: bool = False, prefetch: bool = False) -> bool:
+        """Stellt einen Decode-Auftrag ein; False wenn bereits in Arbeit"""
+        key = (path, tuple(size))
+        if not path:
+            return False
+        if prefetch:
+            if key in self._inflight:
+                return False
+            self._inflight.add(key)
+            self._prefetch_keys.add(key)
+            self._pool.start(_ThumbnailTask(self, path, key[1], warm_metadata, self._generation,
+                                            priority, prefetch=True), priority)
+            return True
+        if key in self._inflight and key not in self._prefetch_keys:
+            return False
+        # Ein wartendes Vorab-Laden wird übersprungen und durch diesen Auftrag ersetzt
+        self._prefetch_keys.discard(key)
+        self._inflight.add(key)
+        task = _ThumbnailTask(self, path, key[1], warm_metadata, self._generation, priority, preview)
+        self._pool.start(task, priority + self._PREVIEW_PRIORITY_BOOST if preview else priority)
+        return True
+
+    def is_pending(self, path: str, size: tuple) -> bool:
+        return (path, tuple(size)) in self._inflight
+
+    def cancel_pending(self):
+        """Verwirft wartende Aufträge (z.B. bei Seitenwechsel); laufende enden normal"""
+        self._generation += 1
+        self._pool.clear()
+        self._inflight.clear()
+        self._prefetch_keys.clear()
+
+    def cancel_prefetch(self):
+        """Verwirft nur die noch nicht gestarteten Vorab-Ladeaufträge"""
+        self._inflight.difference_update(self._prefetch_keys)
+        self._prefetch_keys.clear()
+
+    def shutdown(self, timeout_ms: int = 2000):
+        """Bricht wartende Aufträge ab und wartet auf laufende (beim Beenden)"""
+        self.cancel_pending()
+        self._pool.waitForDone(timeout_ms)
+
+    def _resubmit(self, path: str, size: tuple, generation: int, priority: int):
+        # Aus dem Pool-Thread: vollständigen Decode nachstellen, sofern nicht abgebrochen
+        if generation != self._generation:
+            return
+        task = _ThumbnailTask(self, path, size, False, generation, priority)
+        task._checked_cache = True
+        self._pool.start(task, priority)
+
+    def _on_task_finished(self, path: str, size: tuple, image: QImage):
+        self._inflight.discard((path, size))
+        self._prefetch_keys.discard((path, size))
+        self.thumbnailReady.emit(path, size, image)
+
+    def _on_preview_finished(self, path: str, size: tuple, image: QImage):
+        if (path, size) in self._inflight:
+            self.previewReady.emit(path, size, image)
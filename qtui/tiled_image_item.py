@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Tiled Image Item
+QGraphicsItem mit Detailstufen für sehr große Bilder.
+
+Statt bei jedem Frame das ganze Original zu skalieren, wird je Zoomstufe eine
+Pyramidenstufe gewählt (Stufe n = Original / 2^n) und nur deren sichtbarer
+Ausschnitt gezeichnet – direkt aus dem Stufen-Pixmap, ohne Kachelkopien.
+Die verkleinerten Stufen entstehen bei Bedarf und liegen in einem eigenen, kleinen
+Cache (Setting 'performance_tiled_level_cache_mb'), damit Schwenken über große
+Bilder die Galerie-Thumbnails nicht verdrängt. Das Original hält der Bild-Service.
+Nur im GUI-Thread verwenden (QPixmap).
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+from typing import Optional
+
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QPixmap
+from PySide6.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
+from .pixmap_cache import PixmapCache
+
+_MIN_LEVEL_EDGE = 256  # Gröbste Stufe: längste Kante nicht kleiner als das
+_DEFAULT_LEVEL_CACHE_MB = 96
+
+_serials = itertools.count(1)
+_level_cache: Optional[PixmapCache] = None
+
+
+def _level_cache_limit() -> int:
+    try:
+        from .settings_manager import get_settings_manager
+        value = int(get_settings_manager().get('performance_tiled_level_cache_mb', _DEFAULT_LEVEL_CACHE_MB))
+    except Exception:
+        value = _DEFAULT_LEVEL_CACHE_MB
+    return max(0, value) * 1024 * 1024
+
+
+def apply_level_cache_settings():
+    """Übernimmt ein geändertes Budget, ohne den Cache zu leeren"""
+    if _level_cache is not None:
+        _level_cache.set_limit(_level_cache_limit())
+
+
+def get_level_cache() -> PixmapCache:
+    """Cache der verkleinerten Stufen, getrennt vom gemeinsamen Thumbnail-Cache"""
+    global _level_cache
+    if _level_cache is None:
+        _level_cache = PixmapCache(_level_cache_limit())
+    return _level_cache
+
+
+def use_tiles_for(pix: QPixmap, min_megapixels: float) -> bool:
+    """True, wenn das Bild groß genug für die Kachel-Darstellung ist"""
+    if pix is None or pix.isNull() or min_megapixels <= 0:
+        return False
+    return pix.width() * pix.height() >= min_megapixels * 1_000_000
+
+
+class TiledImageItem(QGraphicsItem):
+    """Zeichnet den sichtbaren Ausschnitt eines Pixmaps in der zur Zoomstufe passenden Auflösung.
+
+    Verhält sich nach außen wie ein QGraphicsPixmapItem (pixmap/setPixmap,
+    setTransformationMode, boundingRect in Originalpixeln), damit Zoom,
+    fit_to_view und die Zeichenwerkzeuge unverändert bleiben.
+    """
+
+    def __init__(self, pix: QPixmap, parent=None):
+        super().__init__(parent)
+        self._serial = next(_serials)
+        self._pix = QPixmap()
+        self._sizes = []  # (breite, höhe) je Stufe
+        self._uncached = {}  # Stufen, die größer als das Cache-Budget sind
+        self._mode = Qt.SmoothTransformation
+        # exposedRect wird nur mit dieser Option befüllt
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        self.setPixmap(pix)
+
+    # ---- QGraphicsPixmapItem-kompatibel ----------------------------
+    def pixmap(self) -> QPixmap:
+        return self._pix
+
+    def setPixmap(self, pix: QPixmap):
+        self.prepareGeometryChange()
+        self.release()
+        self._serial = next(_serials)  # alte Kacheln nie wieder verwenden
+        self._pix = pix if pix is not None else QPixmap()
+        self._uncached = {}
+        w, h = self._pix.width(), self._pix.height()
+        self._sizes = [(w, h)]
+        while max(w, h) // 2 >= _MIN_LEVEL_EDGE:
+            w, h = max(1, (w + 1) // 2), max(1, (h + 1) // 2)
+            self._sizes.append((w, h))
+        self.update()
+
+    def setTransformationMode(self, mode):
+        self._mode = mode
+
+    def release(self):
+        """Gibt die Stufen dieses Bildes frei"""
+        serial = self._serial
+        self._uncached = {}
+        get_level_cache().discard_where(lambda k: isinstance(k, tuple) and len(k) > 1 and k[1] == serial)
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(0, 0, self._pix.width(), self._pix.height())
+
+    # ---- Zeichnen --------------------------------------------------
+    def paint(self, painter, option, widget=None):
+        if self._pix.isNull():
+            return
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        level = self._level_for(lod)
+        level_w, level_h = self._sizes[level]
+        sx = self._pix.width() / level_w  # Stufenpixel -> Originalpixel
+        sy = self._pix.height() / level_h
+        exposed = option.exposedRect.intersected(self.boundingRect())
+        if exposed.isEmpty():
+            return
+        # Sichtbaren Ausschnitt auf ganze Stufenpixel erweitern (keine Nähte beim Schwenken)
+        left = math.floor(exposed.left() / sx)
+        top = math.floor(exposed.top() / sy)
+        right = min(level_w, math.ceil(exposed.right() / sx))
+        bottom = min(level_h, math.ceil(exposed.bottom() / sy))
+        source = QRectF(left, top, right - left, bottom - top)
+        target = QRectF(left * sx, top * sy, source.width() * sx, source.height() * sy)
+        painter.setRenderHint(painter.RenderHint.SmoothPixmapTransform, self._mode == Qt.SmoothTransformation)
+        painter.drawPixmap(target, self._level_pixmap(level), source)
+
+    def _level_for(self, lod: float) -> int:
+        # Stufe n zeigt Original / 2^n; gewählt wird die gröbste, die noch nicht hochskaliert wird
+        coarsest = len(self._sizes) - 1
+        if lod <= 0:
+            return coarsest
+        return max(0, min(coarsest, int(math.floor(math.log2(1.0 / lod))))) if lod < 1.0 else 0
+
+    def _level_pixmap(self, level: int) -> QPixmap:
+        """Ganzes Bild in Stufe level, aus der nächstfeineren halbiert (Ergebnis gecacht)"""
+        if level <= 0:
+            return self._pix
+        cache = get_level_cache()
+        key = ('tile_level', self._serial, level)
+        pix = cache.get(key)
+        if pix is None:
+            pix = self._uncached.get(level)
+        if pix is None:
+            w, h = self._sizes[level]
+            pix = self._level_pixmap(level - 1).scaled(w, h, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            if not cache.put(key, pix):
+                self._uncached[level] = pix  # Sonst bei jedem Frame neu skaliert
+        return pix
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: EXIF-UserComment lesen – Header-Parser vs. PIL-Pfad.
+
+Aufruf:
+    python scripts/bench_exif_reader.py [ORDNER] [--repeat N] [--generate N]
+
+Ohne ORDNER werden N Test-JPEGs (Standard 200) mit JSON-Metadaten in einem
+temporären Ordner erzeugt. Beide Leser müssen identische Ergebnisse liefern.
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import utils_exif  # noqa: E402
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg'}
+
+
+def _generate_samples(folder: str, count: int) -> None:
+    from PIL import Image
+
+    for i in range(count):
+        path = os.path.join(folder, f"sample_{i:05d}.jpg")
+        Image.new('RGB', (2000, 1500), (i % 255, 80, 160)).save(path, quality=90)
+        utils_exif.write_metadata(path, {
+            "ocr": {"tag": f"K{i % 40:03d}"},
+            "evaluation": {"categories": ["Pitting"], "quality": "Gut", "gene": i % 7 == 0},
+            "use_image": True,
+        })
+
+
+def _collect(folder: str) -> list[str]:
+    return sorted(
+        os.path.join(folder, f) for f in os.listdir(folder)
+        if os.path.splitext(f.lower())[1] in IMAGE_EXTENSIONS
+    )
+
+
+def _pil_reader(path: str):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    return utils_exif._get_exif_usercomment_pil(path)
+
+
+def _time(reader, paths: list[str], repeat: int) -> tuple[float, list]:
+    best = float('inf')
+    results: list = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [reader(p) for p in paths]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("folder", nargs="?", help="Bildordner (Standard: generierte Testbilder)")
+    parser.add_argument("--repeat", type=int, default=3, help="Wiederholungen, bester Lauf zählt")
+    parser.add_argument("--generate", type=int, default=200, help="Anzahl Testbilder ohne ORDNER")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = args.folder
+        if not folder:
+            folder = tmp
+            _generate_samples(folder, args.generate)
+        paths = _collect(folder)
+        if not paths:
+            raise SystemExit(f"Keine JPEGs gefunden: {folder}")
+
+        t_pil, r_pil = _time(_pil_reader, paths, args.repeat)
+        t_hdr, r_hdr = _time(utils_exif.get_exif_usercomment, paths, args.repeat)
+
+        mismatches = sum(1 for a, b in zip(r_pil, r_hdr) if a != b)
+        n = len(paths)
+        print(f"Bilder:          {n}")
+        print(f"PIL getexif:     {t_pil * 1000:9.1f} ms  ({t_pil / n * 1e6:8.1f} µs/Bild)")
+        print(f"Header-Parser:   {t_hdr * 1000:9.1f} ms  ({t_hdr / n * 1e6:8.1f} µs/Bild)")
+        print(f"Faktor:          {t_pil / t_hdr if t_hdr else float('inf'):9.1f}x")
+        print(f"Abweichungen:    {mismatches}")
+        if mismatches:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
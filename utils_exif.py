@@ -5,8 +5,14 @@ EXIF-Daten-Verwaltung (JSON in UserComment)
 KRITISCH: Kompatibilität mit bestehenden Bildern wahren!
 """
 
+import copy
 import json
 import os
+import shutil
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
 from typing import Any, Optional, Sequence
 
 from PIL import Image, ExifTags
@@ -15,51 +21,277 @@ from utils_logging import write_detailed_log, get_logger
 _log = get_logger('app', {"module": "utils_exif"})
 
 
+# -------------------- EXIF-Header direkt lesen/schreiben (JPEG) --------------------
+_EXIF_HEADER = b'Exif\x00\x00'
+_USERCOMMENT_TAG_ID = 0x9286
+_EXIF_IFD_POINTER = 0x8769
+_THUMBNAIL_OFFSET_TAG = 0x0201  # JPEGInterchangeFormat (IFD1)
+_THUMBNAIL_LENGTH_TAG = 0x0202  # JPEGInterchangeFormatLength (IFD1)
+_HEADER_READ_BUFFER = 128 * 1024
+_HEADER_PREFIX = 16 * 1024  # Erster Lesezugriff; reicht für APP0 + unser APP1 fast immer
+_MAX_APP1_PAYLOAD = 0xFFFF - 2
+# Bytes pro Wert je TIFF-Feldtyp (BYTE, ASCII, SHORT, LONG, RATIONAL, ...)
+_TIFF_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 6: 1, 7: 1, 8: 2, 9: 4, 10: 8, 11: 4, 12: 8, 13: 4}
+
+
+def _find_jpeg_exif_segment(fh, prefix: bytes = b''):
+    """Sucht das APP1/Exif-Segment im JPEG-Header (ohne Pixeldaten zu lesen).
+
+    prefix ist ein bereits gelesener Dateianfang; was darin liegt, wird ohne
+    weiteren Dateizugriff geparst, nur darüber hinaus wird nachgelesen.
+
+    Returns:
+        None, wenn keine gültige JPEG-Struktur erkannt wurde, sonst
+        (tiff_bytes | None, seg_start | None, seg_end | None, insert_pos).
+        insert_pos ist die Stelle für ein neues APP1 (hinter SOI bzw. JFIF-APP0).
+    """
+    def read_at(offset: int, length: int) -> bytes:
+        if offset + length <= len(prefix):
+            return prefix[offset:offset + length]
+        fh.seek(offset)
+        return fh.read(length)
+
+    if read_at(0, 2) != b'\xff\xd8':
+        return None
+    pos = 2
+    insert_pos = 2
+    while True:
+        head = read_at(pos, 4)
+        if len(head) < 2 or head[0] != 0xFF:
+            return None
+        marker = head[1]
+        if marker == 0xFF:
+            # Füllbyte vor dem eigentlichen Marker
+            pos += 1
+            continue
+        if marker in (0xD9, 0xDA):
+            # EOI/SOS: Header zu Ende, kein Exif-Segment vorhanden
+            return None, None, None, insert_pos
+        if 0xD0 <= marker <= 0xD7 or marker == 0x01:
+            pos += 2
+            continue
+        if len(head) < 4:
+            return None
+        seg_len = struct.unpack('>H', head[2:4])[0]
+        if seg_len < 2:
+            return None
+        seg_end = pos + 2 + seg_len
+        if marker == 0xE1:
+            payload = read_at(pos + 4, seg_len - 2)
+            if payload.startswith(_EXIF_HEADER):
+                return payload[len(_EXIF_HEADER):], pos, seg_end, insert_pos
+        elif marker == 0xE0 and pos == insert_pos:
+            # JFIF/JFXX-APP0 muss vorne bleiben
+            insert_pos = seg_end
+        pos = seg_end
+
+
+def _tiff_endian(tiff: bytes) -> Optional[str]:
+    """Liefert das struct-Byteorder-Präfix eines TIFF-Blocks oder None."""
+    if len(tiff) < 8:
+        return None
+    if tiff[:2] == b'II':
+        endian = '<'
+    elif tiff[:2] == b'MM':
+        endian = '>'
+    else:
+        return None
+    if struct.unpack(endian + 'H', tiff[2:4])[0] != 42:
+        return None
+    return endian
+
+
+def _read_ifd(tiff: bytes, endian: str, offset: int):
+    """Liest einen IFD: ([(tag, typ, anzahl, roh4)], next_ifd_offset) oder None."""
+    if offset < 8 or offset + 2 > len(tiff):
+        return None
+    count = struct.unpack(endian + 'H', tiff[offset:offset + 2])[0]
+    end = offset + 2 + count * 12
+    if end + 4 > len(tiff):
+        return None
+    entries = []
+    for i in range(count):
+        base = offset + 2 + i * 12
+        tag, typ, num = struct.unpack(endian + 'HHI', tiff[base:base + 8])
+        entries.append((tag, typ, num, tiff[base + 8:base + 12]))
+    next_ifd = struct.unpack(endian + 'I', tiff[end:end + 4])[0]
+    return entries, next_ifd
+
+
+def _ifd_value_span(endian: str, entry):
+    """(offset, länge) eines ausgelagerten IFD-Werts oder None bei Inline-Werten."""
+    _tag, typ, num, raw = entry
+    size = _TIFF_TYPE_SIZES.get(typ, 1) * num
+    if size <= 4:
+        return None
+    return struct.unpack(endian + 'I', raw)[0], size
+
+
+def _usercomment_from_tiff(tiff: bytes) -> Optional[bytes]:
+    """Springt im TIFF-Block direkt zu Tag 0x9286 (erst IFD0, dann ExifIFD)."""
+    endian = _tiff_endian(tiff)
+    if endian is None:
+        return None
+    parsed = _read_ifd(tiff, endian, struct.unpack(endian + 'I', tiff[4:8])[0])
+    if parsed is None:
+        return None
+    entries = parsed[0]
+    entry = next((e for e in entries if e[0] == _USERCOMMENT_TAG_ID), None)
+    if entry is None:
+        # Kamera-Standardort: UserComment im Exif-Sub-IFD
+        pointer = next((e for e in entries if e[0] == _EXIF_IFD_POINTER), None)
+        if pointer is not None:
+            sub = _read_ifd(tiff, endian, struct.unpack(endian + 'I', pointer[3])[0])
+            if sub is not None:
+                entry = next((e for e in sub[0] if e[0] == _USERCOMMENT_TAG_ID), None)
+    if entry is None:
+        return None
+    span = _ifd_value_span(endian, entry)
+    if span is None:
+        return entry[3][:entry[2]]
+    offset, size = span
+    return tiff[offset:offset + size]
+
+
+def _ifd_int_value(endian: str, entry) -> Optional[int]:
+    """Inline-Wert eines SHORT/LONG-Eintrags oder None."""
+    _tag, typ, num, raw = entry
+    if num < 1:
+        return None
+    if typ == 3:
+        return struct.unpack(endian + 'H', raw[:2])[0]
+    if typ == 4:
+        return struct.unpack(endian + 'I', raw)[0]
+    return None
+
+
+def _thumbnail_from_tiff(tiff: bytes) -> Optional[bytes]:
+    """Eingebettetes JPEG-Vorschaubild aus IFD1 (Tags 0x0201/0x0202) oder None."""
+    endian = _tiff_endian(tiff)
+    if endian is None:
+        return None
+    ifd0 = _read_ifd(tiff, endian, struct.unpack(endian + 'I', tiff[4:8])[0])
+    if ifd0 is None or not ifd0[1]:
+        return None
+    ifd1 = _read_ifd(tiff, endian, ifd0[1])
+    if ifd1 is None:
+        return None
+    offset = length = None
+    for entry in ifd1[0]:
+        if entry[0] == _THUMBNAIL_OFFSET_TAG:
+            offset = _ifd_int_value(endian, entry)
+        elif entry[0] == _THUMBNAIL_LENGTH_TAG:
+            length = _ifd_int_value(endian, entry)
+    if not offset or not length or offset + length > len(tiff):
+        return None
+    data = tiff[offset:offset + length]
+    return data if data.startswith(b'\xff\xd8') else None
+
+
+def get_exif_thumbnail(image_path) -> Optional[bytes]:
+    """Liefert das in JPEGs eingebettete EXIF-Vorschaubild (JPEG-Bytes) oder None.
+
+    Liest nur den Dateikopf (APP1), die Pixeldaten des Bildes bleiben unberührt.
+    """
+    try:
+        with open(image_path, 'rb', buffering=_HEADER_READ_BUFFER) as fh:
+            found = _find_jpeg_exif_segment(fh)
+        if not found or not found[0]:
+            return None
+        return _thumbnail_from_tiff(found[0])
+    except Exception:
+        return None
+
+
+def _read_usercomment_header(image_path):
+    """Liest den rohen UserComment nur aus dem JPEG-Header (keine Pixeldaten).
+
+    Returns:
+        (handled, raw_bytes | None). handled=False bedeutet: kein JPEG bzw.
+        nicht parsebar – der Aufrufer soll auf PIL zurückfallen.
+    """
+    # Ein einziger ungepufferter Read deckt den Header fast immer ab;
+    # große Kamera-Segmente (Thumbnail, MakerNotes) werden nachgelesen
+    with open(image_path, 'rb', buffering=0) as fh:
+        found = _find_jpeg_exif_segment(fh, fh.read(_HEADER_PREFIX))
+    if found is None:
+        return False, None
+    tiff = found[0]
+    if not tiff:
+        return True, None
+    if _tiff_endian(tiff) is None:
+        return False, None
+    return True, _usercomment_from_tiff(tiff)
+
+
+def _decode_usercomment(user_comment, image_path):
+    """Entfernt den Zeichensatz-Prefix des UserComment und parst das JSON."""
+    try:
+        # Behandle sowohl String als auch Bytes mit Prefixen
+        if isinstance(user_comment, bytes):
+            # Entferne mögliche Prefixe
+            prefixes = [b'ASCII\x00\x00\x00', b'UNICODE\x00', b'JIS\x00\x00\x00', b'\x00\x00\x00\x00']
+            data = user_comment
+            for prefix in prefixes:
+                if data.startswith(prefix):
+                    data = data[len(prefix):]
+                    break
+            data = data.decode('utf-8', errors='ignore')
+        else:
+            data = str(user_comment)
+
+        # Kamera-Kommentare (z.B. "DJI camera") sind keine Metadaten: still ignorieren
+        if not data.lstrip(' \t\r\n\x00\ufeff').startswith('{'):
+            return None
+        # Kein Erfolgs-Log: läuft pro Bild bei jedem Ordnerscan
+        return json.loads(data)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        write_detailed_log("warning", "EXIF-Daten konnten nicht als JSON geparst werden", f"Bild: {image_path}", e)
+        return None
+
+
+def _get_exif_usercomment_pil(image_path):
+    """Liest den UserComment über PIL (Fallback für Nicht-JPEG-Formate)."""
+    with Image.open(image_path) as img:
+        exif = img.getexif()
+        if exif is None:
+            write_detailed_log("info", "Keine EXIF-Daten gefunden", f"Bild: {image_path}")
+            return None
+
+        # Finde den UserComment-Tag
+        for tag_id in exif:
+            tag = ExifTags.TAGS.get(tag_id, tag_id)
+            if tag == 'UserComment':
+                user_comment = exif.get(tag_id)
+                if user_comment:
+                    return _decode_usercomment(user_comment, image_path)
+        write_detailed_log("info", "Kein UserComment-Tag in EXIF-Daten gefunden", f"Bild: {image_path}")
+        return None
+
+
 def get_exif_usercomment(image_path):
-    """Liest das EXIF UserComment-Feld aus einem Bild"""
+    """Liest das EXIF UserComment-Feld aus einem Bild.
+
+    JPEGs werden nur im Header geparst; andere Formate laufen über PIL.
+    """
     try:
         # Prüfe ob Datei existiert und nicht leer ist
-        if not os.path.exists(image_path):
+        try:
+            size = os.stat(image_path).st_size
+        except OSError:
             return None
-        if os.path.getsize(image_path) == 0:
+        if size == 0:
             # Stille Behandlung von 0-Byte-Dateien (kein Log, kein Print)
             return None
-        
-        with Image.open(image_path) as img:
-            exif = img.getexif()
-            if exif is None:
-                write_detailed_log("info", "Keine EXIF-Daten gefunden", f"Bild: {image_path}")
-                return None
-            
-            # Finde den UserComment-Tag
-            for tag_id in exif:
-                tag = ExifTags.TAGS.get(tag_id, tag_id)
-                if tag == 'UserComment':
-                    user_comment = exif.get(tag_id)
-                    if user_comment:
-                        try:
-                            # Behandle sowohl String als auch Bytes mit Prefixen
-                            if isinstance(user_comment, bytes):
-                                # Entferne mögliche Prefixe
-                                prefixes = [b'ASCII\x00\x00\x00', b'UNICODE\x00', b'JIS\x00\x00\x00', b'\x00\x00\x00\x00']
-                                data = user_comment
-                                for prefix in prefixes:
-                                    if data.startswith(prefix):
-                                        data = data[len(prefix):]
-                                        break
-                                data = data.decode('utf-8', errors='ignore')
-                            else:
-                                data = str(user_comment)
-                            
-                            # Versuche JSON zu parsen
-                            parsed_data = json.loads(data)
-                            write_detailed_log("info", "EXIF-Daten erfolgreich gelesen", f"Bild: {image_path}, Größe: {len(str(parsed_data))} Zeichen")
-                            return parsed_data
-                        except (json.JSONDecodeError, UnicodeDecodeError) as e:
-                            write_detailed_log("warning", "EXIF-Daten konnten nicht als JSON geparst werden", f"Bild: {image_path}", e)
-                            return None
-            write_detailed_log("info", "Kein UserComment-Tag in EXIF-Daten gefunden", f"Bild: {image_path}")
-            return None
+
+        handled, user_comment = _read_usercomment_header(image_path)
+        if not handled:
+            return _get_exif_usercomment_pil(image_path)
+        # Leere Kamera-Kommentare (nur Prefix + Leerzeichen) gelten als nicht vorhanden
+        if user_comment and user_comment.strip(b' \x00') not in (b'', b'ASCII', b'UNICODE', b'JIS'):
+            return _decode_usercomment(user_comment, image_path)
+        write_detailed_log("info", "Kein UserComment-Tag in EXIF-Daten gefunden", f"Bild: {image_path}")
+        return None
     except Exception as e:
         # Nur bei kritischen Fehlern loggen (nicht bei 0-Byte-Dateien oder ungültigen Bildern)
         error_msg = str(e)
@@ -68,19 +300,136 @@ def get_exif_usercomment(image_path):
         return None
 
 
+def _tiff_with_usercomment(tiff: Optional[bytes], user_comment: bytes) -> Optional[bytes]:
+    """Erzeugt einen TIFF-Block mit neuem UserComment im IFD0.
+
+    Der bestehende Block bleibt Byte für Byte erhalten (ExifIFD, GPS, IFD1-Thumbnail,
+    MakerNotes). Ein neuer IFD0 samt UserComment wird angehängt und der Header darauf
+    umgebogen; alle übrigen Offsets bleiben dadurch gültig. Einen von uns früher
+    angehängten Rest (IFD0 + UserComment am Blockende) schneiden wir vorher ab,
+    damit die Datei bei wiederholtem Speichern nicht wächst.
+    """
+    if not tiff:
+        endian = '<'
+        base = b'II*\x00' + struct.pack('<I', 8)
+        entries, next_ifd = [], 0
+    else:
+        endian = _tiff_endian(tiff)
+        if endian is None:
+            return None
+        ifd0_offset = struct.unpack(endian + 'I', tiff[4:8])[0]
+        parsed = _read_ifd(tiff, endian, ifd0_offset)
+        if parsed is None:
+            return None
+        entries, next_ifd = parsed
+        base = tiff
+        old = next((e for e in entries if e[0] == _USERCOMMENT_TAG_ID), None)
+        span = _ifd_value_span(endian, old) if old else None
+        if span:
+            uc_offset, uc_len = span
+            uc_end = uc_offset + uc_len + (uc_len & 1)
+            ifd_len = 2 + 12 * len(entries) + 4
+            if ifd0_offset + ifd_len == uc_offset and uc_end >= len(tiff) and next_ifd < ifd0_offset:
+                # Eigenes Layout vom letzten Speichern: IFD0 + Wert am Ende verwerfen
+                base = tiff[:ifd0_offset]
+            elif uc_end >= len(tiff) and uc_offset > ifd0_offset and uc_offset > next_ifd:
+                # Alter UserComment liegt am Blockende (z.B. von PIL geschrieben)
+                base = tiff[:uc_offset]
+
+    if len(base) & 1:
+        base += b'\x00'
+    entries = [e for e in entries if e[0] != _USERCOMMENT_TAG_ID]
+    ifd_offset = len(base)
+    ifd_len = 2 + 12 * (len(entries) + 1) + 4
+    value_offset = ifd_offset + ifd_len
+    entries.append((_USERCOMMENT_TAG_ID, 7, len(user_comment), struct.pack(endian + 'I', value_offset)))
+    entries.sort(key=lambda e: e[0])
+
+    out = bytearray(base)
+    out[4:8] = struct.pack(endian + 'I', ifd_offset)
+    out += struct.pack(endian + 'H', len(entries))
+    for tag, typ, num, raw in entries:
+        out += struct.pack(endian + 'HHI', tag, typ, num) + raw
+    out += struct.pack(endian + 'I', next_ifd)
+    out += user_comment
+    if len(out) & 1:
+        out += b'\x00'
+    return bytes(out)
+
+
+def _save_usercomment_jpeg_lossless(image_path, user_comment: bytes) -> bool:
+    """Ersetzt nur das APP1/Exif-Segment eines JPEG, Scan-Daten werden 1:1 kopiert.
+
+    Schreibt in eine Temp-Datei im selben Ordner und tauscht sie atomar per
+    os.replace aus. Liefert False, wenn die Datei kein (verarbeitbares) JPEG ist
+    oder der EXIF-Block zu groß würde – dann greift der PIL-Pfad.
+    """
+    tmp_path = None
+    try:
+        with open(image_path, 'rb') as src:
+            found = _find_jpeg_exif_segment(src)
+            if found is None:
+                return False
+            tiff, seg_start, seg_end, insert_pos = found
+            new_tiff = _tiff_with_usercomment(tiff, user_comment)
+            if new_tiff is None:
+                return False
+            payload = _EXIF_HEADER + new_tiff
+            if len(payload) > _MAX_APP1_PAYLOAD:
+                return False
+            segment = b'\xff\xe1' + struct.pack('>H', len(payload) + 2) + payload
+            if seg_start is None:
+                head_end, tail_start = insert_pos, insert_pos
+            else:
+                head_end, tail_start = seg_start, seg_end
+
+            directory = os.path.dirname(os.path.abspath(image_path))
+            fd, tmp_path = tempfile.mkstemp(prefix='.exif_', suffix='.tmp', dir=directory)
+            with os.fdopen(fd, 'wb') as dst:
+                src.seek(0)
+                dst.write(src.read(head_end))
+                dst.write(segment)
+                src.seek(tail_start)
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+        try:
+            shutil.copymode(image_path, tmp_path)
+        except Exception:
+            pass
+        os.replace(tmp_path, image_path)
+        tmp_path = None
+        return True
+    except Exception as e:
+        write_detailed_log("warning", "Verlustfreies EXIF-Schreiben fehlgeschlagen, nutze PIL", f"Bild: {image_path}", e)
+        return False
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except Exception:
+                pass
+
+
 def save_exif_usercomment(image_path, json_data):
-    """Speichert JSON-Daten im EXIF UserComment-Feld"""
+    """Speichert JSON-Daten im EXIF UserComment-Feld.
+
+    JPEGs werden verlustfrei gepatcht (nur das Exif-Segment wird ersetzt),
+    alle anderen Formate laufen über PIL.
+    """
     try:
+        # Konvertiere JSON zu Bytes mit Standard-Prefix
+        json_string = json.dumps(json_data, ensure_ascii=False)
+        json_bytes = json_string.encode('utf-8')
+        user_comment = b'ASCII\x00\x00\x00' + json_bytes
+
+        if _save_usercomment_jpeg_lossless(image_path, user_comment):
+            write_detailed_log("info", "EXIF-Daten erfolgreich gespeichert", f"Bild: {image_path}, Größe: {len(json_string)} Zeichen")
+            return True
+
         with Image.open(image_path) as img:
             exif = img.getexif()
             if exif is None:
                 exif = {}
             
-            # Konvertiere JSON zu Bytes mit Standard-Prefix
-            json_string = json.dumps(json_data, ensure_ascii=False)
-            json_bytes = json_string.encode('utf-8')
-            user_comment = b'ASCII\x00\x00\x00' + json_bytes
-            
             # Finde den UserComment-Tag-ID
             usercomment_tag_id = None
             for tag_id, tag_name in ExifTags.TAGS.items():
@@ -104,23 +453,163 @@ def save_exif_usercomment(image_path, json_data):
         return False
 
 
+# -------------------- Metadaten-Cache (prozessweit) --------------------
+_METADATA_CACHE_DEFAULT_SIZE = 5000
+_metadata_cache: "OrderedDict[str, tuple[int, int, dict]]" = OrderedDict()
+_metadata_cache_lock = threading.Lock()
+_metadata_cache_max: Optional[int] = None
+_metadata_cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "writes": 0}
+
+
+def _metadata_cache_key(image_path: str) -> str:
+    return os.path.normcase(os.path.abspath(image_path))
+
+
+def _metadata_cache_limit() -> int:
+    """Maximale Anzahl Einträge (Setting 'performance_metadata_cache_size')."""
+    global _metadata_cache_max
+    if _metadata_cache_max is None:
+        try:
+            from qtui.settings_manager import get_settings_manager
+            value = int(get_settings_manager().get('performance_metadata_cache_size', _METADATA_CACHE_DEFAULT_SIZE))
+        except Exception:
+            value = _METADATA_CACHE_DEFAULT_SIZE
+        _metadata_cache_max = max(0, value)
+    return _metadata_cache_max
+
+
+def _metadata_cache_store(key: str, mtime_ns: int, size: int, data: dict) -> None:
+    """Legt einen Eintrag ab (Aufrufer hält den Lock) und verdrängt LRU-Einträge."""
+    limit = _metadata_cache_limit()
+    if limit <= 0:
+        return
+    _metadata_cache[key] = (mtime_ns, size, data)
+    _metadata_cache.move_to_end(key)
+    while len(_metadata_cache) > limit:
+        _metadata_cache.popitem(last=False)
+        _metadata_cache_stats["evictions"] += 1
+
+
+def _metadata_index_for(image_path: str):
+    """Persistenter Ordner-Index (utils_metadata_index) oder None"""
+    try:
+        from utils_metadata_index import get_metadata_index
+        return get_metadata_index(os.path.dirname(os.path.abspath(image_path)))
+    except Exception:
+        return None
+
+
+def _metadata_index_store(image_path: str, st: os.stat_result, data: dict) -> None:
+    """Schreibt gelesene/geschriebene Metadaten samt abgeleiteten Feldern in den Index."""
+    index = _metadata_index_for(image_path)
+    if index is None:
+        return
+    try:
+        derived = {
+            'tag': _ocr_info_from_metadata(data).get('tag', ''),
+            'used': _used_flag_from_metadata(data),
+            'gene': _gene_flag_from_metadata(data),
+            'evaluation': _evaluation_from_metadata(data),
+            'cover': _cover_info_from_metadata(data),
+        }
+        index.put(os.path.basename(image_path), st.st_mtime_ns, st.st_size, data, derived)
+    except Exception:
+        pass
+
+
+def get_metadata_cache_stats() -> dict:
+    """Liefert Treffer/Fehlzugriffe/Verdrängungen des Metadaten-Caches."""
+    with _metadata_cache_lock:
+        stats = dict(_metadata_cache_stats)
+        stats["entries"] = len(_metadata_cache)
+        stats["max_entries"] = _metadata_cache_limit()
+    return stats
+
+
+def clear_metadata_cache(image_path: Optional[str] = None) -> None:
+    """Verwirft den Cache für ein Bild oder komplett."""
+    with _metadata_cache_lock:
+        if image_path:
+            _metadata_cache.pop(_metadata_cache_key(image_path), None)
+        else:
+            _metadata_cache.clear()
+
+
 # -------------------- Komfort-API für Metadaten --------------------
 def read_metadata(image_path: str) -> dict:
-    """Liest JSON-Metadaten aus EXIF UserComment. Liefert {} bei Fehlern/keinen Daten."""
+    """Liest JSON-Metadaten aus EXIF UserComment. Liefert {} bei Fehlern/keinen Daten.
+
+    Ergebnisse liegen in einem prozessweiten LRU-Cache, der über (mtime_ns, size)
+    validiert wird; Aufrufer erhalten immer eine eigene Kopie. Dahinter liegt der
+    persistente Ordner-Index (SQLite), erst danach wird das EXIF gelesen.
+    """
     try:
-        data = get_exif_usercomment(image_path)
-        return data if isinstance(data, dict) else {}
+        try:
+            st = os.stat(image_path)
+        except OSError:
+            return {}
+        key = _metadata_cache_key(image_path)
+        with _metadata_cache_lock:
+            entry = _metadata_cache.get(key)
+            if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                _metadata_cache.move_to_end(key)
+                _metadata_cache_stats["hits"] += 1
+                return copy.deepcopy(entry[2])
+            _metadata_cache_stats["misses"] += 1
+
+        data = None
+        index = _metadata_index_for(image_path)
+        if index is not None:
+            try:
+                data = index.get(os.path.basename(image_path), st.st_mtime_ns, st.st_size)
+            except Exception:
+                data = None
+        if data is None:
+            data = get_exif_usercomment(image_path)
+            data = data if isinstance(data, dict) else {}
+            _metadata_index_store(image_path, st, data)
+        with _metadata_cache_lock:
+            _metadata_cache_store(key, st.st_mtime_ns, st.st_size, copy.deepcopy(data))
+        return data
     except Exception as e:
         write_detailed_log("error", "read_metadata fehlgeschlagen", f"Bild: {image_path}", e)
         return {}
 
 
 def write_metadata(image_path: str, metadata: dict) -> bool:
-    """Schreibt vollständige Metadaten (DICT) in EXIF UserComment."""
+    """Schreibt vollständige Metadaten (DICT) in EXIF UserComment.
+    Der Metadaten-Cache wird dabei direkt mit dem geschriebenen Stand aktualisiert."""
     try:
         if not isinstance(metadata, dict):
             metadata = {}
+        key = _metadata_cache_key(image_path)
+        snapshot = copy.deepcopy(metadata)
+        try:
+            old_st = os.stat(image_path)
+        except OSError:
+            old_st = None
         ok = save_exif_usercomment(image_path, metadata)
+        # Write-through: Eintrag unter dem neuen (mtime_ns, size) ablegen. Ein paralleler
+        # Leser mit altem stat-Stand erzeugt höchstens einen Fehlzugriff, nie veraltete Daten.
+        with _metadata_cache_lock:
+            _metadata_cache.pop(key, None)
+            st = None
+            if ok:
+                try:
+                    st = os.stat(image_path)
+                    _metadata_cache_store(key, st.st_mtime_ns, st.st_size, snapshot)
+                    _metadata_cache_stats["writes"] += 1
+                except OSError:
+                    st = None
+        if st is not None:
+            _metadata_index_store(image_path, st, snapshot)
+            if old_st is not None:
+                # Nur der UserComment hat sich geändert: Thumbnails bleiben gültig
+                try:
+                    from utils_thumbnail_cache import rekey_thumbnails
+                    rekey_thumbnails(image_path, old_st, st)
+                except Exception:
+                    pass
         if ok:
             _log.info("exif_write", extra={"event": "exif_write", "path": image_path})
         return ok
@@ -142,16 +631,78 @@ def update_metadata(image_path: str, patch: dict) -> bool:
         return False
 
 
-def get_used_flag(image_path: str) -> bool:
-    """Gibt zurück, ob das Bild verwendet werden soll (use_image/used).
-    Standard: True wenn noch kein Eintrag vorhanden ist."""
-    md = read_metadata(image_path)
+class MetadataSnapshot:
+    """Einmal gelesene Metadaten eines Bildes mit günstigen Sichten.
+
+    Alle Eigenschaften (Tag, Verwenden, Bewertung, Gene, Cover, Zeichnungen)
+    werden aus demselben geparsten Dict abgeleitet – pro Bild genügt also ein
+    Dateizugriff, egal wie viele Werte eine Ansicht braucht.
+    """
+
+    __slots__ = ('path', 'data', '_views')
+
+    def __init__(self, path: str, data: Optional[dict] = None):
+        self.path = path
+        self.data = data if isinstance(data, dict) else {}
+        self._views: dict = {}
+
+    @classmethod
+    def load(cls, image_path: str) -> 'MetadataSnapshot':
+        return cls(image_path, read_metadata(image_path))
+
+    def _view(self, name: str, builder):
+        if name not in self._views:
+            try:
+                self._views[name] = builder(self.data)
+            except Exception:
+                self._views[name] = None
+        return self._views[name]
+
+    @property
+    def ocr_info(self) -> dict:
+        return dict(self._view('ocr', _ocr_info_from_metadata) or {})
+
+    @property
+    def tag(self) -> str:
+        tag = (self._view('ocr', _ocr_info_from_metadata) or {}).get('tag', '')
+        return tag if isinstance(tag, str) else ''
+
+    @property
+    def used(self) -> bool:
+        used = self._view('used', _used_flag_from_metadata)
+        return True if used is None else used
+
+    @property
+    def evaluation(self) -> dict:
+        return dict(self._view('evaluation', _evaluation_from_metadata) or {})
+
+    @property
+    def gene(self) -> bool:
+        return bool(self._view('gene', _gene_flag_from_metadata))
+
+    @property
+    def cover(self) -> dict:
+        cover = self._view('cover', _cover_info_from_metadata)
+        if cover is None:
+            return {'tag': '', 'description': '', 'defect_description': '', 'use': False}
+        return dict(cover)
+
+    @property
+    def drawings(self) -> list:
+        drawings = self.data.get('drawings')
+        return [dict(d) for d in drawings if isinstance(d, dict)] if isinstance(drawings, list) else []
+
+
+def load_metadata_snapshot(image_path: str) -> MetadataSnapshot:
+    """Liest die Metadaten eines Bildes einmalig und liefert einen MetadataSnapshot."""
+    return MetadataSnapshot.load(image_path)
+
+
+def _used_flag_from_metadata(md: dict) -> bool:
+    """Leitet das use_image-Flag aus bereits gelesenen Metadaten ab."""
     if not isinstance(md, dict):
         return True  # Standard: verwenden
     
-    # Prüfe ob überhaupt JSON-Daten vorhanden sind
-    has_any_data = bool(md.get('evaluation') or md.get('ocr_info') or md.get('use_image') is not None or md.get('used') is not None)
-    
     if isinstance(md.get('use_image'), bool):
         return md['use_image']
     if isinstance(md.get('used'), bool):
@@ -170,149 +721,169 @@ def get_used_flag(image_path: str) -> bool:
     return True
 
 
+def get_used_flag(image_path: str) -> bool:
+    """Gibt zurück, ob das Bild verwendet werden soll (use_image/used).
+    Standard: True wenn noch kein Eintrag vorhanden ist."""
+    return _used_flag_from_metadata(read_metadata(image_path))
+
+
+def _apply_used_flag(md: dict, used: bool) -> None:
+    """Setzt das use_image-Flag inkl. Kompatibilitätsfelder in 'md' (ohne Schreiben)."""
+    md["use_image"] = bool(used)
+    md["use_image_str"] = "ja" if used else "nein"
+    md["use_image_bool"] = bool(used)
+
+
 def set_used_flag(image_path: str, used: bool) -> bool:
     """Setzt das use_image-Flag im EXIF-JSON."""
-    patch = {
-        "use_image": bool(used),
-        "use_image_str": "ja" if used else "nein",
-        "use_image_bool": bool(used),
-    }
+    patch = {}
+    _apply_used_flag(patch, used)
     return update_metadata(image_path, patch)
 
 
+def _evaluation_from_metadata(md: dict) -> dict:
+    """Baut das Bewertungs-Dict inkl. gespiegelter Altfelder aus Metadaten."""
+    eval_obj = md.get('evaluation', {})
+    if isinstance(eval_obj, dict):
+        eval_obj = eval_obj.copy()
+    else:
+        eval_obj = {}
+
+    if not eval_obj.get('categories') and isinstance(md.get('damage_categories'), list):
+        eval_obj['categories'] = [str(c).strip() for c in md.get('damage_categories') if str(c).strip()]
+    # Bildarten: sowohl Liste als auch Einzelwert bereitstellen
+    if not eval_obj.get('image_types') and isinstance(md.get('image_types'), list):
+        eval_obj['image_types'] = [str(x).strip() for x in md.get('image_types') if str(x).strip()]
+    if not eval_obj.get('image_type'):
+        imgs = eval_obj.get('image_types') or md.get('image_types')
+        if isinstance(imgs, list) and imgs:
+            eval_obj['image_type'] = str(imgs[0]).strip()
+    if not eval_obj.get('quality') and md.get('image_quality'):
+        eval_obj['quality'] = str(md.get('image_quality')).strip()
+    if not eval_obj.get('notes') and md.get('damage_description'):
+        eval_obj['notes'] = str(md.get('damage_description')).strip()
+    if 'gene' not in eval_obj and isinstance(md.get('gene_flag'), bool):
+        eval_obj['gene'] = bool(md.get('gene_flag'))
+
+    return eval_obj
+
+
 def get_evaluation(image_path: str) -> dict:
     """Liest die Bewertung aus den Metadaten."""
     try:
-        md = read_metadata(image_path)
-        eval_obj = md.get('evaluation', {})
-        if isinstance(eval_obj, dict):
-            eval_obj = eval_obj.copy()
-        else:
-            eval_obj = {}
-
-        if not eval_obj.get('categories') and isinstance(md.get('damage_categories'), list):
-            eval_obj['categories'] = [str(c).strip() for c in md.get('damage_categories') if str(c).strip()]
-        # Bildarten: sowohl Liste als auch Einzelwert bereitstellen
-        if not eval_obj.get('image_types') and isinstance(md.get('image_types'), list):
-            eval_obj['image_types'] = [str(x).strip() for x in md.get('image_types') if str(x).strip()]
-        if not eval_obj.get('image_type'):
-            imgs = eval_obj.get('image_types') or md.get('image_types')
-            if isinstance(imgs, list) and imgs:
-                eval_obj['image_type'] = str(imgs[0]).strip()
-        if not eval_obj.get('quality') and md.get('image_quality'):
-            eval_obj['quality'] = str(md.get('image_quality')).strip()
-        if not eval_obj.get('notes') and md.get('damage_description'):
-            eval_obj['notes'] = str(md.get('damage_description')).strip()
-        if 'gene' not in eval_obj and isinstance(md.get('gene_flag'), bool):
-            eval_obj['gene'] = bool(md.get('gene_flag'))
-
-        return eval_obj
-        return {}
+        return _evaluation_from_metadata(read_metadata(image_path))
     except Exception as e:
         write_detailed_log("error", "get_evaluation fehlgeschlagen", f"Bild: {image_path}", e)
         return {}
 
+def _normalize_evaluation_values(cats, qual, img, imgs):
+    """Bildet DE/EN-Begriffe auf die Zielsprache ('metadata_language') ab.
+    Grundlage sind die Listen aus dem SettingsManager; Unbekanntes bleibt unverändert."""
+    try:
+        from qtui.settings_manager import get_settings_manager
+        sm = get_settings_manager()
+        target = sm.get_metadata_target_lang()
+        de_c = [str(x) for x in (sm.get('damage_categories_de', []) or [])]
+        en_c = [str(x) for x in (sm.get('damage_categories_en', []) or [])]
+        de_i = [str(x) for x in (sm.get('image_types_de', []) or [])]
+        en_i = [str(x) for x in (sm.get('image_types_en', []) or [])]
+        de_q = [str(x) for x in (sm.get('image_quality_options_de', []) or [])]
+        en_q = [str(x) for x in (sm.get('image_quality_options_en', []) or [])]
+
+        def _map_one(val: str, de_list: list[str], en_list: list[str]) -> str:
+            if not isinstance(val, str):
+                return val
+            v = val.strip()
+            if not v:
+                return v
+            vlow = v.lower()
+            de_low = [s.strip().lower() for s in de_list]
+            en_low = [s.strip().lower() for s in en_list]
+            idx = -1
+            if vlow in de_low:
+                idx = de_low.index(vlow)
+            elif vlow in en_low:
+                idx = en_low.index(vlow)
+            if idx >= 0:
+                return (de_list if target == 'de' else en_list)[idx]
+            return v
+
+        # Categories
+        out_cats = None
+        if cats is not None:
+            out_cats = []
+            for c in cats:
+                out_cats.append(_map_one(str(c), de_c, en_c))
+        # Image type
+        out_img = None
+        if img is not None:
+            out_img = _map_one(str(img), de_i, en_i)
+        out_imgs = None
+        if imgs is not None:
+            out_list = []
+            for it in (imgs or []):
+                if isinstance(it, str) and it.strip():
+                    out_list.append(_map_one(it, de_i, en_i))
+            out_imgs = out_list
+        # Quality
+        out_q = None
+        if qual is not None:
+            out_q = _map_one(str(qual), de_q, en_q)
+        return out_cats, out_q, out_img, out_imgs
+    except Exception:
+        return cats, qual, img, imgs
+
+
+def _apply_evaluation(md: dict, *, categories=None, quality=None, image_type=None, image_types=None, notes=None, gene=None) -> None:
+    """Trägt die Bewertung in 'md' ein und spiegelt einfache Felder (ohne Schreiben)."""
+    eval_obj = md.get('evaluation') if isinstance(md.get('evaluation'), dict) else {}
+
+    # Normalize before saving
+    categories, quality, image_type, image_types = _normalize_evaluation_values(categories, quality, image_type, image_types)
+
+    if categories is not None:
+        eval_obj['categories'] = list(categories)
+    if quality is not None:
+        eval_obj['quality'] = str(quality)
+    if image_types is not None:
+        try:
+            eval_obj['image_types'] = list(image_types)
+        except Exception:
+            eval_obj['image_types'] = []
+        if image_types and not image_type:
+            image_type = image_types[0]
+    if image_type is not None:
+        eval_obj['image_type'] = str(image_type) if image_type else ""
+    if notes is not None:
+        eval_obj['notes'] = str(notes)
+    if gene is not None:
+        eval_obj['gene'] = bool(gene)
+    md['evaluation'] = eval_obj
+
+    # Mirror simplified fields
+    if categories is not None:
+        md['damage_categories'] = list(categories)
+    if image_types is not None:
+        md['image_types'] = [str(x) for x in (image_types or [])]
+    elif image_type is not None:
+        md['image_types'] = [str(image_type)] if image_type else []
+    if quality is not None:
+        md['image_quality'] = str(quality) if quality is not None else ""
+    if notes is not None:
+        md['damage_description'] = str(notes)
+    if gene is not None:
+        md['gene_flag'] = bool(gene)
+
+
 def set_evaluation(image_path: str, *, categories=None, quality=None, image_type=None, image_types=None, notes=None, gene=None) -> bool:
     """Write evaluation into EXIF JSON and mirror simple fields.
     Optionally normalizes strings to a target language (de/en) based on
     settings value 'metadata_language' (UI/de/en).
     """
     try:
-        # Helper: map DE/EN terms to selected language using SettingsManager lists
-        def _normalize_values(cats, qual, img, imgs):
-            try:
-                from qtui.settings_manager import get_settings_manager
-                sm = get_settings_manager()
-                target = sm.get_metadata_target_lang()
-                de_c = [str(x) for x in (sm.get('damage_categories_de', []) or [])]
-                en_c = [str(x) for x in (sm.get('damage_categories_en', []) or [])]
-                de_i = [str(x) for x in (sm.get('image_types_de', []) or [])]
-                en_i = [str(x) for x in (sm.get('image_types_en', []) or [])]
-                de_q = [str(x) for x in (sm.get('image_quality_options_de', []) or [])]
-                en_q = [str(x) for x in (sm.get('image_quality_options_en', []) or [])]
-
-                def _map_one(val: str, de_list: list[str], en_list: list[str]) -> str:
-                    if not isinstance(val, str):
-                        return val
-                    v = val.strip()
-                    if not v:
-                        return v
-                    vlow = v.lower()
-                    de_low = [s.strip().lower() for s in de_list]
-                    en_low = [s.strip().lower() for s in en_list]
-                    idx = -1
-                    if vlow in de_low:
-                        idx = de_low.index(vlow)
-                    elif vlow in en_low:
-                        idx = en_low.index(vlow)
-                    if idx >= 0:
-                        return (de_list if target == 'de' else en_list)[idx]
-                    return v
-
-                # Categories
-                out_cats = None
-                if cats is not None:
-                    out_cats = []
-                    for c in cats:
-                        out_cats.append(_map_one(str(c), de_c, en_c))
-                # Image type
-                out_img = None
-                if img is not None:
-                    out_img = _map_one(str(img), de_i, en_i)
-                out_imgs = None
-                if imgs is not None:
-                    out_list = []
-                    for it in (imgs or []):
-                        if isinstance(it, str) and it.strip():
-                            out_list.append(_map_one(it, de_i, en_i))
-                    out_imgs = out_list
-                # Quality
-                out_q = None
-                if qual is not None:
-                    out_q = _map_one(str(qual), de_q, en_q)
-                return out_cats, out_q, out_img, out_imgs
-            except Exception:
-                return cats, qual, img, imgs
-
         md = read_metadata(image_path)
-        eval_obj = md.get('evaluation') if isinstance(md.get('evaluation'), dict) else {}
-
-        # Normalize before saving
-        categories, quality, image_type, image_types = _normalize_values(categories, quality, image_type, image_types)
-
-        if categories is not None:
-            eval_obj['categories'] = list(categories)
-        if quality is not None:
-            eval_obj['quality'] = str(quality)
-        if image_types is not None:
-            try:
-                eval_obj['image_types'] = list(image_types)
-            except Exception:
-                eval_obj['image_types'] = []
-            if image_types and not image_type:
-                image_type = image_types[0]
-        if image_type is not None:
-            eval_obj['image_type'] = str(image_type) if image_type else ""
-        if notes is not None:
-            eval_obj['notes'] = str(notes)
-        if gene is not None:
-            eval_obj['gene'] = bool(gene)
-        md['evaluation'] = eval_obj
-
-        # Mirror simplified fields
-        if categories is not None:
-            md['damage_categories'] = list(categories)
-        if image_types is not None:
-            md['image_types'] = [str(x) for x in (image_types or [])]
-        elif image_type is not None:
-            md['image_types'] = [str(image_type)] if image_type else []
-        if quality is not None:
-            md['image_quality'] = str(quality) if quality is not None else ""
-        if notes is not None:
-            md['damage_description'] = str(notes)
-        if gene is not None:
-            md['gene_flag'] = bool(gene)
-
+        _apply_evaluation(md, categories=categories, quality=quality, image_type=image_type,
+                          image_types=image_types, notes=notes, gene=gene)
         return write_metadata(image_path, md)
     except Exception as e:
         write_detailed_log("error", "set_evaluation fehlgeschlagen", f"Bild: {image_path}", e)
@@ -320,12 +891,8 @@ def set_evaluation(image_path: str, *, categories=None, quality=None, image_type
 
 
 # -------- OCR-Helfer --------
-def get_ocr_info(image_path: str) -> dict:
-    """Liest OCR-Infos aus Metadaten und bietet Abwärtskompatibilität.
-    Gibt ein Dict mit optionalen Keys: tag, confidence, box.
-    Berücksichtigt neben md['ocr'] auch historische Felder wie 'TAGOCR' und 'ocr_result'.
-    """
-    md = read_metadata(image_path)
+def _ocr_info_from_metadata(md: dict) -> dict:
+    """Extrahiert OCR-Infos (tag, confidence, box) aus bereits gelesenen Metadaten."""
     out = {}
 
     # Primär: moderner 'ocr'-Block
@@ -356,9 +923,59 @@ def get_ocr_info(image_path: str) -> dict:
     return out
 
 
+def get_ocr_info(image_path: str) -> dict:
+    """Liest OCR-Infos aus Metadaten und bietet Abwärtskompatibilität.
+    Gibt ein Dict mit optionalen Keys: tag, confidence, box.
+    Berücksichtigt neben md['ocr'] auch historische Felder wie 'TAGOCR' und 'ocr_result'.
+    """
+    return _ocr_info_from_metadata(read_metadata(image_path))
+
+
 _TAG_SENTINEL = object()
 
 
+def _apply_ocr_info(
+    md: dict,
+    *,
+    tag: Any = _TAG_SENTINEL,
+    confidence: Optional[float] = None,
+    box: Optional[Sequence[int]] = None,
+) -> None:
+    """Trägt OCR-Infos inkl. Kompatibilitätsfelder in 'md' ein (ohne Schreiben)."""
+    o = md.get('ocr') if isinstance(md.get('ocr'), dict) else {}
+    if not isinstance(o, dict):
+        o = {}
+
+    tag_provided = tag is not _TAG_SENTINEL
+    if tag_provided:
+        cleaned_tag = ""
+        if tag is not None:
+            cleaned_tag = str(tag).strip()
+
+        if cleaned_tag:
+            o['tag'] = cleaned_tag
+            md['TAGOCR'] = cleaned_tag
+            md['ocr_result'] = cleaned_tag
+        else:
+            o.pop('tag', None)
+            md.pop('TAGOCR', None)
+            md.pop('ocr_result', None)
+
+    if confidence is not None:
+        try:
+            o['confidence'] = float(confidence)
+        except Exception:
+            pass
+
+    if box is not None and isinstance(box, (list, tuple)) and len(box) == 4:
+        o['box'] = [int(v) for v in box]
+
+    if o:
+        md['ocr'] = o
+    else:
+        md.pop('ocr', None)
+
+
 def set_ocr_info(
     image_path: str,
     *,
@@ -373,49 +990,62 @@ def set_ocr_info(
 
     try:
         md = read_metadata(image_path)
-        o = md.get('ocr') if isinstance(md.get('ocr'), dict) else {}
-        if not isinstance(o, dict):
-            o = {}
-
-        tag_provided = tag is not _TAG_SENTINEL
-        if tag_provided:
-            cleaned_tag = ""
-            if tag is not None:
-                cleaned_tag = str(tag).strip()
-
-            if cleaned_tag:
-                o['tag'] = cleaned_tag
-                md['TAGOCR'] = cleaned_tag
-                md['ocr_result'] = cleaned_tag
-            else:
-                o.pop('tag', None)
-                md.pop('TAGOCR', None)
-                md.pop('ocr_result', None)
-
-        if confidence is not None:
-            try:
-                o['confidence'] = float(confidence)
-            except Exception:
-                pass
+        _apply_ocr_info(md, tag=tag, confidence=confidence, box=box)
+        return write_metadata(image_path, md)
+    except Exception:
+        return False
 
-        if box is not None and isinstance(box, (list, tuple)) and len(box) == 4:
-            o['box'] = [int(v) for v in box]
 
-        if o:
-            md['ocr'] = o
-        else:
-            md.pop('ocr', None)
+def apply_metadata_changes(
+    image_path: str,
+    *,
+    evaluation: Optional[dict] = None,
+    used: Optional[bool] = None,
+    tag: Any = _TAG_SENTINEL,
+    box: Optional[Sequence[int]] = None,
+) -> bool:
+    """Führt Bewertung, use-Flag und OCR-Tag (ggf. mit Box) in einem Lese-/Schreibvorgang zusammen.
 
+    'evaluation' enthält die Schlüsselwörter von set_evaluation (categories, quality,
+    image_type, image_types, notes, gene). Stimmt das Ergebnis mit den vorhandenen
+    Metadaten überein, wird nicht geschrieben. Rückgabe True bei Erfolg oder No-op.
+    """
+    try:
+        original = read_metadata(image_path)
+        md = copy.deepcopy(original)
+        if isinstance(evaluation, dict):
+            _apply_evaluation(
+                md,
+                categories=evaluation.get('categories'),
+                quality=evaluation.get('quality'),
+                image_type=evaluation.get('image_type'),
+                image_types=evaluation.get('image_types'),
+                notes=evaluation.get('notes'),
+                gene=evaluation.get('gene'),
+            )
+        if used is not None:
+            _apply_used_flag(md, used)
+        if tag is not _TAG_SENTINEL or box is not None:
+            _apply_ocr_info(md, tag=tag, box=box)
+
+        if md == original:
+            return True
         return write_metadata(image_path, md)
-    except Exception:
+    except Exception as e:
+        write_detailed_log("error", "apply_metadata_changes fehlgeschlagen", f"Bild: {image_path}", e)
         return False
 
 
+def _gene_flag_from_metadata(md: dict) -> bool:
+    eval_obj = _evaluation_from_metadata(md)
+    if isinstance(eval_obj.get('gene'), bool):
+        return eval_obj['gene']
+    return False
+
+
 def get_gene_flag(image_path: str) -> bool:
     try:
-        eval_obj = get_evaluation(image_path)
-        if isinstance(eval_obj, dict) and isinstance(eval_obj.get('gene'), bool):
-            return eval_obj['gene']
+        return _gene_flag_from_metadata(read_metadata(image_path))
     except Exception:
         pass
     return False
@@ -434,29 +1064,33 @@ def set_gene_flag(image_path: str, flagged: bool) -> bool:
         return False
 
 
+def _cover_info_from_metadata(md: dict) -> dict:
+    """Baut die Cover-Infos inkl. Excel-Footer-Fallbacks aus Metadaten."""
+    cover = md.get('cover') if isinstance(md.get('cover'), dict) else {}
+    tag = cover.get('tag') if isinstance(cover, dict) else None
+    description = cover.get('description') if isinstance(cover, dict) else None
+    defect = cover.get('defect_description') if isinstance(cover, dict) else None
+    use = cover.get('use') if isinstance(cover, dict) else None
+
+    if not tag:
+        tag = md.get('excel_footer_tag')
+    if not description:
+        description = md.get('excel_footer_comment')
+    if not defect:
+        defect = md.get('excel_footer_issue') or md.get('excel_footer_defect')
+
+    return {
+        'tag': str(tag).strip() if isinstance(tag, str) else '',
+        'description': str(description).strip() if isinstance(description, str) else '',
+        'defect_description': str(defect).strip() if isinstance(defect, str) else '',
+        'use': bool(use) if isinstance(use, bool) else False,
+    }
+
+
 def get_cover_info(image_path: str) -> dict:
     """Liest Cover-spezifische Informationen (Tag, Beschreibung etc.)."""
     try:
-        md = read_metadata(image_path)
-        cover = md.get('cover') if isinstance(md.get('cover'), dict) else {}
-        tag = cover.get('tag') if isinstance(cover, dict) else None
-        description = cover.get('description') if isinstance(cover, dict) else None
-        defect = cover.get('defect_description') if isinstance(cover, dict) else None
-        use = cover.get('use') if isinstance(cover, dict) else None
-
-        if not tag:
-            tag = md.get('excel_footer_tag')
-        if not description:
-            description = md.get('excel_footer_comment')
-        if not defect:
-            defect = md.get('excel_footer_issue') or md.get('excel_footer_defect')
-
-        return {
-            'tag': str(tag).strip() if isinstance(tag, str) else '',
-            'description': str(description).strip() if isinstance(description, str) else '',
-            'defect_description': str(defect).strip() if isinstance(defect, str) else '',
-            'use': bool(use) if isinstance(use, bool) else False,
-        }
+        return _cover_info_from_metadata(read_metadata(image_path))
     except Exception as e:
         write_detailed_log("error", "get_cover_info fehlgeschlagen", f"Bild: {image_path}", e)
         return {
@@ -6,6 +6,8 @@ Hilfsfunktionen und Konstanten für GearGeneGPT
 
 import os
 import sys
+import threading
+from contextlib import contextmanager
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -25,3 +27,39 @@ LOG_FILE = os.path.join(log_dir, 'ocr_log.txt')
 DETAILED_LOG_FILE = os.path.join(log_dir, 'detailed_log.txt')
 LAST_FOLDER_FILE = os.path.join(log_dir, 'last_folder.txt')
 
+
+def app_cache_dir(*parts):
+    """Benutzerbezogenes Cache-Verzeichnis der App (wird bei Bedarf angelegt).
+
+    Windows: %LOCALAPPDATA%\\BerichtGeneratorX, sonst $XDG_CACHE_HOME bzw. ~/.cache.
+    """
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME')
+    if not base:
+        base = os.path.join(os.path.expanduser('~'), '.cache')
+    path = os.path.join(base, 'BerichtGeneratorX', *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class KeyedLocks:
+    """Ein Lock pro Schlüssel (z.B. Dateipfad), damit dieselbe Datei nicht parallel
+    dekodiert wird. Einträge verschwinden, sobald niemand mehr wartet."""
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._locks = {}  # {schlüssel: [lock, wartende]}
+
+    @contextmanager
+    def hold(self, key):
+        with self._guard:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        entry[0].acquire()
+        try:
+            yield
+        finally:
+            entry[0].release()
+            with self._guard:
+                entry[1] -= 1
+                if entry[1] <= 0:
+                    self._locks.pop(key, None)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistenter Metadaten-Index (SQLite) pro Bildordner.
+
+Hält je Bild eine Zeile mit (mtime_ns, size) und dem zuletzt gelesenen
+UserComment-JSON sowie abgeleiteten Spalten (Tag, Verwenden, Gene, Bewertung,
+Cover). Ein Eintrag gilt nur, solange Änderungszeit und Größe zur Datei passen –
+die EXIF-Daten im Bild bleiben die maßgebliche Quelle.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from utils_logging import get_logger
+
+_log = get_logger('app', {"module": "utils_metadata_index"})
+
+_SCHEMA_VERSION = 1
+_INDEX_FILENAME = ".bgx_metadata_index.sqlite"
+_COMMIT_EVERY = 200  # Schreibvorgänge bis zum Commit
+_COMMIT_INTERVAL = 2.0  # Sekunden bis zum Commit
+
+_indexes: Dict[str, Optional["MetadataIndex"]] = {}
+_indexes_lock = threading.Lock()
+_index_enabled: Optional[bool] = None
+
+
+def _setting(key: str, default):
+    try:
+        from qtui.settings_manager import get_settings_manager
+        return get_settings_manager().get(key, default)
+    except Exception:
+        return default
+
+
+def _index_path(folder: str) -> str:
+    """Ablageort: im Bildordner oder im App-Cache (Setting 'performance_metadata_index_location')"""
+    if str(_setting('performance_metadata_index_location', 'appdata')).lower() == 'folder':
+        return os.path.join(folder, _INDEX_FILENAME)
+    from utils_helpers import app_cache_dir
+    digest = hashlib.sha1(folder.encode('utf-8', errors='surrogatepass')).hexdigest()
+    return os.path.join(app_cache_dir('metadata_index'), f"{digest}.sqlite")
+
+
+class MetadataIndex:
+    """SQLite-Index für einen Ordner; thread-sicher über einen internen Lock."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != _SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS images")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS images (
+                name TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                metadata TEXT NOT NULL,
+                tag TEXT,
+                used INTEGER,
+                gene INTEGER,
+                evaluation TEXT,
+                cover TEXT
+            )"""
+        )
+        self._conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+        self._conn.commit()
+
+    def get(self, name: str, mtime_ns: int, size: int) -> Optional[dict]:
+        """Metadaten, falls der Eintrag zu (mtime_ns, size) passt, sonst None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime_ns, size, metadata FROM images WHERE name=?", (name,)
+            ).fetchone()
+        if row is None or row[0] != mtime_ns or row[1] != size:
+            return None
+        try:
+            data = json.loads(row[2])
+        except Exception:
+            return None
+        return data if isinstance(data, dict) else None
+
+    def put(self, name: str, mtime_ns: int, size: int, metadata: dict, derived: dict):
+        """Legt einen Eintrag an bzw. ersetzt ihn (Commit gebündelt)"""
+        row = (
+            name, int(mtime_ns), int(size),
+            json.dumps(metadata, ensure_ascii=False),
+            derived.get('tag', ''),
+            int(bool(derived.get('used', True))),
+            int(bool(derived.get('gene', False))),
+            json.dumps(derived.get('evaluation') or {}, ensure_ascii=False),
+            json.dumps(derived.get('cover') or {}, ensure_ascii=False),
+        )
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO images "
+                "(name, mtime_ns, size, metadata, tag, used, gene, evaluation, cover) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+            self._pending += 1
+            self._maybe_commit()
+
+    def prune(self, existing_names: Iterable[str]) -> int:
+        """Entfernt Zeilen für Dateien, die nicht mehr im Ordner liegen"""
+        keep = set(existing_names)
+        with self._lock:
+            names = [r[0] for r in self._conn.execute("SELECT name FROM images")]
+            stale = [(n,) for n in names if n not in keep]
+            if stale:
+                self._conn.executemany("DELETE FROM images WHERE name=?", stale)
+                self._conn.commit()
+                self._pending = 0
+                self._last_commit = time.monotonic()
+        return len(stale)
+
+    def rows(self) -> Dict[str, dict]:
+        """Alle Einträge mit abgeleiteten Spalten: {name: {mtime_ns, size, tag, used, gene, evaluation, cover}}"""
+        out: Dict[str, dict] = {}
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT name, mtime_ns, size, tag, used, gene, evaluation, cover FROM images"
+            )
+            rows = cursor.fetchall()
+        for name, mtime_ns, size, tag, used, gene, evaluation, cover in rows:
+            try:
+                evaluation = json.loads(evaluation) if evaluation else {}
+                cover = json.loads(cover) if cover else {}
+            except Exception:
+                evaluation, cover = {}, {}
+            out[name] = {
+                'mtime_ns': mtime_ns, 'size': size, 'tag': tag or '',
+                'used': bool(used), 'gene': bool(gene),
+                'evaluation': evaluation, 'cover': cover,
+            }
+        return out
+
+    def _maybe_commit(self):
+        # Aufrufer hält den Lock
+        if self._pending >= _COMMIT_EVERY or time.monotonic() - self._last_commit >= _COMMIT_INTERVAL:
+            self._conn.commit()
+            self._pending = 0
+            self._last_commit = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            if self._pending:
+                self._conn.commit()
+                self._pending = 0
+                self._last_commit = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.commit()
+            finally:
+                self._conn.close()
+
+
+def is_index_enabled() -> bool:
+    """Setting 'performance_metadata_index_enabled' (einmalig gelesen)"""
+    global _index_enabled
+    if _index_enabled is None:
+        _index_enabled = bool(_setting('performance_metadata_index_enabled', True))
+    return _index_enabled
+
+
+def get_metadata_index(folder: str) -> Optional[MetadataIndex]:
+    """Index für einen Ordner (lazy geöffnet) oder None, wenn deaktiviert/nicht verfügbar"""
+    if not folder or not is_index_enabled():
+        return None
+    key = os.path.normcase(os.path.abspath(folder))
+    with _indexes_lock:
+        if key in _indexes:
+            return _indexes[key]
+        index = None
+        try:
+            index = MetadataIndex(_index_path(os.path.abspath(folder)))
+        except Exception as e:
+            # Schreibgeschützter Ordner, defekte DB o.ä.: ohne Index weiterarbeiten
+            _log.warning("metadata_index_unavailable", extra={
+                "event": "metadata_index_unavailable", "folder": folder, "error": str(e)})
+        _indexes[key] = index
+        return index
+
+
+def flush_all_indexes():
+    """Schreibt offene Änderungen aller Indizes (z.B. beim Beenden)"""
+    with _indexes_lock:
+        indexes = [i for i in _indexes.values() if i is not None]
+    for index in indexes:
+        try:
+            index.flush()
+        except Exception:
+            pass
+
+
+def close_all_indexes():
+    with _indexes_lock:
+        indexes = [i for i in _indexes.values() if i is not None]
+        _indexes.clear()
+    for index in indexes:
+        try:
+            index.close()
+        except Exception:
+            pass
+
+
+atexit.register(close_all_indexes)
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistenter Thumbnail-Cache auf der Festplatte.
+
+Vorschaubilder liegen als JPEG/PNG-Dateien im App-Cache-Verzeichnis, ein
+SQLite-Index ordnet sie (absoluter Pfad, mtime_ns, Größe, Breite, Höhe) zu.
+Ändert sich die Bilddatei, passt der Schlüssel nicht mehr und das Thumbnail
+wird neu erzeugt. Die Gesamtgröße ist begrenzt, verdrängt wird nach LRU.
+Reine Bytes-API ohne Qt – kodiert/dekodiert wird beim Aufrufer.
+"""
+
+import atexit
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from utils_logging import get_logger
+
+_log = get_logger('app', {"module": "utils_thumbnail_cache"})
+
+_SCHEMA_VERSION = 1
+_DEFAULT_LIMIT_MB = 1024
+_COMMIT_EVERY = 100  # Schreibvorgänge bis zum Commit
+_COMMIT_INTERVAL = 2.0  # Sekunden bis zum Commit
+_EVICT_TARGET = 0.9  # Nach Verdrängung auf 90 % des Limits
+
+_store: Optional["ThumbnailStore"] = None
+_store_lock = threading.Lock()
+_store_opened = False
+
+
+def _setting(key: str, default):
+    try:
+        from qtui.settings_manager import get_settings_manager
+        return get_settings_manager().get(key, default)
+    except Exception:
+        return default
+
+
+def _path_key(image_path: str) -> str:
+    return os.path.normcase(os.path.abspath(image_path))
+
+
+class ThumbnailStore:
+    """Thumbnail-Dateien plus SQLite-Index; thread-sicher über einen internen Lock."""
+
+    def __init__(self, root: str, limit_bytes: int):
+        self.root = root
+        self.limit_bytes = max(0, int(limit_bytes))
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self._conn = sqlite3.connect(os.path.join(root, "index.sqlite"), check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != _SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS thumbs")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS thumbs (
+                path TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                width INTEGER NOT NULL,
+                height INTEGER NOT NULL,
+                file TEXT NOT NULL,
+                bytes INTEGER NOT NULL,
+                atime REAL NOT NULL,
+                PRIMARY KEY (path, width, height)
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS thumbs_atime ON thumbs(atime)")
+        self._conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM thumbs").fetchone()[0]
+
+    def _file_path(self, name: str) -> str:
+        return os.path.join(self.root, name[:2], name)
+
+    def get(self, image_path: str, width: int, height: int, st: Optional[os.stat_result] = None) -> Optional[bytes]:
+        """Kodierte Thumbnail-Bytes, falls ein passender Eintrag existiert, sonst None"""
+        try:
+            st = st or os.stat(image_path)
+        except OSError:
+            return None
+        key = _path_key(image_path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime_ns, size, file FROM thumbs WHERE path=? AND width=? AND height=?",
+                (key, int(width), int(height)),
+            ).fetchone()
+        if row is None or row[0] != st.st_mtime_ns or row[1] != st.st_size:
+            return None
+        try:
+            with open(self._file_path(row[2]), 'rb') as fh:
+                data = fh.read()
+        except OSError:
+            self._delete(key, width, height)
+            return None
+        with self._lock:
+            self._conn.execute(
+                "UPDATE thumbs SET atime=? WHERE path=? AND width=? AND height=?",
+                (time.time(), key, int(width), int(height)),
+            )
+            self._pending += 1
+            self._maybe_commit()
+        return data
+
+    def put(self, image_path: str, width: int, height: int, data: bytes, ext: str = "jpg",
+            st: Optional[os.stat_result] = None) -> bool:
+        """Legt ein kodiertes Thumbnail ab und verdrängt bei Bedarf alte Einträge"""
+        if not data or self.limit_bytes <= 0:
+            return False
+        try:
+            st = st or os.stat(image_path)
+        except OSError:
+            return False
+        key = _path_key(image_path)
+        ident = f"{key}|{st.st_mtime_ns}|{st.st_size}|{int(width)}x{int(height)}"
+        name = f"{hashlib.sha1(ident.encode('utf-8', errors='surrogatepass')).hexdigest()}.{ext}"
+        target = self._file_path(name)
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp = f"{target}.{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as fh:
+                fh.write(data)
+            os.replace(tmp, target)
+        except OSError as e:
+            _log.warning("thumbnail_cache_write_failed", extra={
+                "event": "thumbnail_cache_write_failed", "path": image_path, "error": str(e)})
+            return False
+        old_file = None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file, bytes FROM thumbs WHERE path=? AND width=? AND height=?",
+                (key, int(width), int(height)),
+            ).fetchone()
+            if row is not None:
+                self._total_bytes -= row[1]
+                if row[0] != name:
+                    old_file = row[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO thumbs (path, mtime_ns, size, width, height, file, bytes, atime) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, st.st_mtime_ns, st.st_size, int(width), int(height), name, len(data), time.time()),
+            )
+            self._total_bytes += len(data)
+            self._pending += 1
+            victims = self._evict_locked() if self._total_bytes > self.limit_bytes else []
+            self._maybe_commit()
+        if old_file:
+            victims.append(old_file)
+        for victim in victims:
+            try:
+                os.remove(self._file_path(victim))
+            except OSError:
+                pass
+        return True
+
+    def rekey(self, image_path: str, old_st: os.stat_result, new_st: os.stat_result) -> int:
+        """Übernimmt Einträge nach reinen Metadaten-Änderungen (Pixel unverändert) auf den neuen Dateistand"""
+        key = _path_key(image_path)
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE thumbs SET mtime_ns=?, size=? WHERE path=? AND mtime_ns=? AND size=?",
+                (new_st.st_mtime_ns, new_st.st_size, key, old_st.st_mtime_ns, old_st.st_size),
+            )
+            self._pending += 1
+            self._maybe_commit()
+            return cur.rowcount
+
+    def _delete(self, key: str, width: int, height: int):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT bytes FROM thumbs WHERE path=? AND width=? AND height=?",
+                (key, int(width), int(height)),
+            ).fetchone()
+            if row is None:
+                return
+            self._conn.execute("DELETE FROM thumbs WHERE path=? AND width=? AND height=?",
+                               (key, int(width), int(height)))
+            self._total_bytes -= row[0]
+            self._pending += 1
+            self._maybe_commit()
+
+    def _evict_locked(self) -> list:
+        # Aufrufer hält den Lock; liefert die zu löschenden Dateinamen
+        target = int(self.limit_bytes * _EVICT_TARGET)
+        victims = []
+        rows = self._conn.execute("SELECT path, width, height, file, bytes FROM thumbs ORDER BY atime").fetchall()
+        for path, width, height, name, size in rows:
+            if self._total_bytes <= target:
+                break
+            self._conn.execute("DELETE FROM thumbs WHERE path=? AND width=? AND height=?", (path, width, height))
+            self._total_bytes -= size
+            victims.append(name)
+        if victims:
+            _log.info("thumbnail_cache_evicted", extra={
+                "event": "thumbnail_cache_evicted", "count": len(victims), "bytes": self._total_bytes})
+        return victims
+
+    def stats(self) -> dict:
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM thumbs").fetchone()[0]
+            return {"entries": count, "bytes": self._total_bytes, "limit_bytes": self.limit_bytes}
+
+    def _maybe_commit(self):
+        # Aufrufer hält den Lock
+        if self._pending >= _COMMIT_EVERY or time.monotonic() - self._last_commit >= _COMMIT_INTERVAL:
+            self._conn.commit()
+            self._pending = 0
+            self._last_commit = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            if self._pending:
+                self._conn.commit()
+                self._pending = 0
+                self._last_commit = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.commit()
+            finally:
+                self._conn.close()
+
+
+def get_thumbnail_store() -> Optional[ThumbnailStore]:
+    """Prozessweiter Thumbnail-Cache (lazy geöffnet) oder None, wenn deaktiviert/nicht verfügbar"""
+    global _store, _store_opened
+    with _store_lock:
+        if _store_opened:
+            return _store
+        _store_opened = True
+        if not bool(_setting('performance_thumbnail_disk_cache_enabled', True)):
+            return None
+        try:
+            from utils_helpers import app_cache_dir
+            limit_mb = int(_setting('performance_thumbnail_disk_cache_mb', _DEFAULT_LIMIT_MB))
+            _store = ThumbnailStore(app_cache_dir('thumbnails'), limit_mb * 1024 * 1024)
+        except Exception as e:
+            _log.warning("thumbnail_cache_unavailable", extra={
+                "event": "thumbnail_cache_unavailable", "error": str(e)})
+            _store = None
+        return _store
+
+
+def rekey_thumbnails(image_path: str, old_st: os.stat_result, new_st: os.stat_result):
+    """Nach Metadaten-Schreibvorgängen: vorhandene Thumbnails weiterverwenden (nur falls Cache offen)"""
+    store = _store
+    if store is None:
+        return
+    try:
+        store.rekey(image_path, old_st, new_st)
+    except Exception:
+        pass
+
+
+def flush_thumbnail_store():
+    store = _store
+    if store is not None:
+        try:
+            store.flush()
+        except Exception:
+            pass
+
+
+def close_thumbnail_store():
+    global _store
+    with _store_lock:
+        store, _store = _store, None
+    if store is not None:
+        try:
+            store.close()
+        except Exception:
+            pass
+
+
+atexit.register(close_thumbnail_store)